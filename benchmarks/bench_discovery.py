@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark artifact discovery over a large directory tree.
+
+Creates a tree of mostly irrelevant files with a few BlackBox and metadata
+artifacts, then times the original ``os.walk`` discovery, the ``scandir``
+walk and a rerun against a warm mtime discovery cache.
+
+Usage:
+    python benchmarks/bench_discovery.py --files 50000 --dirs 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp.discovery import BB_EXTS, NON_BB_SUPPORTED, DiscoveryCache, discover_tree  # noqa: E402
+
+
+def walk_discover(root):
+    hits = {}
+    bb_artifacts = []
+    for base, _, files in os.walk(root):
+        for fn in files:
+            lower = fn.lower()
+            full_path = os.path.join(base, fn)
+            if lower in NON_BB_SUPPORTED:
+                hits[lower] = full_path
+            elif lower.endswith(BB_EXTS):
+                bb_artifacts.append(full_path)
+    return hits, bb_artifacts
+
+
+def build_tree(root, files, dirs, seed=3):
+    rng = random.Random(seed)
+    paths = [root]
+    for idx in range(dirs):
+        path = os.path.join(rng.choice(paths), f'd{idx}')
+        os.mkdir(path)
+        paths.append(path)
+    for idx in range(files):
+        if idx % 100 == 0:
+            name = f'2025010{idx % 9 + 1}_{idx:05d}.bb'
+        else:
+            name = f'file_{idx}.{rng.choice(("log", "json", "xml", "bin", "txt"))}'
+        with open(os.path.join(rng.choice(paths), name), 'wb'):
+            pass
+    old = time.time() - 60
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--dirs', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='ahsdp_bench_') as root:
+        build_tree(root, args.files, args.dirs)
+        walk_time, expected = best_of(lambda: walk_discover(root), args.repeat)
+        scan_time, actual = best_of(lambda: discover_tree(root), args.repeat)
+        assert actual == expected, 'scandir discovery diverged from os.walk'
+        cache = DiscoveryCache()
+        discover_tree(root, cache=cache)
+        cached_time, actual = best_of(lambda: discover_tree(root, cache=cache), args.repeat)
+        assert actual == expected, 'cached discovery diverged from os.walk'
+
+    print(f'{args.files} files in {args.dirs + 1} directories, {len(expected[1])} artifacts')
+    print(f'os.walk:          {walk_time:.4f}s')
+    print(f'scandir:          {scan_time:.4f}s ({walk_time / scan_time:.2f}x)')
+    print(f'scandir + cache:  {cached_time:.4f}s ({walk_time / cached_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for BlackBox encoding detection.
+
+Builds a mixed corpus of UTF-8, UTF-8 with BOM, UTF-16 LE and latin-1 text
+logs plus binary payloads, then compares the original approach (classify with
+a per-byte generator, then stream utf-8 -> utf-16le -> latin-1 until one
+decodes the whole payload) against the sniffed single-codec streaming decode. Both must yield
+the same lines for UTF-8 and binary payloads; the original misreads the rest
+(latin-1 usually "decodes" as UTF-16 LE, and UTF-16 text looks binary, so
+its "retry" throughput is that of skipping the payload).
+
+Usage:
+    python benchmarks/bench_encoding.py --payloads 200 --lines 5000
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, '..', 'src'))
+sys.path.insert(0, os.path.join(_HERE, '..', 'scripts'))
+
+from ahsdp.parse_bb import _iter_lines, _looks_binary  # noqa: E402
+from generate_corpus import binary_log, iter_text_lines  # noqa: E402
+
+
+CODECS = ('utf-8', 'utf-8-sig', 'utf-16le', 'latin-1')
+
+
+def legacy_looks_binary(data):
+    sample = data[:1024]
+    control = sum(1 for b in sample if b < 9 or 13 < b < 32)
+    return control / max(len(sample), 1) > 0.2
+
+
+def legacy_lines(data):
+    if legacy_looks_binary(data):
+        return []
+    for encoding in ('utf-8', 'utf-16le', 'latin-1'):
+        try:
+            # Each failed codec re-streams the payload from the start.
+            return list(_iter_lines(lambda: io.BytesIO(data), encoding, False))
+        except UnicodeDecodeError:
+            continue
+    return []
+
+
+def sniffed_lines(data):
+    return list(_iter_lines(lambda: io.BytesIO(data)))
+
+
+def build_corpus(count, lines, seed=18):
+    rng = random.Random(seed)
+    corpus = []
+    for idx in range(count):
+        if idx % 10 == 9:
+            corpus.append(('binary', binary_log(rng, blocks=lines // 10)))
+            continue
+        codec = CODECS[idx % len(CODECS)]
+        source = iter_text_lines(rng, start=1735689600, ts_format='mixed', fault_density=0.01)
+        text = '\n'.join(next(source) + (' température' if n % 7 == 0 else '') for n in range(lines))
+        corpus.append((codec, text.encode(codec)))
+    return corpus
+
+
+def timed(func, corpus):
+    """Return ``({kind: seconds}, results)`` for ``func`` over ``corpus``."""
+    seconds = {}
+    results = []
+    for kind, data in corpus:
+        start = time.perf_counter()
+        results.append(func(data))
+        seconds[kind] = seconds.get(kind, 0.0) + time.perf_counter() - start
+    return seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=100)
+    parser.add_argument('--lines', type=int, default=5000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.payloads, args.lines)
+    sizes = {}
+    for kind, data in corpus:
+        sizes[kind] = sizes.get(kind, 0) + len(data) / (1024 * 1024)
+    before, expected = timed(legacy_lines, corpus)
+    after, actual = timed(sniffed_lines, corpus)
+    for (kind, _), old, new in zip(corpus, expected, actual):
+        if kind in ('utf-8', 'binary'):
+            assert old == new, f'{kind} payload decoded differently'
+    misread = sum(
+        1 for (kind, _), old, new in zip(corpus, expected, actual)
+        if kind not in ('utf-8', 'binary') and old != new
+    )
+
+    samples = [data for _, data in corpus] * 20
+    start = time.perf_counter()
+    old_flags = [legacy_looks_binary(data) for data in samples]
+    legacy_check = time.perf_counter() - start
+    start = time.perf_counter()
+    new_flags = [_looks_binary(data) for data in samples]
+    vector_check = time.perf_counter() - start
+    assert old_flags == new_flags
+
+    print(f'{len(corpus)} payloads, {sum(sizes.values()):.1f} MB')
+    print(f"{'payload':<10} {'MB':>6} {'retry MB/s':>11} {'sniff MB/s':>11}")
+    for kind in CODECS + ('binary',):
+        if kind in sizes:
+            print(f'{kind:<10} {sizes[kind]:>6.1f} {sizes[kind] / before[kind]:>11.1f} '
+                  f'{sizes[kind] / after[kind]:>11.1f}')
+    print(f'binary check: {legacy_check / vector_check:.1f}x faster ({len(samples)} samples)')
+    print(f'BOM, UTF-16 LE and latin-1 payloads the original read differently: {misread}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: list of per-line dicts vs the columnar ``EventTable``.
+
+Builds the same synthetic BlackBox records both ways and reports the peak
+traced allocation (``tracemalloc``) and bytes per event for each container.
+
+Usage:
+    python benchmarks/bench_event_table.py --events 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp.events import EventTable  # noqa: E402
+
+
+SOURCES = [f'2025010{n}_000{n}.bb' for n in range(1, 6)]
+MESSAGES = (
+    'iLO Kernel idle task heartbeat',
+    'Fan 3 speed adjusted to 45%',
+    'Caution: inlet temperature approaching threshold',
+    'Power Supply 2 failure detected',
+)
+LEVELS = ('INFO', 'INFO', 'WARN', 'ERROR')
+
+
+def iter_records(count):
+    for idx in range(count):
+        ts = f'2025-01-10 {idx // 3600 % 24:02d}:{idx // 60 % 60:02d}:{idx % 60:02d}'
+        kind = idx % len(MESSAGES)
+        yield {
+            'source': SOURCES[idx % len(SOURCES)],
+            'line': idx + 1,
+            'message': f'{ts} {MESSAGES[kind]} #{idx}',
+            'severity': LEVELS[kind],
+            'timestamp': ts,
+            'ts_epoch': 1736467200 + idx % 86400,
+        }
+
+
+def build_list(count):
+    return list(iter_records(count))
+
+
+def build_table(count):
+    table = EventTable()
+    for record in iter_records(count):
+        table.append_record(record)
+    return table
+
+
+def measure(builder, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = builder(count)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f'{args.events} events')
+    print(f"{'container':<14} {'retained MiB':>13} {'peak MiB':>10} {'B/event':>9} {'build s':>8}")
+    for name, builder in (('list[dict]', build_list), ('EventTable', build_table)):
+        current, peak, elapsed = measure(builder, args.events)
+        print(
+            f'{name:<14} {current / 2**20:>13.1f} {peak / 2**20:>10.1f} '
+            f'{current / args.events:>9.0f} {elapsed:>8.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark fault detection throughput before and after the compiled rule engine.
+
+The "before" path re-evaluates every board and hardware pattern with
+``re.search`` per record, exactly as the original implementation did. The
+"after" path is ``faults.detect_hardware_faults``. Both must produce the same
+findings; the script asserts this before printing lines/sec.
+
+Usage:
+    python benchmarks/bench_faults.py --lines 500000 --fault-rate 0.01
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp import faults  # noqa: E402
+
+
+BENIGN = (
+    'iLO Kernel idle task heartbeat',
+    'Informational Boot completed',
+    'Sleep time 1000 ms',
+    'Network link up on port 2',
+    'Inlet ambient temperature 22C',
+    'Firmware flash started for component 7',
+)
+FAULTY = (
+    'Critical System Board Failure detected by iLO Health Subsystem',
+    'Power Supply 2 failure detected',
+    'Fan 4 degraded, running at reduced speed',
+    'DIMM 12 uncorrectable memory error',
+    'Disk 3 write fault reported by controller',
+    'PCH thermal trip',
+)
+
+
+def build_records(count, fault_rate, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for idx in range(count):
+        pool = FAULTY if rng.random() < fault_rate else BENIGN
+        message = f'2025-01-10 {idx // 3600 % 24:02d}:{idx // 60 % 60:02d}:{idx % 60:02d} {rng.choice(pool)}'
+        records.append({'source': 'bench.bb', 'line': idx + 1, 'message': message, 'severity': 'INFO'})
+    return records
+
+
+def legacy_detect(records):
+    hardware = []
+    for rec in records:
+        message = rec.get('message', '')
+        if not message:
+            continue
+        for rule in faults._HARDWARE_PATTERNS:
+            if re.search(rule['pattern'], message, re.I):
+                hardware.append(faults._hardware_finding(rec, message, rule))
+                break
+    board = []
+    for rec in records:
+        message = rec.get('message', '')
+        if message and any(re.search(p, message, re.I) for p in faults.BOARD_PATTERNS):
+            board.append(faults._board_finding(rec, message))
+    return hardware + board
+
+
+def timed(func, records, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        findings = func(records)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--fault-rate', type=float, default=0.01)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    records = build_records(args.lines, args.fault_rate)
+    before, expected = timed(legacy_detect, records, args.repeat)
+    after, actual = timed(faults.detect_hardware_faults, records, args.repeat)
+    assert actual == expected, 'rule engine findings diverged from the legacy rules'
+
+    print(f'{args.lines} records, fault rate {args.fault_rate:.2%}, {len(actual)} findings')
+    print(f'before: {args.lines / before:>12,.0f} lines/sec ({before:.3f}s)')
+    print(f'after:  {args.lines / after:>12,.0f} lines/sec ({after:.3f}s)')
+    print(f'speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs process-pool BlackBox parsing.
+
+Writes a set of synthetic text ``.bb`` artifacts to a temporary directory and
+times ``parse_bb_files`` for an increasing number of workers, reporting the
+speedup relative to the serial path.
+
+Usage:
+    python benchmarks/bench_parallel_bb.py --artifacts 24 --lines 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp.parse_bb import parse_bb_files  # noqa: E402
+
+
+MESSAGES = (
+    'Informational Boot completed',
+    'Fan 3 speed adjusted to 45%',
+    'Caution: inlet temperature approaching threshold',
+    'DIMM 4 correctable error count increased',
+    'Power Supply 2 failure detected',
+    'Critical System Board Failure detected by iLO Health Subsystem',
+    'iLO Kernel idle task heartbeat',
+)
+
+
+def write_artifacts(target_dir, count, lines, seed=1234):
+    rng = random.Random(seed)
+    paths = []
+    for idx in range(count):
+        path = os.path.join(target_dir, f'2025010{idx % 9 + 1}_{idx:04d}.bb')
+        with open(path, 'wt', encoding='utf-8') as handle:
+            for line in range(lines):
+                stamp = f'2025-01-{idx % 28 + 1:02d} {line // 3600 % 24:02d}:{line // 60 % 60:02d}:{line % 60:02d}'
+                handle.write(f'{stamp} {rng.choice(MESSAGES)}\n')
+        paths.append(path)
+    return paths
+
+
+def time_parse(paths, workers, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse_bb_files(paths, workers=workers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(result['records'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--artifacts', type=int, default=16)
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory(prefix='ahsdp_bench_') as tmp:
+        paths = write_artifacts(tmp, args.artifacts, args.lines)
+        print(f'{args.artifacts} artifacts x {args.lines} lines, cpu_count={os.cpu_count()}')
+        print(f"{'workers':>8} {'seconds':>10} {'records':>10} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            elapsed, records = time_parse(paths, workers, args.repeat)
+            baseline = baseline or elapsed
+            print(f'{workers:>8} {elapsed:>10.3f} {records:>10} {baseline / elapsed:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``redact.mask`` against the memoizing ``Redactor``.
+
+Builds a corpus of BlackBox-style messages (mostly clean, heavily repeated,
+with a sprinkling of emails, phone numbers and tokens), redacts every message
+with both implementations and checks that the outputs are identical.
+
+Usage:
+    python benchmarks/bench_redact.py --events 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp.redact import Redactor, mask  # noqa: E402
+
+
+KINDS = ['email', 'phone', 'token']
+TEMPLATES = (
+    'iLO Kernel idle task heartbeat',
+    'Informational Boot completed',
+    'Fan {n} speed changed, status ok',
+    'Caution: inlet temperature approaching threshold',
+    'Power Supply {n} failure detected',
+    'Critical System Board Failure detected by iLO Health Subsystem',
+    'Event log entry recorded for slot {n}',
+    'Alert mail sent to admin{n}@example.com',
+    'Support callback number +1 (800) 555-{n:04d}',
+    'Session token=ABCDEF0123456789ABCDEF{n:04d} issued',
+)
+
+
+def build_corpus(count, seed=11):
+    rng = random.Random(seed)
+    weights = [30, 20, 15, 10, 5, 3, 12, 2, 1, 2]
+    return [
+        rng.choices(TEMPLATES, weights)[0].format(n=rng.randint(1, 8))
+        for _ in range(count)
+    ]
+
+
+def timed(func, messages):
+    start = time.perf_counter()
+    result = [func(message) for message in messages]
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--cache-size', type=int, default=65536)
+    args = parser.parse_args()
+
+    messages = build_corpus(args.events)
+    before, expected = timed(lambda message: mask(message, KINDS), messages)
+    redactor = Redactor(KINDS, cache_size=args.cache_size)
+    after, actual = timed(redactor, messages)
+    assert actual == expected, 'Redactor diverged from mask'
+    uncached = Redactor(KINDS, cache_size=0)
+    single_pass, actual = timed(uncached, messages)
+    assert actual == expected, 'Redactor diverged from mask'
+
+    info = redactor.mask.cache_info()
+    print(f'{args.events} events, {len(set(messages))} distinct messages')
+    print(f'mask (3 passes):       {args.events / before:>12,.0f} events/sec')
+    print(f'combined scan:         {args.events / single_pass:>12,.0f} events/sec')
+    print(f'combined scan + LRU:   {args.events / after:>12,.0f} events/sec '
+          f'({info.hits} hits, {info.misses} misses)')
+    print(f'speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for ``parse_bb._classify_severity``.
+
+Compares the keyword-trie classifier against the original substring scans on
+a generated corpus, checking that both agree on every line.
+
+Usage:
+    python benchmarks/bench_severity.py --lines 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ahsdp.parse_bb import _SEVERITY_KEYWORDS, _classify_severity  # noqa: E402
+
+
+TEMPLATES = (
+    'iLO Kernel idle task heartbeat sample {n}',
+    'Informational Boot completed in {n} ms',
+    'Fan {n} speed changed, status ok',
+    'Caution: inlet temperature {n}C approaching threshold',
+    'Power Supply {n} failure detected',
+    'Event log entry {n} recorded',
+    'Controller reported error code {n}',
+)
+
+
+def legacy_classify(line):
+    lower = line.lower()
+    for keywords, level in _SEVERITY_KEYWORDS:
+        if any(word in lower for word in keywords):
+            return level
+    if 'err' in lower:
+        return 'ERROR'
+    return 'INFO'
+
+
+def build_corpus(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        f'2025-01-10 {n // 3600 % 24:02d}:{n // 60 % 60:02d}:{n % 60:02d} '
+        + rng.choice(TEMPLATES).format(n=n)
+        for n in range(count)
+    ]
+
+
+def timed(func, lines):
+    start = time.perf_counter()
+    result = [func(line) for line in lines]
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=300000)
+    args = parser.parse_args()
+
+    lines = build_corpus(args.lines)
+    before, expected = timed(legacy_classify, lines)
+    after, actual = timed(_classify_severity, lines)
+    assert actual == expected, 'classifier diverged from the substring reference'
+
+    print(f'{args.lines} lines')
+    print(f'substring scans: {args.lines / before:>12,.0f} lines/sec')
+    print(f'keyword trie:    {args.lines / after:>12,.0f} lines/sec')
+    print(f'speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
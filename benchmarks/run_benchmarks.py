@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Stage-by-stage benchmark suite for the AHS parsing pipeline.
+
+Generates a seeded synthetic corpus (or uses ``--corpus`` bundles) and runs
+each pipeline stage -- extract, discover, parse_bb, faults, report, export --
+in isolation, recording the best wall time over ``--repeat`` runs and the peak
+traced allocation of one extra ``tracemalloc`` run. Results can be saved as a
+baseline and later runs compared against it; ``--compare`` exits non-zero when
+any stage is slower than the baseline by more than ``--tolerance``.
+
+Usage:
+    python benchmarks/run_benchmarks.py --size-mb 32 --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --size-mb 32 --compare benchmarks/baseline.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, '..', 'src'))
+sys.path.insert(0, os.path.join(_HERE, '..', 'scripts'))
+
+from ahsdp.core import discover  # noqa: E402
+from ahsdp.faults import detect_board_faults  # noqa: E402
+from ahsdp.parse_bb import parse_bb_files  # noqa: E402
+from ahsdp.report import dump_events, write_markdown  # noqa: E402
+from ahsdp.safe_extract import extract_zip_safe  # noqa: E402
+from generate_corpus import generate_corpus  # noqa: E402
+
+
+STAGES = ('extract', 'discover', 'parse_bb', 'faults', 'report', 'export')
+
+
+def _fresh_dir(root, name):
+    path = os.path.join(root, name)
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+def build_stages(bundles, scratch, *, workers, export_formats):
+    """
+    Return ``[(name, func)]`` where each ``func`` runs one stage over every bundle.
+
+    Stages feed each other through ``state`` so later stages measure only their
+    own work; each function is safe to call repeatedly.
+    """
+    state = {}
+
+    def extract():
+        state['workdirs'] = [
+            extract_zip_safe(bundle, _fresh_dir(scratch, f'extract_{idx}'))
+            for idx, bundle in enumerate(bundles)
+        ]
+
+    def discover_stage():
+        state['artifacts'] = [discover(workdir)[1] for workdir in state['workdirs']]
+
+    def parse_stage():
+        state['events'] = [
+            parse_bb_files(artifacts, workers=workers)['records'] for artifacts in state['artifacts']
+        ]
+
+    def faults():
+        state['findings'] = [detect_board_faults(events) for events in state['events']]
+
+    def report():
+        out = _fresh_dir(scratch, 'report')
+        for idx, (events, findings) in enumerate(zip(state['events'], state['findings'])):
+            write_markdown(
+                {'files': []}, {}, events, {}, os.path.join(out, f'report_{idx}.md'), [],
+                findings=findings, metadata={'bb_enabled': True, 'bb_parsed': True},
+            )
+
+    def export():
+        out = _fresh_dir(scratch, 'export')
+        for idx, events in enumerate(state['events']):
+            dump_events(events, _fresh_dir(out, str(idx)), export_formats)
+
+    funcs = (extract, discover_stage, parse_stage, faults, report, export)
+    return list(zip(STAGES, funcs)), state
+
+
+def run_suite(bundles, *, repeat=3, workers=1, export_formats=('json',), memory=True):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='ahsdp_bench_') as scratch:
+        stages, state = build_stages(bundles, scratch, workers=workers, export_formats=export_formats)
+        for name, func in stages:
+            best = None
+            for _ in range(max(repeat, 1)):
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            entry = {'seconds': round(best, 4)}
+            if memory:
+                tracemalloc.start()
+                func()
+                entry['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+                tracemalloc.stop()
+            results[name] = entry
+        records = sum(len(events) for events in state['events'])
+    return results, records
+
+
+def compare(results, baseline, tolerance):
+    """Print per-stage ratios against ``baseline``; return the names of regressed stages."""
+    regressed = []
+    print(f"{'stage':<10} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name in STAGES:
+        old = baseline.get('stages', {}).get(name)
+        new = results.get(name)
+        if not old or not new:
+            continue
+        ratio = new['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressed.append(name)
+            flag = '  <- slower'
+        print(f"{name:<10} {old['seconds']:>10.4f} {new['seconds']:>10.4f} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', help='Benchmark existing .ahs/.zip bundles in this directory')
+    parser.add_argument('--bundles', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--artifacts', type=int, default=4)
+    parser.add_argument('--lines', type=int)
+    parser.add_argument('--size-mb', type=float, default=8.0)
+    parser.add_argument('--ts-format', default='mixed')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--fault-density', type=float, default=0.001)
+    parser.add_argument('--binary-ratio', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--export-format', default='json')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    corpus = {
+        'seed': args.seed, 'bundles': args.bundles, 'artifacts': args.artifacts,
+        'lines': args.lines, 'size_mb': None if args.lines else args.size_mb,
+        'ts_format': args.ts_format, 'encoding': args.encoding,
+        'fault_density': args.fault_density, 'binary_ratio': args.binary_ratio,
+    }
+    formats = [fmt.strip() for fmt in args.export_format.split(',') if fmt.strip()]
+    with tempfile.TemporaryDirectory(prefix='ahsdp_corpus_') as corpus_dir:
+        if args.corpus:
+            bundles = sorted(
+                glob.glob(os.path.join(args.corpus, '*.ahs')) + glob.glob(os.path.join(args.corpus, '*.zip'))
+            )
+            corpus = {'path': os.path.abspath(args.corpus)}
+        else:
+            options = dict(corpus)
+            bundles = [m['path'] for m in generate_corpus(corpus_dir, **options)]
+        corpus['bytes'] = sum(os.path.getsize(path) for path in bundles)
+        stages, records = run_suite(
+            bundles, repeat=args.repeat, workers=args.workers, export_formats=formats,
+            memory=not args.no_memory,
+        )
+
+    print(f"{len(bundles)} bundles, {corpus['bytes'] / (1024 * 1024):.1f} MB, {records} records")
+    print(f"{'stage':<10} {'seconds':>10} {'peak MB':>9}")
+    for name in STAGES:
+        entry = stages[name]
+        peak = f"{entry['peak_mb']:>9.2f}" if 'peak_mb' in entry else f"{'-':>9}"
+        print(f"{name:<10} {entry['seconds']:>10.4f} {peak}")
+
+    result = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': args.workers,
+        'corpus': corpus,
+        'records': records,
+        'stages': stages,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, 'wt', encoding='utf-8') as handle:
+            json.dump(result, handle, indent=2)
+        print(f'Baseline written to {args.save_baseline}')
+    if args.compare:
+        with open(args.compare, 'rt', encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        if baseline.get('corpus') != corpus:
+            print('warning: corpus options differ from the baseline')
+        if compare(stages, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,7 @@
+import multiprocessing
+
 from ahsdp.cli import main
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
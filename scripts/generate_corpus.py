@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic AHS corpus generator for benchmarks and scale testing.
+
+Builds ``.ahs`` bundles with realistic text BlackBox logs (and optionally the
+binary 0x3A-header payloads the iLO writes) at configurable sizes, timestamp
+formats, encodings and fault densities. The same seed and options always
+produce byte-identical bundles, so timings can be compared across runs.
+Members are streamed into the archive, so multi-GB bundles never have to fit
+in memory.
+
+Usage:
+    python scripts/generate_corpus.py --out corpus --bundles 4 --size-mb 64
+    python scripts/generate_corpus.py --out corpus --lines 200000 \\
+        --ts-format mixed --encoding mixed --fault-density 0.01 --binary-ratio 0.2
+"""
+
+import argparse
+import gzip
+import io
+import os
+import random
+import struct
+import zipfile
+
+
+TS_FORMATS = ('iso', 'iso_t', 'us', 'us_short', 'none')
+ENCODINGS = ('utf-8', 'utf-16le')
+EPOCH_START = 1735689600  # 2025-01-01T00:00:00Z
+ZIP_DATE = (2025, 1, 1, 0, 0, 0)
+_WRITE_BATCH = 2048
+
+ROUTINE_MESSAGES = (
+    'Informational Boot completed in {n} ms',
+    'iLO Kernel idle task heartbeat sample {n}',
+    'Fan {fan} speed changed to {pct}%, status ok',
+    'Inlet ambient temperature {temp}C, status ok',
+    'Event log entry {n} recorded',
+    'Power meter reading {watts} W',
+    'Server power on sequence step {n} started',
+    'Storage controller heartbeat {n}',
+    'Network adapter link up on port {fan}',
+    'Caution: inlet temperature {temp}C approaching threshold',
+    'DIMM {dimm} correctable error count increased',
+)
+
+FAULT_MESSAGES = (
+    'Critical System Board Failure detected by iLO Health Subsystem',
+    'EFUSE{fan}_PF_FAULT asserted on standby rail',
+    'Power Supply {fan} failure detected',
+    'PSU {fan} removed from bay',
+    'Fan {fan} degraded, redundancy lost',
+    'DIMM {dimm} uncorrectable memory error',
+    'Disk {fan} predictive failure reported by controller',
+    'Internal Health LED changed to Red',
+    'Main power rail voltage out of range',
+)
+
+
+def _stamp(epoch, ts_format):
+    days, rem = divmod(epoch, 86400)
+    clock = f'{rem // 3600:02d}:{rem // 60 % 60:02d}:{rem % 60:02d}'
+    year, month, day = _civil_date(days)
+    if ts_format == 'iso':
+        return f'{year:04d}-{month:02d}-{day:02d} {clock} '
+    if ts_format == 'iso_t':
+        return f'{year:04d}-{month:02d}-{day:02d}T{clock} '
+    if ts_format == 'us':
+        return f'{month:02d}/{day:02d}/{year:04d} {clock} '
+    if ts_format == 'us_short':
+        return f'{month:02d}/{day:02d}/{year % 100:02d} {clock} '
+    return ''
+
+
+def _civil_date(days):
+    """Convert days since 1970-01-01 to ``(year, month, day)`` without datetime overhead."""
+    days += 719468
+    era, doe = divmod(days, 146097)
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    return yoe + era * 400 + (month <= 2), month, day
+
+
+def iter_text_lines(rng, *, start, ts_format='iso', fault_density=0.0):
+    """Yield an endless stream of BlackBox text lines (without line endings)."""
+    epoch = start
+    formats = TS_FORMATS[:-1] if ts_format == 'mixed' else (ts_format,)
+    n = 0
+    while True:
+        n += 1
+        epoch += rng.randint(1, 30)
+        templates = FAULT_MESSAGES if rng.random() < fault_density else ROUTINE_MESSAGES
+        message = rng.choice(templates).format(
+            n=n,
+            fan=rng.randint(1, 8),
+            pct=rng.randint(20, 100),
+            temp=rng.randint(18, 45),
+            watts=rng.randint(120, 900),
+            dimm=rng.randint(1, 24),
+        )
+        yield _stamp(epoch, rng.choice(formats)) + message
+
+
+def write_text_log(stream, rng, *, start, lines=None, size_bytes=None, ts_format='iso',
+                   encoding='utf-8', fault_density=0.0):
+    """
+    Write text BlackBox lines to a binary ``stream`` until ``lines`` lines or
+    ``size_bytes`` encoded bytes have been written. Returns the line count.
+    """
+    if lines is None and size_bytes is None:
+        raise ValueError('Either lines or size_bytes is required.')
+    source = iter_text_lines(rng, start=start, ts_format=ts_format, fault_density=fault_density)
+    written = 0
+    size = 0
+    while True:
+        batch = []
+        for line in source:
+            batch.append(line)
+            written += 1
+            if len(batch) == _WRITE_BATCH or written == lines:
+                break
+        payload = ('\n'.join(batch) + '\n').encode(encoding)
+        if size_bytes is not None and size + len(payload) > size_bytes:
+            # Finish on a line boundary close to the requested size.
+            keep = []
+            for line in batch:
+                encoded = (line + '\n').encode(encoding)
+                if size + len(encoded) > size_bytes and (size or keep):
+                    break
+                keep.append(encoded)
+                size += len(encoded)
+            stream.write(b''.join(keep))
+            return written - len(batch) + len(keep)
+        stream.write(payload)
+        size += len(payload)
+        if written == lines:
+            return written
+
+
+def binary_log(rng, *, fields=8, blocks=64, fault=False):
+    """Return an old-style (0x3A header) binary BlackBox payload."""
+    names = ['IdleTask', 'iLO Kernel', 'Idle seconds in last minute', 'Sleep time',
+             'Inlet Ambient', 'CPU 1', 'P/S 1 Input', 'Fan Block 1']
+    if fault:
+        names += ['EFUSE1_PF_FAULT', 'System Board Fault']
+    data = bytearray(b'\x3a')
+    for idx in range(fields + (2 if fault else 0)):
+        name = names[idx % len(names)].encode('ascii')
+        data += struct.pack('<BB6x64s', 0x80 | rng.randint(0, 0x1f), rng.randint(0, 0x3f), name)
+    value = rng.randint(0, 255)
+    for _ in range(blocks):
+        if rng.random() < 0.3:
+            value = rng.randint(0, 255)
+        data += struct.pack('<B7s', 0x31, bytes([value]) * 7)
+    return bytes(data)
+
+
+def _bcert_xml(serial):
+    return (
+        '<BCert>\n'
+        '  <ProductName>ProLiant DL380 Gen10</ProductName>\n'
+        f'  <SerialNumber>{serial}</SerialNumber>\n'
+        '  <ROMVersion>U30 v2.76 (02/2025)</ROMVersion>\n'
+        '  <ILOVersion>iLO 5 v3.08</ILOVersion>\n'
+        '</BCert>\n'
+    ).encode('utf-8')
+
+
+def _member(name):
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _gzip_bytes(payload):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', mtime=0) as handle:
+        handle.write(payload)
+    return buf.getvalue()
+
+
+def generate_bundle(path, *, seed=0, artifacts=4, lines=None, size_mb=None, ts_format='iso',
+                    encoding='utf-8', fault_density=0.0, binary_ratio=0.0, serial=None):
+    """
+    Write one synthetic ``.ahs`` bundle to ``path`` and return a manifest dict.
+
+    Text artifacts get ``lines`` lines each, or share ``size_mb`` megabytes of
+    uncompressed log text. ``encoding`` and ``ts_format`` accept ``'mixed'`` to
+    vary per artifact/line; ``binary_ratio`` of the artifacts are binary logs.
+    """
+    if lines is None and size_mb is None:
+        lines = 1000
+    rng = random.Random(seed)
+    serial = serial or f'CZJ{rng.randrange(10 ** 7):07d}'
+    size_bytes = int(size_mb * 1024 * 1024 / max(artifacts, 1)) if size_mb else None
+    manifest = {'path': os.path.abspath(path), 'seed': seed, 'serial': serial, 'artifacts': []}
+    names = []
+    with zipfile.ZipFile(path, 'w', allowZip64=True) as zf:
+        for idx in range(artifacts):
+            start = EPOCH_START + idx * 86400
+            year, month, day = _civil_date(start // 86400)
+            name = f'{year:04d}{month:02d}{day:02d}_{idx:04d}.bb'
+            names.append(name)
+            entry = {'name': name}
+            if rng.random() < binary_ratio:
+                fault = rng.random() < min(1.0, fault_density * 100)
+                zf.writestr(_member(name), binary_log(rng, fault=fault))
+                entry.update(kind='binary', fault=fault)
+            else:
+                codec = rng.choice(ENCODINGS) if encoding == 'mixed' else encoding
+                with zf.open(_member(name), 'w', force_zip64=bool(size_bytes)) as stream:
+                    count = write_text_log(
+                        stream, rng, start=start, lines=lines, size_bytes=size_bytes,
+                        ts_format=ts_format, encoding=codec, fault_density=fault_density,
+                    )
+                entry.update(kind='text', encoding=codec, lines=count)
+            manifest['artifacts'].append(entry)
+        listing = 'HPE Active Health System Log\n\n' + ''.join(f'{n}\n' for n in names)
+        zf.writestr(_member('file.pkg.txt'), listing.encode('utf-8'))
+        zf.writestr(_member('bcert.pkg.xml'), _gzip_bytes(_bcert_xml(serial)))
+        zf.writestr(_member('counters.pkg'), b'\x00' * 64)
+        zf.writestr(_member('clist.pkg'), b'\x01' + b'\x00' * 63)
+        zf.writestr(_member('CUST_INFO.DAT'), b'SYNTHETIC_CUSTOMER' + b'\x00' * 110)
+    return manifest
+
+
+def generate_corpus(out_dir, *, bundles=1, seed=0, **options):
+    """Write ``bundles`` bundles to ``out_dir``; bundle ``i`` uses seed ``seed + i``."""
+    os.makedirs(out_dir, exist_ok=True)
+    return [
+        generate_bundle(os.path.join(out_dir, f'synthetic_{idx:03d}.ahs'), seed=seed + idx, **options)
+        for idx in range(bundles)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', required=True, help='Directory to write bundles to')
+    parser.add_argument('--bundles', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--artifacts', type=int, default=4, help='.bb logs per bundle')
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--lines', type=int, help='Lines per text artifact')
+    size.add_argument('--size-mb', type=float, help='Uncompressed text log size per bundle')
+    parser.add_argument('--ts-format', choices=TS_FORMATS + ('mixed',), default='iso')
+    parser.add_argument('--encoding', choices=ENCODINGS + ('mixed',), default='utf-8')
+    parser.add_argument('--fault-density', type=float, default=0.001,
+                        help='Fraction of lines drawn from fault messages')
+    parser.add_argument('--binary-ratio', type=float, default=0.0,
+                        help='Fraction of artifacts written as binary logs')
+    args = parser.parse_args()
+
+    manifests = generate_corpus(
+        args.out,
+        bundles=args.bundles,
+        seed=args.seed,
+        artifacts=args.artifacts,
+        lines=args.lines,
+        size_mb=args.size_mb,
+        ts_format=args.ts_format,
+        encoding=args.encoding,
+        fault_density=args.fault_density,
+        binary_ratio=args.binary_ratio,
+    )
+    for manifest in manifests:
+        text = sum(1 for a in manifest['artifacts'] if a['kind'] == 'text')
+        size_mb = os.path.getsize(manifest['path']) / (1024 * 1024)
+        print(f"{manifest['path']}: {text} text / {len(manifest['artifacts']) - text} binary "
+              f'artifacts, {size_mb:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+import datetime
+import glob
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from .core import run_parser
+from .event_index import parse_time
+from .report import dump_json
+
+
+BUNDLE_EXTS = ('.ahs', '.zip')
+SUMMARY_JSON = 'batch_summary.json'
+SUMMARY_MD = 'batch_summary.md'
+
+
+def collect_bundles(targets: Iterable[str]) -> List[str]:
+    """
+    Expand directories and glob patterns into a sorted list of bundle paths.
+
+    Directories contribute their immediate ``.ahs``/``.zip`` children; any other
+    target is treated as a glob pattern (a plain file path matches itself).
+    """
+    found = []
+    for target in targets:
+        if os.path.isdir(target):
+            candidates = [os.path.join(target, name) for name in os.listdir(target)]
+        else:
+            candidates = glob.glob(target)
+        for candidate in candidates:
+            if os.path.isfile(candidate) and candidate.lower().endswith(BUNDLE_EXTS):
+                found.append(os.path.abspath(candidate))
+    return sorted(set(found))
+
+
+def _job_names(bundles: List[str]) -> List[str]:
+    """Return one output directory name per bundle, unique across the whole batch."""
+    stems = [os.path.splitext(os.path.basename(path))[0] or 'bundle' for path in bundles]
+    # Each distinct stem keeps its own name, so a literal ``a_2`` bundle is
+    # never displaced by the suffix given to a second ``a``.
+    used = set(stems)
+    names = []
+    claimed = set()
+    for stem in stems:
+        if stem not in claimed:
+            claimed.add(stem)
+            names.append(stem)
+            continue
+        suffix = 2
+        while f'{stem}_{suffix}' in used:
+            suffix += 1
+        name = f'{stem}_{suffix}'
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _run_one(job: dict) -> dict:
+    started = time.perf_counter()
+    entry = {'input': job['input'], 'name': job['name']}
+    try:
+        result = run_parser(job['input'], job['out_dir'], job['export_dir'], **job['options'])
+    except Exception as exc:  # noqa: BLE001 - one bad bundle must not stop the batch
+        entry.update(status='error', error=f'{type(exc).__name__}: {exc}')
+    else:
+        findings = result.get('findings') or []
+        entry.update(
+            status='ok',
+            report_path=result['report_path'],
+            export_dir=result.get('export_dir'),
+            event_count=len(result.get('events') or []),
+            finding_count=len(findings),
+            findings_by_severity=dict(
+                Counter((f.get('severity') or 'INFO').upper() for f in findings)
+            ),
+        )
+    entry['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def _write_summary_markdown(summary: dict, path: str) -> None:
+    lines = [
+        '# AHS Batch Summary',
+        f"_Generated: {summary['generated']}_",
+        '',
+        f"**Bundles:** {summary['bundle_count']} — {summary['succeeded']} succeeded, "
+        f"{summary['failed']} failed in {summary['elapsed_seconds']}s.",
+        '',
+        '| Bundle | Status | Events | Findings | Seconds |',
+        '|---|---|---|---|---|',
+    ]
+    for entry in summary['bundles']:
+        if entry['status'] == 'ok':
+            by_level = ', '.join(
+                f'{count} {level}' for level, count in sorted(entry['findings_by_severity'].items())
+            )
+            findings = f"{entry['finding_count']} ({by_level})" if by_level else '0'
+            lines.append(
+                f"| {entry['name']} | ok | {entry['event_count']} | {findings} | "
+                f"{entry['elapsed_seconds']} |"
+            )
+        else:
+            lines.append(
+                f"| {entry['name']} | error: {entry['error']} | - | - | {entry['elapsed_seconds']} |"
+            )
+    with open(path, 'wt', encoding='utf-8') as handle:
+        handle.write('\n'.join(lines) + '\n')
+
+
+def run_batch(
+    bundles: List[str],
+    out_dir: str,
+    export_dir: Optional[str] = None,
+    redactions: Optional[List[str]] = None,
+    *,
+    workers: Optional[int] = None,
+    enable_bb: Optional[bool] = None,
+    enable_faults: Optional[bool] = None,
+    in_archive: Optional[bool] = None,
+    temp_dir: Optional[str] = None,
+    export_format=None,
+    cache_dir: Optional[str] = None,
+    redact_exports: Optional[bool] = None,
+    export_sqlite: Optional[str] = None,
+    fleet_db: Optional[str] = None,
+    since=None,
+    until=None,
+    min_severity: Optional[str] = None,
+) -> dict:
+    """
+    Run :func:`ahsdp.core.run_parser` over many bundles and write an aggregated summary.
+
+    Each bundle gets its own ``<out_dir>/<name>/report.md`` (and
+    ``<export_dir>/<name>/`` exports). Bundles run in a pool of ``workers``
+    processes; a failing bundle is recorded as ``error`` and the batch continues.
+    With ``export_sqlite`` every bundle is appended to that one database, and with
+    ``fleet_db`` every bundle updates that one fleet store. ``since``/``until`` are
+    resolved once, so a relative window such as ``'72h'`` is the same for every bundle.
+    Returns the summary dictionary that is also written to ``batch_summary.json``.
+    """
+    out_root = os.path.abspath(out_dir)
+    os.makedirs(out_root, exist_ok=True)
+    export_root = os.path.abspath(export_dir) if export_dir else None
+    options = {
+        'redactions': redactions,
+        'enable_bb': enable_bb,
+        'enable_faults': enable_faults,
+        'in_archive': in_archive,
+        'temp_dir': temp_dir,
+        'export_format': export_format,
+        'cache_dir': cache_dir,
+        'redact_exports': redact_exports,
+        'export_sqlite': os.path.abspath(export_sqlite) if export_sqlite else None,
+        'fleet_db': os.path.abspath(fleet_db) if fleet_db else None,
+        'since': parse_time(since if since is not None else os.environ.get('AHS_SINCE')),
+        'until': parse_time(until if until is not None else os.environ.get('AHS_UNTIL')),
+        'min_severity': min_severity,
+        # Bundles are the unit of parallelism; never nest artifact pools.
+        'workers': 1,
+    }
+    jobs = [
+        {
+            'input': path,
+            'name': name,
+            'out_dir': os.path.join(out_root, name),
+            'export_dir': os.path.join(export_root, name) if export_root else None,
+            'options': options,
+        }
+        for path, name in zip(bundles, _job_names(bundles))
+    ]
+
+    started = time.perf_counter()
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [pool.submit(_run_one, job) for job in jobs]
+            entries = []
+            for job, future in zip(jobs, futures):
+                try:
+                    entries.append(future.result())
+                except Exception as exc:  # noqa: BLE001 - e.g. a crashed worker process
+                    entries.append(
+                        {
+                            'input': job['input'],
+                            'name': job['name'],
+                            'status': 'error',
+                            'error': f'{type(exc).__name__}: {exc}',
+                            'elapsed_seconds': 0.0,
+                        }
+                    )
+    else:
+        entries = [_run_one(job) for job in jobs]
+
+    succeeded = sum(1 for entry in entries if entry['status'] == 'ok')
+    summary = {
+        'generated': datetime.datetime.utcnow().replace(microsecond=0).isoformat() + 'Z',
+        'bundle_count': len(entries),
+        'succeeded': succeeded,
+        'failed': len(entries) - succeeded,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'finding_totals': dict(
+            sum((Counter(e.get('findings_by_severity', {})) for e in entries), Counter())
+        ),
+        'bundles': entries,
+    }
+    dump_json(summary, os.path.join(out_root, SUMMARY_JSON))
+    _write_summary_markdown(summary, os.path.join(out_root, SUMMARY_MD))
+    return summary
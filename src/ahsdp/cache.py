@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+
+CACHE_SCHEMA = 1
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+_SUFFIX = '.pkl'
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded on-disk cache of parsed bundle results.
+
+    Entries are pickled dictionaries stored as ``<key>.pkl`` under ``root``.
+    A hit refreshes the entry's modification time, and ``put`` evicts the
+    least recently used entries until the directory fits in ``max_bytes``.
+    The cache directory is trusted local state: only point it at a directory
+    this tool writes to, since entries are unpickled on load.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def make_key(self, content_hash: str, **options) -> str:
+        """Combine a content hash with everything else that shapes the parsed result."""
+        material = json.dumps(
+            {'schema': CACHE_SCHEMA, 'content': content_hash, 'options': options},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                value = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001 - a truncated or stale entry is just a miss
+            self._discard(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict, *, evict: bool = True) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._discard(tmp_path)
+            raise
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MemberCache(ResultCache):
+    """
+    Per-member cache of parsed BlackBox records.
+
+    Members are identified by the CRC-32 and uncompressed size recorded in the
+    zip central directory plus their name, so unchanged ``.bb`` members shared
+    by consecutive bundles are decoded only once.
+    """
+
+    def member_key(self, name: str, crc: int, size: int, **options) -> str:
+        return self.make_key(f'{crc:08x}:{size}', name=name, **options)
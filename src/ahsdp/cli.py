@@ -1,8 +1,15 @@
 import argparse
+import cProfile
+import json
+import multiprocessing
 import os
 import sys
+import time
 
+from . import fleet
+from .batch import SUMMARY_JSON, collect_bundles, run_batch
 from .core import run_parser
+from .event_index import INDEX_FILE, EventIndex, parse_time
 
 
 def _parse_redactions(value: str):
@@ -20,7 +27,201 @@ def _resolve_report_target(target: str):
     return target_abs, 'report.md'
 
 
-def main():
+def batch_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='ahsdp batch',
+        description='Parse many AHS bundles in one invocation and write an aggregated summary.',
+    )
+    parser.add_argument(
+        'targets', nargs='+', help='Directories or glob patterns of .ahs/.zip bundles.'
+    )
+    parser.add_argument('--out', required=True, help='Directory for per-bundle reports and the summary.')
+    parser.add_argument('--export', default=None)
+    parser.add_argument('--redact', default='email,phone,token')
+    parser.add_argument('--redact-exports', action='store_true', default=None)
+    parser.add_argument('--temp-dir', default=None)
+    parser.add_argument('--in-archive', action='store_true', default=None)
+    parser.add_argument(
+        '--workers', type=int, default=None, help='Number of bundles processed concurrently.'
+    )
+    parser.add_argument('--export-format', default=None)
+    parser.add_argument('--export-sqlite', default=None, metavar='PATH')
+    parser.add_argument('--fleet-db', default=None, metavar='PATH')
+    parser.add_argument('--since', default=None)
+    parser.add_argument('--until', default=None)
+    parser.add_argument('--min-severity', default=None, type=str.upper, choices=('INFO', 'WARN', 'ERROR'))
+    parser.add_argument('--cache-dir', default=None)
+    args = parser.parse_args(argv)
+
+    bundles = collect_bundles(args.targets)
+    if not bundles:
+        print('No .ahs/.zip bundles matched the supplied targets.', file=sys.stderr)
+        sys.exit(3)
+
+    try:
+        summary = run_batch(
+            bundles,
+            args.out,
+            export_dir=args.export,
+            redactions=_parse_redactions(args.redact),
+            workers=args.workers,
+            in_archive=args.in_archive,
+            temp_dir=args.temp_dir,
+            export_format=args.export_format,
+            cache_dir=args.cache_dir,
+            redact_exports=args.redact_exports,
+            export_sqlite=args.export_sqlite,
+            fleet_db=args.fleet_db,
+            since=args.since,
+            until=args.until,
+            min_severity=args.min_severity,
+        )
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(4)
+    for entry in summary['bundles']:
+        if entry['status'] != 'ok':
+            print(f"Failed: {entry['input']}: {entry['error']}", file=sys.stderr)
+    print(
+        f"Processed {summary['bundle_count']} bundle(s): {summary['succeeded']} succeeded, "
+        f"{summary['failed']} failed. Summary: {os.path.join(os.path.abspath(args.out), SUMMARY_JSON)}"
+    )
+    if summary['failed']:
+        sys.exit(5)
+
+
+def _format_event(record):
+    location = f"{record.get('source')}:{record.get('line')}"
+    stamp = record.get('timestamp') or '-'
+    return f"{stamp}  {record.get('severity', 'INFO'):<5}  {location}  {record.get('message', '')}"
+
+
+def query_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='ahsdp query',
+        description=f'Filter exported events through the {INDEX_FILE} written by --export-format index.',
+    )
+    parser.add_argument('index', help=f'Export directory containing {INDEX_FILE}, or the index file.')
+    parser.add_argument('--severity', default=None, help='Comma-separated levels, e.g. ERROR,WARN.')
+    parser.add_argument('--source', default=None, help='Exact event source, e.g. 20250110_0003.bb.')
+    parser.add_argument(
+        '--since', default=None, help='Earliest timestamp (ISO 8601, epoch seconds or e.g. 72h ago, UTC).'
+    )
+    parser.add_argument(
+        '--until', default=None, help='Latest timestamp (ISO 8601, epoch seconds or e.g. 24h ago, UTC).'
+    )
+    parser.add_argument(
+        '--contains', default=None, help='Words that must all appear in the message (case-insensitive).'
+    )
+    parser.add_argument('--limit', type=int, default=None)
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true', help='Print matching events as JSON lines.')
+    output.add_argument('--count', action='store_true', help='Print only the number of matches.')
+    args = parser.parse_args(argv)
+
+    try:
+        filters = {
+            'severity': [level.strip() for level in (args.severity or '').split(',') if level.strip()],
+            'source': args.source,
+            'since': parse_time(args.since),
+            'until': parse_time(args.until),
+            'contains': args.contains,
+        }
+        with EventIndex(args.index) as index:
+            if args.count:
+                print(index.count(**filters))
+                return
+            records = index.search(limit=args.limit, **filters)
+    except FileNotFoundError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(3)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(4)
+
+    for record in records:
+        print(json.dumps(record, ensure_ascii=False) if args.json else _format_event(record))
+
+
+def _format_epoch(epoch):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch)) if epoch is not None else '-'
+
+
+def _print_fleet_summary(summary):
+    print(f"Servers: {summary['servers']}  Bundles: {summary['bundles']}")
+    for kind, versions in summary['firmware'].items():
+        print(f'{kind.upper()} firmware:')
+        for version, count in versions.items():
+            print(f'  {version:<24} {count}')
+    print('Findings by component:')
+    for component, totals in summary['components'].items():
+        print(f"  {component:<24} {totals['findings']} finding(s) on {totals['servers']} server(s)")
+
+
+def fleet_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='ahsdp fleet',
+        description='Report on the fleet database maintained by --fleet-db without reparsing bundles.',
+    )
+    parser.add_argument('db', help='Fleet database written by --fleet-db.')
+    view = parser.add_mutually_exclusive_group()
+    view.add_argument('--servers', action='store_true', help='List the latest inventory per serial.')
+    view.add_argument(
+        '--recurring',
+        action='store_true',
+        help='List servers whose findings for a component recur in --min-bundles bundles.',
+    )
+    parser.add_argument('--component', default=None, help='Limit --recurring to one component.')
+    parser.add_argument('--min-bundles', type=int, default=2)
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON.')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.servers:
+            result = fleet.list_servers(args.db)
+        elif args.recurring or args.component:
+            result = fleet.recurring_faults(args.db, args.component, args.min_bundles)
+        else:
+            result = fleet.fleet_summary(args.db)
+    except FileNotFoundError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(3)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(4)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif isinstance(result, dict):
+        _print_fleet_summary(result)
+    elif args.servers:
+        for row in result:
+            print(
+                f"{row['serial']:<14} {row['product'] or '-':<16} ROM {row['rom_version'] or '-':<16} "
+                f"iLO {row['ilo_version'] or '-':<8} {row['bundles']} bundle(s), "
+                f"latest {_format_epoch(row['observed_at'])}"
+            )
+    else:
+        for row in result:
+            print(
+                f"{row['serial']:<14} {row['product'] or '-':<16} {row['component']:<16} "
+                f"{row['findings']} finding(s) in {row['bundles']} bundle(s), "
+                f"last {_format_epoch(row['last_seen'])}"
+            )
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['batch']:
+        batch_main(argv[1:])
+        return
+    if argv[:1] == ['query']:
+        query_main(argv[1:])
+        return
+    if argv[:1] == ['fleet']:
+        fleet_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         prog='ahsdp', description='AHS Diagnostic Parser with BlackBox support.'
     )
@@ -28,13 +229,80 @@ def main():
     parser.add_argument('--out', required=True)
     parser.add_argument('--export', default=None)
     parser.add_argument('--redact', default='email,phone,token')
+    parser.add_argument(
+        '--redact-exports',
+        action='store_true',
+        default=None,
+        help='Apply --redact to JSON/CSV exports as well as the Markdown report.',
+    )
     parser.add_argument('--temp-dir', default=None)
-    args = parser.parse_args()
+    parser.add_argument(
+        '--in-archive',
+        action='store_true',
+        default=None,
+        help='Parse .ahs/.zip members in place instead of extracting them to a temp directory.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Parse BlackBox artifacts with N worker processes (default: serial or AHS_WORKERS).',
+    )
+    parser.add_argument(
+        '--export-format',
+        default=None,
+        help='Comma-separated event export formats: json, jsonl, jsonl.gz, csv, index (default: json).',
+    )
+    parser.add_argument(
+        '--export-sqlite',
+        default=None,
+        metavar='PATH',
+        help='Append inventory, diagnostics, events, findings and metadata to this SQLite database.',
+    )
+    parser.add_argument(
+        '--fleet-db',
+        default=None,
+        metavar='PATH',
+        help='Update the fleet database (latest inventory, faults per component, firmware) at PATH.',
+    )
+    parser.add_argument(
+        '--since',
+        default=None,
+        help='Drop BlackBox lines before this time: ISO 8601, epoch seconds or a duration like 72h.',
+    )
+    parser.add_argument(
+        '--until',
+        default=None,
+        help='Drop BlackBox lines after this time: ISO 8601, epoch seconds or a duration like 24h.',
+    )
+    parser.add_argument(
+        '--min-severity',
+        default=None,
+        type=str.upper,
+        choices=('INFO', 'WARN', 'ERROR'),
+        help='Keep only BlackBox events at or above this level; all lines are still counted.',
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Reuse parsed results for unchanged bundles from this directory (or AHS_CACHE_DIR).',
+    )
+    parser.add_argument('--cache-max-mb', type=int, default=None)
+    parser.add_argument(
+        '--profile',
+        default=None,
+        metavar='PATH',
+        help='Write a cProfile/pstats dump of the run to PATH (view with python -m pstats).',
+    )
+    args = parser.parse_args(argv)
 
     redactions = _parse_redactions(args.redact)
     report_dir, report_name = _resolve_report_target(args.out)
 
+    profiler = cProfile.Profile() if args.profile else None
     try:
+        if profiler:
+            profiler.enable()
         result = run_parser(
             args.inp,
             report_dir,
@@ -42,6 +310,17 @@ def main():
             redactions=redactions,
             report_name=report_name,
             temp_dir=args.temp_dir,
+            in_archive=args.in_archive,
+            workers=args.workers,
+            export_format=args.export_format,
+            cache_dir=args.cache_dir,
+            cache_max_mb=args.cache_max_mb,
+            redact_exports=args.redact_exports,
+            export_sqlite=args.export_sqlite,
+            fleet_db=args.fleet_db,
+            since=args.since,
+            until=args.until,
+            min_severity=args.min_severity,
         )
     except FileNotFoundError as exc:
         print(str(exc), file=sys.stderr)
@@ -49,6 +328,11 @@ def main():
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         sys.exit(4)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f'Wrote profile: {os.path.abspath(args.profile)}')
 
     if result.get('preserved_temp'):
         print(f"Temporary extraction preserved at: {result['preserved_temp']}")
@@ -57,4 +341,5 @@ def main():
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
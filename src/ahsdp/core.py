@@ -1,27 +1,40 @@
+import contextlib
 import os
+import zipfile
 from typing import Dict, List, Optional
 
-from .faults import detect_board_faults
-from .parse_bb import parse_bb_files
+from . import __version__
+from .cache import DEFAULT_MAX_BYTES, MemberCache, ResultCache, hash_file
+from .event_index import parse_time
+from .faults import RULES_VERSION, detect_hardware_faults
+from .metrics import RunMetrics
+from .parse_bb import PARSER_VERSION, SEVERITY_LEVELS, artifact_outside_window, parse_bb_files
 from .parse_nonbb import (
     parse_bcert,
     parse_counters_pkg,
     parse_cust_info,
     parse_filepkg_txt,
 )
-from .report import write_markdown, dump_json
-from .safe_extract import SafeTempDir, extract_zip_safe
+from .redact import Redactor
+from .report import (
+    EVENT_EXPORTS,
+    FINDING_REDACT_FIELDS,
+    dump_events,
+    dump_json,
+    write_markdown,
+)
+from .discovery import (
+    BB_EXTS,  # noqa: F401 - re-exported; these used to be defined in core
+    NON_BB_SUPPORTED,  # noqa: F401 - re-exported; these used to be defined in core
+    DiscoveryCache,
+    discover_archive,
+    discover_tree,
+)
+from .safe_extract import SafeTempDir, ZipMember, extract_zip_safe, member_target, source_name
+from . import fleet, sqlite_export
 
 
 TRUTHY = {'1', 'true', 'yes', 'on'}
-NON_BB_SUPPORTED = {
-    'bcert.pkg.xml',
-    'file.pkg.txt',
-    'clist.pkg',
-    'counters.pkg',
-    'cust_info.dat',
-}
-BB_EXTS = ('.bb', '.zbb', '.bb.gz', '.bb.zip')
 
 
 def _coalesce_bool(value: Optional[bool], fallback_env: Optional[str]) -> bool:
@@ -32,24 +45,68 @@ def _coalesce_bool(value: Optional[bool], fallback_env: Optional[str]) -> bool:
     return fallback_env.strip().lower() in TRUTHY
 
 
+def _coalesce_int(value: Optional[int], fallback_env: Optional[str]) -> Optional[int]:
+    if value is not None:
+        return int(value)
+    if fallback_env is None or not fallback_env.strip():
+        return None
+    try:
+        return int(fallback_env.strip())
+    except ValueError:
+        return None
+
+
 def _normalise_redactions(redactions: Optional[List[str]]) -> List[str]:
     if not redactions:
         return []
     return [token.strip() for token in redactions if token and token.strip().lower() != 'none']
 
 
-def discover(root: str):
-    hits = {}
-    bb_artifacts = []
-    for base, _, files in os.walk(root):
-        for fn in files:
-            lower = fn.lower()
-            full_path = os.path.join(base, fn)
-            if lower in NON_BB_SUPPORTED:
-                hits[lower] = full_path
-            elif lower.endswith(BB_EXTS):
-                bb_artifacts.append(full_path)
-    return hits, bb_artifacts
+def _normalise_export_formats(value) -> List[str]:
+    if not value:
+        return ['json']
+    tokens = value.split(',') if isinstance(value, str) else list(value)
+    formats = []
+    for token in tokens:
+        fmt = token.strip().lower()
+        if not fmt:
+            continue
+        if fmt not in EVENT_EXPORTS:
+            raise ValueError(
+                f"Unsupported export format '{fmt}'. Choose from: {', '.join(EVENT_EXPORTS)}."
+            )
+        if fmt not in formats:
+            formats.append(fmt)
+    return formats or ['json']
+
+
+def discover(root: str, cache: Optional[DiscoveryCache] = None):
+    """Return ``(hits, bb_artifacts)`` for the files under ``root``; see :func:`discover_tree`."""
+    return discover_tree(root, cache=cache)
+
+
+def _extracted_view(hits: Dict[str, ZipMember], bb_artifacts: List[ZipMember], extract_root: str):
+    """
+    Translate a central-directory view into the paths ``extract_zip_safe`` wrote.
+
+    Members that were not extracted (e.g. past the size limit) are dropped and
+    duplicate names collapse onto the file that was written last. Also returns
+    ``{path: (crc32, size)}`` fingerprints for the member cache.
+    """
+    fingerprints = {}
+    paths = {}
+    for member in list(hits.values()) + bb_artifacts:
+        path = member_target(extract_root, member.filename)
+        if os.path.isfile(path):
+            paths[id(member)] = path
+            fingerprints[path] = (member.info.CRC, member.info.file_size)
+    extracted_hits = {
+        lower: paths[id(member)] for lower, member in hits.items() if id(member) in paths
+    }
+    extracted_bb = list(
+        dict.fromkeys(paths[id(member)] for member in bb_artifacts if id(member) in paths)
+    )
+    return extracted_hits, extracted_bb, fingerprints
 
 
 def parse_non_bb(hits: Dict[str, str]):
@@ -67,10 +124,145 @@ def parse_non_bb(hits: Dict[str, str]):
     return summary, inventory, diagnostics
 
 
-def _build_findings(events: List[dict], enable_faults: bool):
-    if not enable_faults or not events:
+def _build_findings(events: List[dict], diagnostics: Optional[dict], enable_faults: bool):
+    if not enable_faults:
         return []
-    return detect_board_faults(events)
+    return detect_hardware_faults(events, diagnostics)
+
+
+def _normalise_min_severity(value) -> Optional[str]:
+    if value is None or not str(value).strip():
+        return None
+    level = str(value).strip().upper()
+    if level not in SEVERITY_LEVELS:
+        raise ValueError(
+            f"Unsupported minimum severity '{value}'. Choose from: {', '.join(SEVERITY_LEVELS)}."
+        )
+    # INFO is the lowest level, so it filters nothing.
+    return None if level == SEVERITY_LEVELS[0] else level
+
+
+def _member_filter(hits: Dict[str, ZipMember], bb_artifacts: List[ZipMember]):
+    """Accept exactly the discovered members when extracting (matched by name and offset)."""
+    wanted = {
+        (member.filename, member.info.header_offset)
+        for member in list(hits.values()) + bb_artifacts
+    }
+    return lambda zi: (zi.filename, zi.header_offset) in wanted
+
+
+def _check_discovered(hits: dict, bb_artifacts: list, bb_enabled: bool) -> None:
+    if not hits and not (bb_enabled and bb_artifacts):
+        raise FileNotFoundError('No supported files were discovered in the supplied input.')
+
+
+def _split_window(bb_artifacts: list, since, until):
+    """Split off dated artifacts outside the time window before anything opens them."""
+    if since is None and until is None:
+        return bb_artifacts, []
+    kept, skipped = [], []
+    for path in bb_artifacts:
+        (skipped if artifact_outside_window(path, since, until) else kept).append(path)
+    return kept, skipped
+
+
+def _parse_input(
+    resolved_input: str,
+    metadata: dict,
+    *,
+    bb_enabled: bool,
+    in_archive: bool,
+    keep_temp: bool,
+    temp_dir: Optional[str],
+    workers: Optional[int],
+    member_cache: Optional[MemberCache] = None,
+    metrics: Optional[RunMetrics] = None,
+    discovery_cache: Optional[DiscoveryCache] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    min_severity: Optional[str] = None,
+):
+    """
+    Discover and parse every supported artifact in ``resolved_input``.
+
+    Fills the discovery/BB keys of ``metadata`` and returns
+    ``(summary, inventory, diagnostics, events, preserved_temp)``.
+    Stage timings and BB read counters are recorded on ``metrics``.
+    """
+    metrics = metrics or RunMetrics()
+    preserved_temp = None
+    fingerprints = None
+    skipped = []
+    is_archive = resolved_input.lower().endswith(('.zip', '.ahs'))
+    with contextlib.ExitStack() as stack:
+        if is_archive and not os.path.isdir(resolved_input):
+            # The central directory tells us what the bundle holds before
+            # anything is extracted (or instead of extracting at all).
+            archive = stack.enter_context(zipfile.ZipFile(resolved_input))
+            with metrics.stage('discover'):
+                hits, bb_artifacts = discover_archive(archive)
+            metadata['artifact_count'] = len(bb_artifacts)
+            _check_discovered(hits, bb_artifacts, bb_enabled)
+            if not bb_enabled:
+                bb_artifacts = []
+            bb_artifacts, skipped = _split_window(bb_artifacts, since, until)
+            if in_archive:
+                metadata['in_archive'] = True
+            else:
+                tmp_dir = stack.enter_context(SafeTempDir(base=temp_dir, keep=keep_temp))
+                preserved_temp = tmp_dir if keep_temp else None
+                extract_root = os.path.join(tmp_dir, 'extracted')
+                os.makedirs(extract_root, exist_ok=True)
+                with metrics.stage('extract'):
+                    workdir = extract_zip_safe(
+                        resolved_input,
+                        extract_root,
+                        # A preserved temp dir is for inspection, so keep everything.
+                        member_filter=None if keep_temp else _member_filter(hits, bb_artifacts),
+                        workers=workers,
+                    )
+                    hits, bb_artifacts, fingerprints = _extracted_view(hits, bb_artifacts, workdir)
+        else:
+            tmp_dir = stack.enter_context(SafeTempDir(base=temp_dir, keep=keep_temp))
+            preserved_temp = tmp_dir if keep_temp else None
+            if not os.path.isdir(resolved_input):
+                raise ValueError('Unsupported input path. Provide a directory or .ahs/.zip bundle.')
+            with metrics.stage('discover'):
+                hits, bb_artifacts = discover(resolved_input, cache=discovery_cache)
+            if discovery_cache is not None:
+                discovery_cache.save()
+                metadata['discovery_cache'] = discovery_cache.stats()
+            metadata['artifact_count'] = len(bb_artifacts)
+            if bb_enabled:
+                bb_artifacts, skipped = _split_window(bb_artifacts, since, until)
+
+        _check_discovered(hits, bb_artifacts + skipped, bb_enabled)
+        if since is not None or until is not None:
+            metadata['time_window']['skipped_artifacts'] = [source_name(path) for path in skipped]
+
+        with metrics.stage('parse_non_bb'):
+            summary, inventory, diagnostics = parse_non_bb(hits)
+        events = []
+        if bb_enabled and bb_artifacts:
+            with metrics.stage('parse_bb'):
+                bb_result = parse_bb_files(
+                    bb_artifacts,
+                    workers=workers,
+                    member_cache=member_cache,
+                    fingerprints=fingerprints,
+                    since=since,
+                    until=until,
+                    min_severity=min_severity,
+                )
+            metrics.add(**bb_result['stats'])
+            events = bb_result['records']
+            metadata['bb_parsed'] = True
+            metadata['bb_sources'] = bb_result['sources']
+            if 'member_cache' in bb_result:
+                metadata['member_cache'] = bb_result['member_cache']
+            if 'severity_counts' in bb_result:
+                metadata['severity_counts'] = bb_result['severity_counts']
+    return summary, inventory, diagnostics, events, preserved_temp
 
 
 def run_parser(
@@ -84,10 +276,46 @@ def run_parser(
     enable_faults: Optional[bool] = None,
     keep_temp: Optional[bool] = None,
     temp_dir: Optional[str] = None,
+    in_archive: Optional[bool] = None,
+    workers: Optional[int] = None,
+    export_format=None,
+    cache_dir: Optional[str] = None,
+    cache_max_mb: Optional[int] = None,
+    redact_exports: Optional[bool] = None,
+    export_sqlite: Optional[str] = None,
+    fleet_db: Optional[str] = None,
+    since=None,
+    until=None,
+    min_severity: Optional[str] = None,
 ):
     """
     Execute the full parsing workflow against the supplied bundle or directory.
 
+    When ``in_archive`` (or ``AHS_IN_ARCHIVE``) is set, ``.ahs``/``.zip`` bundles are
+    parsed directly from the archive instead of being extracted to a temp directory.
+    ``workers`` (or ``AHS_WORKERS``) above one parses BlackBox artifacts in a process pool.
+    ``export_format`` (or ``AHS_EXPORT_FORMAT``) selects the event export formats, e.g.
+    ``'jsonl.gz'`` or ``'json,csv'``; every format is written one record at a time.
+    ``cache_dir`` (or ``AHS_CACHE_DIR``) enables an on-disk result cache keyed by the
+    bundle's content hash, so re-running an unchanged bundle only re-renders outputs.
+    The same directory holds a per-member cache keyed by zip CRC-32 and size, so a new
+    bundle only decodes the ``.bb`` members it has not seen before, and, for directory
+    inputs, directory listings keyed by mtime so unchanged trees are not rescanned.
+    ``metadata['metrics']`` records per-stage wall/CPU seconds, BB bytes read and
+    decompressed, lines read, lines/sec and peak RSS for the run.
+    ``redact_exports`` (or ``AHS_REDACT_EXPORTS``) applies the report redactions to the
+    exported events, findings and inventory as well.
+    ``export_sqlite`` (or ``AHS_EXPORT_SQLITE``) appends the bundle's inventory,
+    diagnostics, events, findings and metadata to a SQLite database in one transaction.
+    ``fleet_db`` (or ``AHS_FLEET_DB``) folds the bundle into a fleet database keyed by
+    serial number: latest inventory, finding counts per component and firmware versions.
+    ``since``/``until`` (or ``AHS_SINCE``/``AHS_UNTIL``) take ISO 8601, epoch seconds or a
+    duration before now such as ``'72h'``; BlackBox lines timestamped outside the window are
+    dropped during parsing and dated ``YYYYMMDD_NNNN.bb`` artifacts outside it are skipped.
+    ``min_severity`` (or ``AHS_MIN_SEVERITY``) of ``'WARN'`` or ``'ERROR'`` stores only BlackBox
+    lines at or above that level or matched by a fault rule, so findings are unchanged;
+    ``metadata['severity_counts']`` still counts every line.
+
     Returns a dictionary containing the report path, metadata, and optional export paths.
     Raises ValueError on unsupported input or when no recognised artifacts are found.
     """
@@ -107,67 +335,189 @@ def run_parser(
     os.makedirs(resolved_out_dir, exist_ok=True)
     report_path = os.path.abspath(report_path)
 
-    redaction_tokens = _normalise_redactions(redactions)
+    redactor = Redactor(_normalise_redactions(redactions))
+    redact_exports_flag = _coalesce_bool(redact_exports, os.environ.get('AHS_REDACT_EXPORTS'))
     bb_enabled = _coalesce_bool(enable_bb, os.environ.get('AHS_BB'))
     faults_enabled = _coalesce_bool(enable_faults, os.environ.get('AHS_FAULTS'))
     keep_tmp_flag = _coalesce_bool(keep_temp, os.environ.get('AHS_KEEP_TMP'))
+    in_archive_flag = _coalesce_bool(in_archive, os.environ.get('AHS_IN_ARCHIVE'))
+    worker_count = _coalesce_int(workers, os.environ.get('AHS_WORKERS'))
+    event_formats = _normalise_export_formats(
+        export_format if export_format is not None else os.environ.get('AHS_EXPORT_FORMAT')
+    )
+    since_epoch = parse_time(since if since is not None else os.environ.get('AHS_SINCE'))
+    until_epoch = parse_time(until if until is not None else os.environ.get('AHS_UNTIL'))
+    if since_epoch is not None and until_epoch is not None and since_epoch > until_epoch:
+        raise ValueError('The time window is empty: --since is later than --until.')
+    min_level = _normalise_min_severity(
+        min_severity if min_severity is not None else os.environ.get('AHS_MIN_SEVERITY')
+    )
 
-    preserved_temp = None
+    metrics = RunMetrics()
     metadata = {
         'bb_enabled': bb_enabled,
         'bb_parsed': False,
         'bb_sources': [],
         'artifact_count': 0,
+        'in_archive': False,
     }
+    if since_epoch is not None or until_epoch is not None:
+        metadata['time_window'] = {'since': since_epoch, 'until': until_epoch}
+    if min_level:
+        metadata['min_severity'] = min_level
 
-    with SafeTempDir(base=temp_dir, keep=keep_tmp_flag) as tmp_dir:
-        preserved_temp = tmp_dir if keep_tmp_flag else None
-        if os.path.isdir(resolved_input):
-            workdir = resolved_input
-        elif resolved_input.lower().endswith(('.zip', '.ahs')):
-            extract_root = os.path.join(tmp_dir, 'extracted')
-            os.makedirs(extract_root, exist_ok=True)
-            workdir = extract_zip_safe(resolved_input, extract_root)
-        else:
-            raise ValueError('Unsupported input path. Provide a directory or .ahs/.zip bundle.')
+    is_archive = resolved_input.lower().endswith(('.zip', '.ahs'))
+    cache = None
+    cache_key = None
+    member_cache = None
+    discovery_cache = None
+    cache_root = cache_dir if cache_dir is not None else os.environ.get('AHS_CACHE_DIR')
+    fleet_path = fleet_db or os.environ.get('AHS_FLEET_DB')
+    bundle_hash = None
+    if cache_root and os.path.isdir(resolved_input):
+        discovery_cache = DiscoveryCache(os.path.join(cache_root, 'discovery.json'))
+    if cache_root and is_archive and os.path.isfile(resolved_input):
+        max_mb = _coalesce_int(cache_max_mb, os.environ.get('AHS_CACHE_MAX_MB'))
+        max_bytes = max_mb * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        cache = ResultCache(os.path.join(cache_root, 'results'), max_bytes=max_bytes)
+        member_cache = MemberCache(os.path.join(cache_root, 'members'), max_bytes=max_bytes)
+        with metrics.stage('cache'):
+            bundle_hash = hash_file(resolved_input)
+            cache_key = cache.make_key(
+                bundle_hash,
+                version=__version__,
+                parser=PARSER_VERSION,
+                rules=RULES_VERSION,
+                bb_enabled=bb_enabled,
+                faults_enabled=faults_enabled,
+                in_archive=in_archive_flag,
+                since=since_epoch,
+                until=until_epoch,
+                min_severity=min_level,
+            )
 
-        hits, bb_artifacts = discover(workdir)
-        metadata['artifact_count'] = len(bb_artifacts)
-        if not hits and not (bb_enabled and bb_artifacts):
-            raise FileNotFoundError('No supported files were discovered in the supplied input.')
+    preserved_temp = None
+    cached = None
+    if cache:
+        with metrics.stage('cache'):
+            cached = cache.get(cache_key)
+    if cached is not None:
+        summary = cached['summary']
+        inventory = cached['inventory']
+        diagnostics = cached['diagnostics']
+        events = cached['events']
+        findings = cached['findings']
+        metadata.update(cached['metadata'])
+    else:
+        summary, inventory, diagnostics, events, preserved_temp = _parse_input(
+            resolved_input,
+            metadata,
+            bb_enabled=bb_enabled,
+            in_archive=in_archive_flag,
+            keep_temp=keep_tmp_flag,
+            temp_dir=temp_dir,
+            workers=worker_count,
+            member_cache=member_cache,
+            metrics=metrics,
+            discovery_cache=discovery_cache,
+            since=since_epoch,
+            until=until_epoch,
+            min_severity=min_level,
+        )
+        with metrics.stage('faults'):
+            findings = _build_findings(events, diagnostics, faults_enabled)
+        if cache:
+            with metrics.stage('cache'):
+                cache.put(
+                    cache_key,
+                    {
+                        'summary': summary,
+                        'inventory': inventory,
+                        'diagnostics': diagnostics,
+                        'events': events,
+                        'findings': findings,
+                        'metadata': dict(metadata),
+                    },
+                )
+    if cache:
+        metadata['cache'] = {'hit': cached is not None, 'key': cache_key}
 
-        summary, inventory, diagnostics = parse_non_bb(hits)
-        events = []
-        if bb_enabled and bb_artifacts:
-            bb_result = parse_bb_files(bb_artifacts)
-            events = bb_result['records']
-            metadata['bb_parsed'] = True
-            metadata['bb_sources'] = bb_result['sources']
+    export_redactor = redactor if redact_exports_flag and redactor else None
+    sqlite_path = export_sqlite or os.environ.get('AHS_EXPORT_SQLITE')
+    if export_dir or sqlite_path:
+        metadata['exports_redacted'] = export_redactor is not None
+    if export_dir:
+        export_dir_abs = os.path.abspath(export_dir)
+        os.makedirs(export_dir_abs, exist_ok=True)
+        with metrics.stage('export'):
+            dump_json(
+                {key: redactor(value) for key, value in inventory.items()}
+                if export_redactor else inventory,
+                os.path.join(export_dir_abs, 'inventory.json'),
+            )
+            metadata['event_exports'] = [
+                os.path.basename(path)
+                for path in dump_events(
+                    events, export_dir_abs, event_formats, redactor=export_redactor
+                )
+            ]
+            dump_json(diagnostics, os.path.join(export_dir_abs, 'diagnostics.json'))
+            dump_json(
+                export_redactor.records(findings, FINDING_REDACT_FIELDS)
+                if export_redactor else findings,
+                os.path.join(export_dir_abs, 'findings.json'),
+            )
+    else:
+        export_dir_abs = None
 
-        findings = _build_findings(events, faults_enabled)
+    if sqlite_path:
+        sqlite_path = os.path.abspath(sqlite_path)
+        with metrics.stage('export_sqlite'):
+            bundle_id = sqlite_export.export_sqlite(
+                sqlite_path,
+                input_path=resolved_input,
+                inventory=inventory,
+                diagnostics=diagnostics,
+                events=events,
+                findings=findings,
+                metadata=metadata,
+                redactor=export_redactor,
+            )
+        metadata['sqlite_export'] = {'path': sqlite_path, 'bundle_id': bundle_id}
 
-        if export_dir:
-            export_dir_abs = os.path.abspath(export_dir)
-            os.makedirs(export_dir_abs, exist_ok=True)
-            dump_json(inventory, os.path.join(export_dir_abs, 'inventory.json'))
-            dump_json(events, os.path.join(export_dir_abs, 'events.json'))
-            dump_json(diagnostics, os.path.join(export_dir_abs, 'diagnostics.json'))
-            dump_json(findings, os.path.join(export_dir_abs, 'findings.json'))
-            dump_json(metadata, os.path.join(export_dir_abs, 'metadata.json'))
-        else:
-            export_dir_abs = None
+    if fleet_path:
+        fleet_path = os.path.abspath(fleet_path)
+        with metrics.stage('fleet'):
+            if bundle_hash is None and os.path.isfile(resolved_input):
+                # Lets the fleet store recognise a bundle it has already counted.
+                bundle_hash = hash_file(resolved_input)
+            update = fleet.update_fleet(
+                fleet_path,
+                inventory=inventory,
+                findings=findings,
+                input_path=resolved_input,
+                digest=bundle_hash,
+                observed_at=fleet.latest_epoch(events),
+            )
+        metadata['fleet'] = {'path': fleet_path, **update}
 
+    with metrics.stage('report'):
         write_markdown(
             summary,
             inventory,
             events,
             diagnostics,
             report_path,
-            redaction_tokens,
+            redactor,
             findings=findings,
             metadata=metadata,
         )
 
+    # Written last so metadata.json carries the timings of every other stage.
+    metadata['metrics'] = metrics.as_dict()
+    if export_dir_abs:
+        dump_json(metadata, os.path.join(export_dir_abs, 'metadata.json'))
+
     return {
         'report_path': report_path,
         'export_dir': export_dir_abs,
@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+import time
+
+from .safe_extract import DEFAULT_SIZE_LIMIT, iter_zip_members_safe
+
+
+NON_BB_SUPPORTED = {
+    'bcert.pkg.xml',
+    'file.pkg.txt',
+    'clist.pkg',
+    'counters.pkg',
+    'cust_info.dat',
+}
+BB_EXTS = ('.bb', '.zbb', '.bb.gz', '.bb.zip')
+
+# Final extensions of every supported name; anything else is rejected from
+# its suffix alone without lower-casing the whole name.
+_SUFFIX_INDEX = frozenset(name[name.rfind('.'):] for name in NON_BB_SUPPORTED | set(BB_EXTS))
+DISCOVERY_CACHE_SCHEMA = 1
+# Directory listings modified this recently are not cached: a second change
+# within the filesystem's timestamp granularity would leave mtime unchanged.
+_SETTLE_SECONDS = 2.0
+
+
+def classify(name):
+    """Return ``(lower_name, is_bb)`` for a supported file name, otherwise ``None``."""
+    dot = name.rfind('.')
+    if dot < 0 or name[dot:].lower() not in _SUFFIX_INDEX:
+        return None
+    lower = name.lower()
+    if lower in NON_BB_SUPPORTED:
+        return lower, False
+    if lower.endswith(BB_EXTS):
+        return lower, True
+    return None
+
+
+class DiscoveryCache:
+    """
+    Directory listings keyed by path and modification time.
+
+    Each entry holds the supported file names and subdirectory names of one
+    directory. A directory whose ``st_mtime_ns`` is unchanged has had no
+    entries added, removed or renamed, so its listing is reused without a
+    ``scandir``. With a ``path`` the cache is loaded from and saved to a JSON
+    file so repeated runs over the same tree benefit too.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.dirs = {}
+        self.reused = 0
+        self.scanned = 0
+        self._dirty = False
+        if path:
+            try:
+                with open(path, 'rt', encoding='utf-8') as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get('schema') == DISCOVERY_CACHE_SCHEMA:
+                self.dirs = data.get('dirs') or {}
+
+    def lookup(self, dirpath, mtime_ns):
+        entry = self.dirs.get(dirpath)
+        if entry is not None and entry[0] == mtime_ns:
+            self.reused += 1
+            return entry[1], entry[2]
+        return None
+
+    def store(self, dirpath, mtime_ns, files, subdirs):
+        self.scanned += 1
+        if time.time() - mtime_ns / 1e9 < _SETTLE_SECONDS:
+            self.dirs.pop(dirpath, None)
+            return
+        self.dirs[dirpath] = [mtime_ns, files, subdirs]
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wt', encoding='utf-8') as handle:
+                json.dump({'schema': DISCOVERY_CACHE_SCHEMA, 'dirs': self.dirs}, handle)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
+
+    def stats(self):
+        return {'reused': self.reused, 'scanned': self.scanned}
+
+
+def _scan_dir(dirpath):
+    """Return the supported file names and walkable subdirectory names of ``dirpath``."""
+    files = []
+    subdirs = []
+    try:
+        entries = os.scandir(dirpath)
+    except OSError:
+        return files, subdirs
+    with entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Like os.walk(followlinks=False): list but never descend links.
+                if not entry.is_symlink():
+                    subdirs.append(entry.name)
+            elif classify(entry.name) is not None:
+                files.append(entry.name)
+    return files, subdirs
+
+
+def discover_tree(root, cache=None):
+    """
+    Walk ``root`` and return ``(hits, bb_artifacts)``.
+
+    Uses ``os.scandir`` (no per-file ``stat``) and visits directories in the
+    same top-down order as ``os.walk``, so results are identical to the
+    original walk. Names are filtered by their final suffix before any
+    further string work. ``cache`` (a :class:`DiscoveryCache`) skips the
+    ``scandir`` of directories whose mtime has not changed.
+    """
+    hits = {}
+    bb_artifacts = []
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        listing = None
+        if cache is not None:
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+            listing = cache.lookup(dirpath, mtime_ns)
+        if listing is None:
+            listing = _scan_dir(dirpath)
+            if cache is not None:
+                cache.store(dirpath, mtime_ns, *listing)
+        files, subdirs = listing
+        for name in files:
+            lower, is_bb = classify(name)
+            full_path = os.path.join(dirpath, name)
+            if is_bb:
+                bb_artifacts.append(full_path)
+            else:
+                hits[lower] = full_path
+        stack.extend(os.path.join(dirpath, name) for name in reversed(subdirs))
+    return hits, bb_artifacts
+
+
+def _supported_member(zi):
+    return classify(zi.filename.rstrip('/').rsplit('/', 1)[-1]) is not None
+
+
+def discover_archive(zf, size_limit_bytes=DEFAULT_SIZE_LIMIT):
+    """
+    Build the same ``(hits, bb_artifacts)`` view as :func:`discover_tree` from
+    the central directory of an open archive. Entries are ``ZipMember`` objects
+    that the parsers read in place, so nothing is written to disk. Only
+    supported members count towards ``size_limit_bytes``, matching what
+    extraction would actually write.
+    """
+    hits = {}
+    bb_artifacts = []
+    for member in iter_zip_members_safe(zf, size_limit_bytes, member_filter=_supported_member):
+        found = classify(member.name)
+        if found is None:
+            continue
+        lower, is_bb = found
+        if is_bb:
+            bb_artifacts.append(member)
+        else:
+            hits[lower] = member
+    return hits, bb_artifacts
+
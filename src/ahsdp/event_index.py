@@ -0,0 +1,298 @@
+import bisect
+import datetime
+import itertools
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from typing import Iterable, List, Optional
+
+
+INDEX_SCHEMA = 2
+INDEX_FILE = 'events.idx'
+FIELDS = ('severity', 'source', 'hour', 'token')
+_MAGIC = b'AHSIDX1\n'
+_TRAILER = struct.Struct('<Q8s')
+# Lower-case alphanumeric words; ``PSU1`` and ``PSU2`` stay distinct.
+_WORD_RE = re.compile(r'[a-z0-9]+')
+# Indexed words are those containing a letter. Bare numbers (mostly timestamp
+# fields) would bloat the vocabulary, so queries check them on the record.
+_TOKEN_RE = re.compile(r'[a-z0-9]*[a-z][a-z0-9]*')
+_RELATIVE_RE = re.compile(r'(\d+)\s*([smhdw])', re.I)
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the distinct indexed words of ``text`` in first-seen order."""
+    return list(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+def _numbers(text: str) -> List[str]:
+    """Return the distinct all-digit words of ``text``."""
+    return [word for word in dict.fromkeys(_WORD_RE.findall(text.lower())) if word.isdigit()]
+
+
+def parse_time(value, now: Optional[float] = None) -> Optional[int]:
+    """
+    Convert an ISO date/datetime string or integer epoch to UTC epoch seconds.
+
+    Naive values are read as UTC, matching how ``ts_epoch`` is derived. A
+    relative duration such as ``72h`` or ``3d`` (units ``s``/``m``/``h``/``d``/``w``)
+    means that long before ``now`` (default: the current time).
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    if text.lstrip('-').isdigit():
+        return int(text)
+    relative = _RELATIVE_RE.fullmatch(text)
+    if relative:
+        amount, unit = relative.groups()
+        return int(time.time() if now is None else now) - int(amount) * _UNIT_SECONDS[unit.lower()]
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    try:
+        stamp = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"Unrecognised time '{value}'; use ISO 8601, epoch seconds or a duration like 72h."
+        ) from None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=datetime.timezone.utc)
+    return int(stamp.timestamp())
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _post(table: dict, term: str, idx: int) -> None:
+    ids = table.get(term)
+    if ids is None:
+        ids = table[term] = array('I')
+    ids.append(idx)
+
+
+def write_index(records: Iterable[dict], path: str) -> int:
+    """
+    Stream ``records`` into a query index at ``path``; returns the record count.
+
+    The file holds each record as a compact JSON line, a table of their byte
+    offsets, and sorted posting lists of record numbers per severity, source,
+    UTC hour (``ts_epoch // 3600``) and message word, followed by a JSON
+    directory of those lists. Only the postings are kept in memory while
+    writing, so the record stream itself is never materialised.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    postings = {field: {} for field in FIELDS}
+    severities, sources, hours, tokens = (postings[field] for field in FIELDS)
+    offsets = array('Q')
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    words = _TOKEN_RE.findall
+    count = 0
+    with open(path, 'wb') as handle:
+        handle.write(_MAGIC)
+        position = len(_MAGIC)
+        for count, record in enumerate(records, start=1):
+            idx = count - 1
+            offsets.append(position)
+            data = (encode(record) + '\n').encode('utf-8')
+            handle.write(data)
+            position += len(data)
+            _post(severities, (record.get('severity') or 'INFO').upper(), idx)
+            _post(sources, str(record.get('source') or ''), idx)
+            epoch = record.get('ts_epoch')
+            if epoch is not None:
+                _post(hours, str(epoch // 3600), idx)
+            # Inlined ``tokenize``: this loop dominates index build time.
+            for token in set(words((record.get('message') or '').lower())):
+                ids = tokens.get(token)
+                if ids is None:
+                    ids = tokens[token] = array('I')
+                ids.append(idx)
+        offsets.append(position)
+        directory = {'offsets': position}
+        data = _little_endian(offsets)
+        handle.write(data)
+        position += len(data)
+        for field, table in postings.items():
+            entries = directory[field] = {}
+            for term, ids in table.items():
+                entries[term] = [position, len(ids)]
+                data = _little_endian(ids)
+                handle.write(data)
+                position += len(data)
+        header = {'schema': INDEX_SCHEMA, 'count': count, 'directory': directory}
+        handle.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        handle.write(_TRAILER.pack(position, _MAGIC))
+    return count
+
+
+def _intersect(lists: List) -> List[int]:
+    """Intersect ascending id lists, probing the longer lists by binary search."""
+    lists = sorted(lists, key=len)
+    result = list(lists[0])
+    for other in lists[1:]:
+        if not result:
+            break
+        size = len(other)
+        keep = []
+        for idx in result:
+            pos = bisect.bisect_left(other, idx)
+            if pos < size and other[pos] == idx:
+                keep.append(idx)
+        result = keep
+    return result
+
+
+def _has_numbers(record: dict, numbers: List[str]) -> bool:
+    """Return True when every number is a whole word of the message outside its timestamp."""
+    message = record.get('message') or ''
+    if record.get('timestamp'):
+        message = message.replace(record['timestamp'], ' ', 1)
+    return set(numbers) <= set(_WORD_RE.findall(message.lower()))
+
+
+class EventIndex:
+    """
+    Read-only view of an index written by :func:`write_index`.
+
+    The file is memory-mapped; a query loads only the posting lists it
+    names and the JSON lines of the records it returns.
+    """
+
+    def __init__(self, path: str):
+        if os.path.isdir(path):
+            path = os.path.join(path, INDEX_FILE)
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            header_at, magic = _TRAILER.unpack_from(self._map, len(self._map) - _TRAILER.size)
+            if magic != _MAGIC or self._map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f'Not an event index: {path}')
+            header = json.loads(self._map[header_at:len(self._map) - _TRAILER.size])
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f'Not an event index: {path}') from None
+        if header.get('schema') != INDEX_SCHEMA:
+            self.close()
+            raise ValueError(f'Unsupported event index schema in {path}')
+        self._size = header['count']
+        self._directory = header['directory']
+        self._hours = sorted(int(hour) for hour in self._directory['hour'])
+
+    def close(self) -> None:
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def terms(self, field: str) -> dict:
+        """Return ``{term: record_count}`` for one of :data:`FIELDS`."""
+        return {term: entry[1] for term, entry in self._directory[field].items()}
+
+    def _postings(self, field: str, term: str) -> array:
+        entry = self._directory[field].get(term)
+        if entry is None:
+            return array('I')
+        start, size = entry
+        return _from_little_endian('I', self._map[start:start + 4 * size])
+
+    def _union(self, field: str, terms: Iterable[str]) -> List[int]:
+        ids = array('I')
+        for term in terms:
+            ids.extend(self._postings(field, term))
+        return sorted(set(ids))
+
+    def record(self, idx: int) -> dict:
+        start, end = struct.unpack_from('<2Q', self._map, self._directory['offsets'] + 8 * idx)
+        return json.loads(self._map[start:end])
+
+    def _matches(self, severity, source, since, until, contains):
+        """Yield matching record numbers in export order."""
+        lists = []
+        if severity:
+            levels = [severity] if isinstance(severity, str) else list(severity)
+            lists.append(self._union('severity', (level.upper() for level in levels)))
+        if source is not None:
+            lists.append(self._postings('source', source))
+        edges = set()
+        if since is not None or until is not None:
+            low = bisect.bisect_left(self._hours, since // 3600) if since is not None else 0
+            high = (
+                bisect.bisect_right(self._hours, until // 3600)
+                if until is not None else len(self._hours)
+            )
+            lists.append(self._union('hour', (str(hour) for hour in self._hours[low:high])))
+            # Only a partially covered first or last hour needs exact checks.
+            if since is not None and since % 3600:
+                edges.update(self._postings('hour', str(since // 3600)))
+            if until is not None and until % 3600 != 3599:
+                edges.update(self._postings('hour', str(until // 3600)))
+        numbers = []
+        if contains:
+            lists.extend(self._postings('token', token) for token in tokenize(contains))
+            numbers = _numbers(contains)
+        for idx in _intersect(lists) if lists else range(self._size):
+            if idx in edges or numbers:
+                record = self.record(idx)
+                if idx in edges:
+                    epoch = record['ts_epoch']
+                    if (since is not None and epoch < since) or (until is not None and epoch > until):
+                        continue
+                if numbers and not _has_numbers(record, numbers):
+                    continue
+            yield idx
+
+    def search(
+        self,
+        *,
+        severity=None,
+        source: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        contains: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Return matching records in export order.
+
+        ``severity`` is one level or an iterable of levels, ``since``/``until``
+        are inclusive UTC epoch bounds (records without ``ts_epoch`` never
+        match a time filter), and every word of ``contains`` must appear in
+        the message as a whole word (``PSU1`` does not match ``PSU2``); bare
+        numbers are not matched against the line's timestamp.
+        """
+        matches = self._matches(severity, source, since, until, contains)
+        return [self.record(idx) for idx in itertools.islice(matches, limit)]
+
+    def count(self, *, severity=None, source=None, since=None, until=None, contains=None) -> int:
+        """Count the records :meth:`search` would return without loading them."""
+        return sum(1 for _ in self._matches(severity, source, since, until, contains))
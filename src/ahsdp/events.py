@@ -0,0 +1,160 @@
+from array import array
+from collections import Counter
+
+
+_NO_EPOCH = -(2 ** 63)
+_NO_TIMESTAMP = -1
+
+
+class EventTable:
+    """
+    Compact, columnar container for BlackBox line records.
+
+    Sources and severities are interned and stored as small integer codes,
+    line numbers and epoch timestamps live in typed arrays, and messages are
+    UTF-8 encoded into one shared buffer. Timestamps are kept as a span of the
+    message they were extracted from. Iterating (or indexing) yields the same
+    ``source``/``line``/``message``/``severity``/``timestamp``/``ts_epoch``
+    dicts that ``parse_bb_files`` used to return, so existing consumers work
+    unchanged.
+    """
+
+    def __init__(self):
+        self.sources = []
+        self.levels = []
+        self._source_codes = {}
+        self._level_codes = {}
+        self._source_ids = array('I')
+        self._severity = array('B')
+        self._lines = array('I')
+        self._epochs = array('q')
+        self._ts_start = array('i')
+        self._ts_len = array('H')
+        self._offsets = array('Q', [0])
+        self._buffer = bytearray()
+
+    def _code(self, value, values, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, source, line, message, severity, timestamp=None, ts_epoch=None):
+        self._source_ids.append(self._code(source, self.sources, self._source_codes))
+        self._severity.append(self._code(severity, self.levels, self._level_codes))
+        self._lines.append(line)
+        self._epochs.append(_NO_EPOCH if ts_epoch is None else ts_epoch)
+        start = message.find(timestamp) if timestamp else _NO_TIMESTAMP
+        if timestamp and start < 0:
+            # Timestamps are always substrings of their message; keep the
+            # record honest if a caller hands us something else.
+            raise ValueError('timestamp must be a substring of message')
+        self._ts_start.append(start)
+        self._ts_len.append(len(timestamp) if timestamp else 0)
+        self._buffer += message.encode('utf-8', 'surrogatepass')
+        self._offsets.append(len(self._buffer))
+
+    def append_record(self, record):
+        self.append(
+            record.get('source'),
+            record.get('line', 0),
+            record.get('message', ''),
+            record.get('severity', 'INFO'),
+            record.get('timestamp'),
+            record.get('ts_epoch'),
+        )
+
+    def extend(self, other):
+        """Append every row of another table, remapping its interned codes."""
+        if isinstance(other, EventTable):
+            source_map = [self._code(s, self.sources, self._source_codes) for s in other.sources]
+            level_map = [self._code(v, self.levels, self._level_codes) for v in other.levels]
+            self._source_ids.extend(source_map[code] for code in other._source_ids)
+            self._severity.extend(level_map[code] for code in other._severity)
+            self._lines.extend(other._lines)
+            self._epochs.extend(other._epochs)
+            self._ts_start.extend(other._ts_start)
+            self._ts_len.extend(other._ts_len)
+            base = len(self._buffer)
+            self._offsets.extend(base + offset for offset in other._offsets[1:])
+            self._buffer += other._buffer
+            return
+        for record in other:
+            self.append_record(record)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def _row(self, idx):
+        message = self._buffer[self._offsets[idx]:self._offsets[idx + 1]].decode(
+            'utf-8', 'surrogatepass'
+        )
+        rec = {
+            'source': self.sources[self._source_ids[idx]],
+            'line': self._lines[idx],
+            'message': message,
+            'severity': self.levels[self._severity[idx]],
+        }
+        start = self._ts_start[idx]
+        if start != _NO_TIMESTAMP:
+            rec['timestamp'] = message[start:start + self._ts_len[idx]]
+        epoch = self._epochs[idx]
+        if epoch != _NO_EPOCH:
+            rec['ts_epoch'] = epoch
+        return rec
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self._row(idx)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._row(idx) for idx in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('EventTable index out of range')
+        return self._row(key)
+
+    def __eq__(self, other):
+        if isinstance(other, (EventTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f'EventTable({len(self)} events, {len(self.sources)} sources)'
+
+    def severity_counts(self):
+        counts = Counter(self._severity)
+        return {self.levels[code]: count for code, count in counts.items()}
+
+    def source_counts(self):
+        counts = Counter(self._source_ids)
+        return {self.sources[code]: count for code, count in counts.items()}
+
+    def latest_epoch(self):
+        """Return the newest ``ts_epoch`` in the table, or ``None``."""
+        latest = max(self._epochs, default=_NO_EPOCH)
+        return None if latest == _NO_EPOCH else latest
+
+    def rows_with_severity(self, levels, limit=None):
+        """Return the first ``limit`` rows whose severity is in ``levels``, in order."""
+        codes = {code for code, level in enumerate(self.levels) if level in levels}
+        rows = []
+        if not codes or limit == 0:
+            return rows
+        for idx, code in enumerate(self._severity):
+            if code in codes:
+                rows.append(self._row(idx))
+                if len(rows) == limit:
+                    break
+        return rows
+
+    def nbytes(self):
+        """Approximate payload size of the columns and message buffer."""
+        columns = (
+            self._source_ids, self._severity, self._lines, self._epochs,
+            self._ts_start, self._ts_len, self._offsets,
+        )
+        return len(self._buffer) + sum(col.itemsize * len(col) for col in columns)
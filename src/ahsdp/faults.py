@@ -1,5 +1,8 @@
 import re
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bump whenever a rule change alters findings so cached results are invalidated.
+RULES_VERSION = 3
 
 BOARD_PATTERNS = [
     r"\bSystem Board\b",
@@ -12,8 +15,25 @@ BOARD_PATTERNS = [
     r"\bPCIe Bus Fatal\b",
     r"\biLO Health Subsystem\b",
     r"\bKBBX BOOT\b",
+    r"\bEFUSE\d*_PF_FAULT\b",
 ]
 
+# Lower-case literals that must appear in a line for the matching board
+# pattern to fire. Lines containing none of them skip the regex entirely.
+_BOARD_KEYWORDS = {
+    r"\bSystem Board\b": ('system board',),
+    r"\bSYSBOARD\b": ('sysboard',),
+    r"\bBoard Failure\b": ('board failure',),
+    r"\bFRU\b.*Board": ('fru',),
+    r"\bPOST Error\b.*(system|board)": ('post error',),
+    r"\bUnrecoverable\b.*(system|board)": ('unrecoverable',),
+    r"\bPCH\b": ('pch',),
+    r"\bPCIe Bus Fatal\b": ('pcie bus fatal',),
+    r"\biLO Health Subsystem\b": ('ilo health subsystem',),
+    r"\bKBBX BOOT\b": ('kbbx boot',),
+    r"\bEFUSE\d*_PF_FAULT\b": ('efuse',),
+}
+
 _ERROR_HINTS = re.compile(r"\b(CRIT|CRITICAL|FATAL|UNREC|ERROR|FAIL|PANIC)\b", re.I)
 
 _SEVERITY_ORDER = {"INFO": 0, "WARN": 1, "ERROR": 2, "CRITICAL": 3}
@@ -21,6 +41,7 @@ _SEVERITY_ORDER = {"INFO": 0, "WARN": 1, "ERROR": 2, "CRITICAL": 3}
 _HARDWARE_PATTERNS = [
     {
         'pattern': r"\b(Power\s+Supply|PSU)\b.*(fail|fault|error|removed)",
+        'keywords': ('power', 'psu'),
         'finding': 'Power supply failure detected',
         'component': 'Power Supply',
         'severity': 'ERROR',
@@ -28,6 +49,7 @@ _HARDWARE_PATTERNS = [
     },
     {
         'pattern': r"\bFan\b.*(degrad|fault|fail|error)",
+        'keywords': ('fan',),
         'finding': 'Cooling fan issue detected',
         'component': 'Cooling',
         'severity': 'WARN',
@@ -35,6 +57,7 @@ _HARDWARE_PATTERNS = [
     },
     {
         'pattern': r"\bDIMM\b.*(uncorrectable|fatal|error|fail)",
+        'keywords': ('dimm',),
         'finding': 'Memory DIMM error recorded',
         'component': 'Memory',
         'severity': 'ERROR',
@@ -42,6 +65,7 @@ _HARDWARE_PATTERNS = [
     },
     {
         'pattern': r"\bDisk\b.*(write fault|write error|predictive failure|media error)",
+        'keywords': ('disk',),
         'finding': 'Disk write fault reported',
         'component': 'Storage',
         'severity': 'ERROR',
@@ -50,6 +74,55 @@ _HARDWARE_PATTERNS = [
 ]
 
 
+class _RuleEngine:
+    """
+    Compiled board and hardware rules with a literal-keyword prefilter.
+
+    Every rule lists lower-case literals that any match must contain. For
+    ASCII messages (where ``str.lower`` and ``re.I`` agree) a single scan for
+    the union of those literals rejects most lines before any rule regex
+    runs. Non-ASCII messages always go through the regexes, so results are
+    identical to evaluating every pattern with ``re.search(..., re.I)``.
+    """
+
+    def __init__(self, board_patterns, board_keywords, hardware_rules):
+        self.board = re.compile('|'.join(f'(?:{p})' for p in board_patterns), re.I)
+        self.board_keywords = tuple(kw for p in board_patterns for kw in board_keywords[p])
+        self.hardware = [
+            (re.compile(rule['pattern'], re.I), rule['keywords'], rule) for rule in hardware_rules
+        ]
+        literals = set(self.board_keywords)
+        for _, keywords, _ in self.hardware:
+            literals.update(keywords)
+        self.prefilter = re.compile('|'.join(sorted(map(re.escape, literals), key=len, reverse=True)))
+
+    def _lower(self, message: str) -> Optional[str]:
+        return message.lower() if message.isascii() else None
+
+    def candidate(self, message: str) -> Tuple[bool, Optional[str]]:
+        """Return ``(may_match, lower)``; ``lower`` is None when no prefilter applies."""
+        lower = self._lower(message)
+        if lower is None:
+            return True, None
+        return self.prefilter.search(lower) is not None, lower
+
+    def board_match(self, message: str, lower: Optional[str]) -> bool:
+        if lower is not None and not any(kw in lower for kw in self.board_keywords):
+            return False
+        return self.board.search(message) is not None
+
+    def hardware_match(self, message: str, lower: Optional[str]) -> Optional[dict]:
+        for regex, keywords, rule in self.hardware:
+            if lower is not None and not any(kw in lower for kw in keywords):
+                continue
+            if regex.search(message):
+                return rule
+        return None
+
+
+_ENGINE = _RuleEngine(BOARD_PATTERNS, _BOARD_KEYWORDS, _HARDWARE_PATTERNS)
+
+
 def _snippet(message: str) -> str:
     return message if len(message) <= 300 else message[:297] + '...'
 
@@ -87,49 +160,66 @@ def _base_finding(
     return entry
 
 
-def detect_board_faults(records: Iterable[dict]) -> List[dict]:
-    findings: List[dict] = []
+def _board_finding(rec: dict, message: str) -> dict:
+    sev = (rec.get('severity') or 'INFO').upper()
+    level = 'ERROR' if sev in ('ERROR', 'CRITICAL') or _ERROR_HINTS.search(message) else 'WARN'
+    return _base_finding(
+        rec,
+        message,
+        finding='System board anomaly detected',
+        severity=level,
+        confidence='High',
+        component='System Board',
+    )
+
+
+def _hardware_finding(rec: dict, message: str, rule: dict) -> dict:
+    return _base_finding(
+        rec,
+        message,
+        finding=rule['finding'],
+        severity=rule['severity'],
+        confidence=rule['confidence'],
+        component=rule.get('component'),
+    )
+
+
+def _scan_records(
+    records: Iterable[dict], *, board: bool = True, hardware: bool = True
+) -> Tuple[List[dict], List[dict]]:
+    """Evaluate the enabled rule families in one pass; returns ``(hardware, board)``."""
+    hardware_findings: List[dict] = []
+    board_findings: List[dict] = []
     for rec in records:
         message = rec.get('message', '')
         if not message:
             continue
-        if not any(re.search(pattern, message, re.I) for pattern in BOARD_PATTERNS):
+        may_match, lower = _ENGINE.candidate(message)
+        if not may_match:
             continue
-        sev = (rec.get('severity') or 'INFO').upper()
-        level = 'ERROR' if sev in ('ERROR', 'CRITICAL') or _ERROR_HINTS.search(message) else 'WARN'
-        findings.append(
-            _base_finding(
-                rec,
-                message,
-                finding='System board anomaly detected',
-                severity=level,
-                confidence='High',
-                component='System Board',
-            )
-        )
-    return findings
+        if hardware:
+            rule = _ENGINE.hardware_match(message, lower)
+            if rule is not None:
+                hardware_findings.append(_hardware_finding(rec, message, rule))
+        if board and _ENGINE.board_match(message, lower):
+            board_findings.append(_board_finding(rec, message))
+    return hardware_findings, board_findings
+
+
+def matches_rule(message: str) -> bool:
+    """Return True when any board or hardware rule fires on ``message``."""
+    may_match, lower = _ENGINE.candidate(message)
+    if not may_match:
+        return False
+    return _ENGINE.board_match(message, lower) or _ENGINE.hardware_match(message, lower) is not None
+
+
+def detect_board_faults(records: Iterable[dict]) -> List[dict]:
+    return _scan_records(records, hardware=False)[1]
 
 
 def _detect_from_records(records: Iterable[dict]) -> List[dict]:
-    findings: List[dict] = []
-    for rec in records:
-        message = rec.get('message', '')
-        if not message:
-            continue
-        for rule in _HARDWARE_PATTERNS:
-            if re.search(rule['pattern'], message, re.I):
-                findings.append(
-                    _base_finding(
-                        rec,
-                        message,
-                        finding=rule['finding'],
-                        severity=rule['severity'],
-                        confidence=rule['confidence'],
-                        component=rule.get('component'),
-                    )
-                )
-                break
-    return findings
+    return _scan_records(records, board=False)[0]
 
 
 def _detect_from_diagnostics(diagnostics: Optional[Dict]) -> List[dict]:
@@ -158,9 +248,10 @@ def _detect_from_diagnostics(diagnostics: Optional[Dict]) -> List[dict]:
 def detect_hardware_faults(records: Iterable[dict], diagnostics: Optional[Dict] = None) -> List[dict]:
     """Analyse records and diagnostics for notable hardware faults."""
 
+    hardware_findings, board_findings = _scan_records(records)
     findings: List[dict] = []
-    findings.extend(_detect_from_records(records))
+    findings.extend(hardware_findings)
     findings.extend(_detect_from_diagnostics(diagnostics))
     # Ensure legacy board detection is retained for callers that rely on it.
-    findings.extend(detect_board_faults(records))
+    findings.extend(board_findings)
     return findings
@@ -0,0 +1,284 @@
+import datetime
+import json
+import os
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+FLEET_SCHEMA = 1
+# Inventory keys (as returned by ``parse_bcert``) tracked as firmware.
+FIRMWARE_KEYS = (('rom', 'ROMVersion'), ('ilo', 'ILO'))
+UNCLASSIFIED = 'Unclassified'
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS servers (
+    serial TEXT PRIMARY KEY,
+    product TEXT,
+    rom_version TEXT,
+    ilo_version TEXT,
+    inventory TEXT,
+    input TEXT,
+    observed_at INTEGER NOT NULL,
+    bundles INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bundles (
+    id INTEGER PRIMARY KEY,
+    digest TEXT UNIQUE,
+    serial TEXT NOT NULL,
+    input TEXT,
+    observed_at INTEGER NOT NULL,
+    findings INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS component_faults (
+    serial TEXT NOT NULL,
+    component TEXT NOT NULL COLLATE NOCASE,
+    findings INTEGER NOT NULL,
+    bundles INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    PRIMARY KEY (serial, component)
+);
+CREATE INDEX IF NOT EXISTS component_faults_component ON component_faults(component, bundles);
+CREATE TABLE IF NOT EXISTS firmware (
+    kind TEXT NOT NULL,
+    version TEXT NOT NULL,
+    servers INTEGER NOT NULL,
+    PRIMARY KEY (kind, version)
+);
+"""
+
+
+def latest_epoch(events) -> Optional[int]:
+    """Return the newest ``ts_epoch`` among ``events`` (an EventTable or dicts)."""
+    if hasattr(events, 'latest_epoch'):
+        return events.latest_epoch()
+    epochs = [event['ts_epoch'] for event in events if event.get('ts_epoch') is not None]
+    return max(epochs) if epochs else None
+
+
+def connect(db_path: str, timeout: float = 300.0) -> sqlite3.Connection:
+    """
+    Open (creating if needed) a fleet database and ensure its schema.
+
+    ``timeout`` lets concurrent batch workers queue for the write lock.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, FLEET_SCHEMA):
+            raise ValueError(f'Unsupported fleet database schema {version} in {db_path}')
+        if version == 0:
+            conn.executescript(
+                f'BEGIN IMMEDIATE;{_SCHEMA_SQL}PRAGMA user_version = {FLEET_SCHEMA};COMMIT;'
+            )
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def _connect_read(db_path: str) -> sqlite3.Connection:
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f'Fleet database not found: {db_path}')
+    uri = Path(os.path.abspath(db_path)).as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise ValueError(f'Not a fleet database: {db_path}') from None
+    if version != FLEET_SCHEMA:
+        conn.close()
+        raise ValueError(f'Unsupported fleet database schema {version} in {db_path}')
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _shift_firmware(conn, kind: str, old: Optional[str], new: Optional[str]) -> None:
+    if old == new:
+        return
+    if old is not None:
+        conn.execute(
+            'UPDATE firmware SET servers = servers - 1 WHERE kind = ? AND version = ?', (kind, old)
+        )
+        conn.execute(
+            'DELETE FROM firmware WHERE kind = ? AND version = ? AND servers <= 0', (kind, old)
+        )
+    if new is not None:
+        conn.execute(
+            'INSERT INTO firmware (kind, version, servers) VALUES (?, ?, 1) '
+            'ON CONFLICT (kind, version) DO UPDATE SET servers = servers + 1',
+            (kind, new),
+        )
+
+
+def update_fleet(
+    db_path: str,
+    *,
+    inventory: dict,
+    findings: Iterable[dict],
+    input_path: Optional[str] = None,
+    digest: Optional[str] = None,
+    observed_at: Optional[int] = None,
+) -> dict:
+    """
+    Fold one parsed bundle into the fleet database at ``db_path``.
+
+    The server row keyed by ``inventory['SerialNumber']`` keeps the inventory
+    of the newest bundle by ``observed_at`` (the bundle's latest event epoch;
+    ingestion time when it has none), so loading an old bundle later never
+    rolls a server back. Finding counts per component and the firmware
+    version distribution are updated in place, in one transaction, without
+    reading any other bundle. A bundle whose ``digest`` (content hash) is
+    already recorded is ignored, so re-running a bundle never double counts.
+
+    Returns ``{'serial', 'updated', 'duplicate'}``; bundles without a serial
+    number are not recorded.
+    """
+    serial = (inventory.get('SerialNumber') or '').strip() or None
+    if serial is None:
+        return {'serial': None, 'updated': False, 'duplicate': False}
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if observed_at is None:
+        observed_at = int(now.timestamp())
+    components = Counter(finding.get('component') or UNCLASSIFIED for finding in findings)
+    firmware = {kind: inventory.get(key) or None for kind, key in FIRMWARE_KEYS}
+
+    conn = connect(db_path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if digest is not None and conn.execute(
+                'SELECT 1 FROM bundles WHERE digest = ?', (digest,)
+            ).fetchone():
+                conn.execute('ROLLBACK')
+                return {'serial': serial, 'updated': False, 'duplicate': True}
+            conn.execute(
+                'INSERT INTO bundles (digest, serial, input, observed_at, findings, ingested_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (digest, serial, input_path, observed_at, sum(components.values()), now.isoformat()),
+            )
+            current = conn.execute(
+                'SELECT rom_version, ilo_version, observed_at FROM servers WHERE serial = ?',
+                (serial,),
+            ).fetchone()
+            newest = current is None or observed_at >= current[2]
+            if newest:
+                conn.execute(
+                    'INSERT INTO servers (serial, product, rom_version, ilo_version, inventory, '
+                    'input, observed_at, bundles, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?) '
+                    'ON CONFLICT (serial) DO UPDATE SET product = excluded.product, '
+                    'rom_version = excluded.rom_version, ilo_version = excluded.ilo_version, '
+                    'inventory = excluded.inventory, input = excluded.input, '
+                    'observed_at = excluded.observed_at, bundles = bundles + 1, '
+                    'updated_at = excluded.updated_at',
+                    (
+                        serial,
+                        inventory.get('ProductName'),
+                        firmware['rom'],
+                        firmware['ilo'],
+                        json.dumps(inventory, ensure_ascii=False, default=str),
+                        input_path,
+                        observed_at,
+                        now.isoformat(),
+                    ),
+                )
+                previous = (None, None) if current is None else current[:2]
+                for (kind, _), old in zip(FIRMWARE_KEYS, previous):
+                    _shift_firmware(conn, kind, old, firmware[kind])
+            else:
+                conn.execute('UPDATE servers SET bundles = bundles + 1 WHERE serial = ?', (serial,))
+            conn.executemany(
+                'INSERT INTO component_faults (serial, component, findings, bundles, last_seen) '
+                'VALUES (?, ?, ?, 1, ?) ON CONFLICT (serial, component) DO UPDATE SET '
+                'findings = findings + excluded.findings, bundles = bundles + 1, '
+                'last_seen = MAX(last_seen, excluded.last_seen)',
+                [
+                    (serial, component, count, observed_at)
+                    for component, count in sorted(components.items())
+                ],
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+    return {'serial': serial, 'updated': newest, 'duplicate': False}
+
+
+def fleet_summary(db_path: str) -> dict:
+    """
+    Return fleet-wide rollups straight from the stored aggregates.
+
+    ``firmware`` maps ``rom``/``ilo`` to ``{version: server_count}`` and
+    ``components`` maps each component to its total finding count and the
+    number of servers affected.
+    """
+    conn = _connect_read(db_path)
+    try:
+        firmware = {kind: {} for kind, _ in FIRMWARE_KEYS}
+        for row in conn.execute(
+            'SELECT kind, version, servers FROM firmware ORDER BY kind, servers DESC, version'
+        ):
+            firmware.setdefault(row['kind'], {})[row['version']] = row['servers']
+        components = {
+            row['component']: {'findings': row['findings'], 'servers': row['servers']}
+            for row in conn.execute(
+                'SELECT component, SUM(findings) AS findings, COUNT(*) AS servers '
+                'FROM component_faults GROUP BY component ORDER BY findings DESC, component'
+            )
+        }
+        return {
+            'servers': conn.execute('SELECT COUNT(*) FROM servers').fetchone()[0],
+            'bundles': conn.execute('SELECT COUNT(*) FROM bundles').fetchone()[0],
+            'firmware': firmware,
+            'components': components,
+        }
+    finally:
+        conn.close()
+
+
+def list_servers(db_path: str) -> List[dict]:
+    """Return the latest inventory row of every server, ordered by serial."""
+    conn = _connect_read(db_path)
+    try:
+        return [
+            dict(row) for row in conn.execute(
+                'SELECT serial, product, rom_version, ilo_version, input, observed_at, bundles '
+                'FROM servers ORDER BY serial'
+            )
+        ]
+    finally:
+        conn.close()
+
+
+def recurring_faults(
+    db_path: str, component: Optional[str] = None, min_bundles: int = 2
+) -> List[dict]:
+    """
+    Return servers whose findings for a component recur across bundles.
+
+    A row is reported when the component was flagged in at least
+    ``min_bundles`` of the server's bundles; ``component`` (matched
+    case-insensitively) narrows the result to one component.
+    """
+    conn = _connect_read(db_path)
+    try:
+        sql = (
+            'SELECT f.serial, s.product, f.component, f.findings, f.bundles, f.last_seen '
+            'FROM component_faults f JOIN servers s ON s.serial = f.serial WHERE f.bundles >= ?'
+        )
+        params = [min_bundles]
+        if component:
+            sql += ' AND f.component = ?'
+            params.append(component)
+        sql += ' ORDER BY f.bundles DESC, f.findings DESC, f.serial, f.component'
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
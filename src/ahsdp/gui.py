@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import sys
 import threading
@@ -77,6 +78,29 @@ def _open_path(path: str | os.PathLike[str]) -> None:
         sg.popup_error(f"Could not open path:\n{target}")
 
 
+def _format_metrics(metrics: dict) -> list[str]:
+    """Render ``metadata['metrics']`` as GUI log lines."""
+
+    lines = [f"⏱️  Run time: {metrics.get('total_wall_seconds', 0):.2f}s"]
+    for name, stage in (metrics.get("stages") or {}).items():
+        lines.append(
+            f"   • {name}: {stage['wall_seconds']:.3f}s wall, {stage['cpu_seconds']:.3f}s CPU"
+        )
+    if metrics.get("lines"):
+        lines.append(
+            "   • BB input: {read:,} bytes read, {raw:,} bytes decompressed, {count:,} lines "
+            "({rate:,} lines/s)".format(
+                read=metrics.get("bytes_read", 0),
+                raw=metrics.get("bytes_decompressed", 0),
+                count=metrics["lines"],
+                rate=metrics.get("lines_per_sec", 0),
+            )
+        )
+    if metrics.get("peak_rss_mb") is not None:
+        lines.append(f"   • Peak RSS: {metrics['peak_rss_mb']} MB")
+    return lines
+
+
 def run_pipeline(
     input_path: str,
     report_target: str,
@@ -86,6 +110,10 @@ def run_pipeline(
     keep_temp: bool,
     redactions: Iterable[str],
     log_cb: Callable[[str], None],
+    redact_exports: bool = False,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_severity: Optional[str] = None,
 ):
     """Execute :func:`ahsdp.core.run_parser` and stream progress to ``log_cb``."""
 
@@ -109,9 +137,14 @@ def run_pipeline(
             )
         )
         if redactions:
-            log_cb(f"🔐 Redactions: {', '.join(redactions)}")
+            scope = "report + exports" if redact_exports else "report"
+            log_cb(f"🔐 Redactions ({scope}): {', '.join(redactions)}")
         else:
             log_cb("🔐 Redactions: (none)")
+        if since or until:
+            log_cb(f"🕑 Time window: {since or 'start'} → {until or 'end'}")
+        if min_severity and min_severity != "INFO":
+            log_cb(f"🔽 Keeping BB events at or above {min_severity}")
 
         result = run_parser(
             str(resolved_input),
@@ -122,6 +155,10 @@ def run_pipeline(
             enable_bb=enable_bb,
             enable_faults=enable_faults,
             keep_temp=keep_temp,
+            redact_exports=redact_exports,
+            since=since or None,
+            until=until or None,
+            min_severity=min_severity or None,
         )
 
         log_cb("✅ Report generated successfully.")
@@ -132,6 +169,10 @@ def run_pipeline(
             log_cb("   • BB artifacts parsed and included in report.")
         if result.get("findings"):
             log_cb(f"   • Findings detected: {len(result['findings'])}")
+        metrics = result.get("metadata", {}).get("metrics")
+        if metrics:
+            for line in _format_metrics(metrics):
+                log_cb(line)
         log_cb(f"🕒 Completed at {_utc_now_iso()} UTC")
 
         return True, result
@@ -195,12 +236,23 @@ def main() -> None:
         [
             sg.Text("Redaction tokens (comma separated):"),
             sg.Input(DEFAULT_REDACTIONS, key="-REDACT-", expand_x=True),
+            sg.Checkbox("Redact exports too", key="-REDACT-EXPORTS-", default=False),
         ],
         [
             sg.Checkbox("Enable .bb parsing", key="-ENABLE-BB-", default=False),
             sg.Checkbox("Enable fault detection", key="-ENABLE-FAULTS-", default=True),
             sg.Checkbox("Preserve temp extraction", key="-KEEP-TMP-", default=False),
         ],
+        [
+            sg.Text("Only lines since (ISO time or e.g. 72h):"),
+            sg.Input("", key="-SINCE-", size=(22, 1)),
+            sg.Text("until:"),
+            sg.Input("", key="-UNTIL-", size=(22, 1)),
+            sg.Text("Minimum severity:"),
+            sg.Combo(
+                ["INFO", "WARN", "ERROR"], default_value="INFO", key="-MIN-SEVERITY-", readonly=True
+            ),
+        ],
         [
             sg.Multiline(
                 "",
@@ -254,6 +306,10 @@ def main() -> None:
             enable_bb = bool(values.get("-ENABLE-BB-"))
             enable_faults = bool(values.get("-ENABLE-FAULTS-"))
             keep_temp = bool(values.get("-KEEP-TMP-"))
+            redact_exports = bool(values.get("-REDACT-EXPORTS-"))
+            since = (values.get("-SINCE-") or "").strip()
+            until = (values.get("-UNTIL-") or "").strip()
+            min_severity = values.get("-MIN-SEVERITY-") or "INFO"
 
             busy = True
             window["-RUN-"].update(disabled=True)
@@ -272,6 +328,10 @@ def main() -> None:
                     keep_temp,
                     redactions,
                     log,
+                    redact_exports=redact_exports,
+                    since=since,
+                    until=until,
+                    min_severity=min_severity,
                 )
                 window.write_event_value("-DONE-", (ok, result))
 
@@ -299,4 +359,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
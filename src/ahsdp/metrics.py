@@ -0,0 +1,111 @@
+import contextlib
+import sys
+import time
+
+try:  # ``resource`` is POSIX-only.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+def _windows_peak_working_set():  # pragma: no cover - Windows
+    """Return this process's ``PeakWorkingSetSize`` in bytes, or None on failure."""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    try:
+        kernel32 = ctypes.WinDLL('kernel32')
+        psapi = ctypes.WinDLL('psapi')
+    except OSError:
+        return None
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD
+    ]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process and its reaped children in MB, or
+    ``None`` where the platform does not report it. On Windows this is the
+    peak working set of the current process only.
+    """
+    if sys.platform == 'win32':
+        peak = _windows_peak_working_set()
+        return None if peak is None else round(peak / (1024 * 1024), 1)
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports kilobytes, macOS bytes.
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / scale, 1)
+
+
+class RunMetrics:
+    """
+    Collect per-stage wall/CPU time and I/O counters for one ``run_parser`` call.
+
+    CPU time is that of the calling process; work done in a worker pool shows
+    up as wall time only.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            entry['wall_seconds'] += time.perf_counter() - wall
+            entry['cpu_seconds'] += time.process_time() - cpu
+
+    def add(self, **counters):
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self):
+        stages = {
+            name: {key: round(value, 4) for key, value in entry.items()}
+            for name, entry in self.stages.items()
+        }
+        result = {
+            'stages': stages,
+            'total_wall_seconds': round(time.perf_counter() - self._started, 4),
+        }
+        result.update(self.counters)
+        parse_seconds = self.stages.get('parse_bb', {}).get('wall_seconds')
+        if parse_seconds and self.counters.get('lines'):
+            result['lines_per_sec'] = round(self.counters['lines'] / parse_seconds)
+        result['peak_rss_mb'] = peak_rss_mb()
+        return result
@@ -1,9 +1,25 @@
+import codecs
+import contextlib
+import datetime
+import functools
 import gzip
-import io
+import itertools
+import mmap
 import os
 import re
+import struct
+import time
 import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
+from .events import EventTable
+from .faults import RULES_VERSION, matches_rule
+from .safe_extract import ZipMember, open_binary, source_name
+
+
+# Bump whenever parsing changes the records produced for the same input.
+PARSER_VERSION = 4
 
 _SEVERITY_KEYWORDS = (
     (('critical', 'fatal', 'panic', 'unrecoverable', 'catastrophic', 'failed', 'failure', 'asr'), 'ERROR'),
@@ -11,90 +27,624 @@ _SEVERITY_KEYWORDS = (
     (('info', 'informational', 'notice', 'ok', 'started'), 'INFO'),
 )
 
+# Levels ``_classify_severity`` can return, least severe first.
+SEVERITY_LEVELS = ('INFO', 'WARN', 'ERROR')
+_LEVEL_RANK = {level: rank for rank, level in enumerate(SEVERITY_LEVELS)}
+
 _TIMESTAMP_PATTERNS = (
     re.compile(r'(?P<ts>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})'),
     re.compile(r'(?P<ts>\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})'),
     re.compile(r'(?P<ts>\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})'),
 )
 
-
-def _decode_text(data):
-    for enc in ('utf-8', 'utf-16le', 'latin-1'):
-        try:
-            return data.decode(enc)
-        except UnicodeDecodeError:
-            continue
-    return data.decode('utf-8', errors='replace')
+# Byte-order marks, longest first so UTF-32 LE is not mistaken for UTF-16 LE.
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Decodes any byte sequence; used when the sniffed codec fails past the sample.
+_FALLBACK_ENCODING = 'latin-1'
+_CHUNK_SIZE = 64 * 1024
+_BINARY_SAMPLE = 1024
+_SNIFF_SAMPLE = 4096
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+# Deleting every byte except C0 controls (other than \t\n\v\f\r) leaves
+# exactly the bytes ``_looks_binary`` counts.
+_TEXT_BYTES = bytes(b for b in range(256) if not (b < 9 or 13 < b < 32))
+# Old-style binary BlackBox layout: a 0x3A header byte, 72-byte field
+# definitions (type byte with the high bit set, flags, padding, NUL-padded
+# name), then 8-byte telemetry blocks (tag byte and seven value bytes).
+_BINARY_HEADER = 0x3A
+_FIELD_RECORD = struct.Struct('<BB6x64s')
+_TELEMETRY_BLOCK = struct.Struct('<B7s')
+_BINARY_HEAD_SIZE = 1 + _FIELD_RECORD.size
+# Rotated BlackBox logs are named after the UTC day they cover.
+_DATED_NAME_RE = re.compile(r'(\d{4})(\d{2})(\d{2})_\d{4}\.bb(?:\.|$)', re.I)
+# Characters that terminate a line for ``str.splitlines``.
+_LINE_BREAKS = frozenset('\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
 
 
 def _looks_binary(data):
     if not data:
         return False
-    sample = data[: min(len(data), 1024)]
-    control = sum(1 for b in sample if b < 9 or 13 < b < 32)
-    return control / max(len(sample), 1) > 0.2
+    sample = data[:_BINARY_SAMPLE]
+    control = len(sample.translate(None, _TEXT_BYTES))
+    return control / len(sample) > 0.2
+
+
+def _text_sample(block, encoding):
+    """
+    Return the bytes of ``block`` that ``_looks_binary`` should judge.
+
+    UTF-16 LE text sniffed without a BOM is checked on its low (even) bytes,
+    which hold the characters of ASCII-range text; the interleaved NULs would
+    otherwise mark every such log as binary. A BOM is explicit enough that
+    BOM-marked payloads are never treated as binary.
+    """
+    if encoding == 'utf-16le':
+        return block[:2 * _BINARY_SAMPLE:2]
+    if encoding in ('utf-16', 'utf-32'):
+        return b''
+    return block
+
 
+def _sniff_encoding(sample):
+    """
+    Pick the codec for a payload from its first bytes.
 
-def _iter_text_chunks(path):
+    A BOM wins. Otherwise mostly-NUL odd bytes with few NUL even bytes mark
+    BOM-less UTF-16 LE (ASCII text stored as two bytes per character), a
+    sample that decodes as UTF-8 means UTF-8, and anything else is latin-1.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    sample = sample[:_SNIFF_SAMPLE]
+    half = len(sample) // 2
+    if half and sample[1::2].count(0) >= 0.6 * half and sample[0::2].count(0) <= 0.05 * half:
+        return 'utf-16le'
+    try:
+        # final=False tolerates a multi-byte character cut off by the sample.
+        codecs.getincrementaldecoder('utf-8')().decode(sample, False)
+    except UnicodeDecodeError:
+        return _FALLBACK_ENCODING
+    return 'utf-8'
+
+
+def _read_at_least(stream, size):
+    """Read up to ``size`` bytes, looping over short reads from decompressors."""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        block = stream.read(remaining)
+        if not block:
+            break
+        parts.append(block)
+        remaining -= len(block)
+    return b''.join(parts)
+
+
+@contextlib.contextmanager
+def _open_mapped(path):
+    """
+    Map a plain file read-only. The mapping reads like a stream; binary logs
+    are decoded from it in place instead of being copied onto the heap.
+    Empty files (which cannot be mapped) come back as the open file.
+    """
     with open(path, 'rb') as fh:
-        blob = fh.read()
-    if blob.startswith(b'PK\x03\x04'):
-        with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        try:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+        if mapped is None:
+            yield fh
+            return
+        with mapped:
+            yield mapped
+
+
+@contextlib.contextmanager
+def _open_gzip(source):
+    with open_binary(source) as raw, gzip.GzipFile(fileobj=raw) as stream:
+        yield stream
+
+
+@contextlib.contextmanager
+def _open_zip(source):
+    if isinstance(source, ZipMember):
+        # ZipExtFile is seekable, so a nested archive is read in place rather
+        # than buffered whole; memory stays flat whatever the member's size.
+        with source.open() as raw, zipfile.ZipFile(raw) as zf:
+            yield zf
+        return
+    with zipfile.ZipFile(source) as zf:
+        yield zf
+
+
+def _iter_members(path):
+    """
+    Yield ``(inner_name, opener, check_binary)`` for each payload stored in ``path``.
+
+    ``path`` may be a filesystem path or a :class:`ZipMember`. ``opener``
+    returns a fresh binary stream on every call so a payload can be re-read
+    with a different codec without buffering it in memory.
+    """
+    with open_binary(path) as fh:
+        magic = fh.read(4)
+    base = source_name(path)
+    if magic.startswith(b'PK\x03\x04'):
+        with _open_zip(path) as zf:
             for info in zf.infolist():
                 if info.is_dir():
                     continue
-                data = zf.read(info.filename)
-                if _looks_binary(data):
-                    continue
-                yield info.filename, _decode_text(data)
+                yield info.filename, functools.partial(zf.open, info, 'r'), True
         return
-    if blob.startswith(b'\x1f\x8b'):
-        text = _decode_text(gzip.decompress(blob))
-        yield os.path.basename(path), text
+    if magic.startswith(b'\x1f\x8b'):
+        yield base, functools.partial(_open_gzip, path), False
         return
-    if _looks_binary(blob):
+    if isinstance(path, ZipMember):
+        yield base, functools.partial(open_binary, path), True
         return
-    yield os.path.basename(path), _decode_text(blob)
+    yield base, functools.partial(_open_mapped, path), True
+
+
+def _iter_lines(opener, encoding=None, check_binary=True, chunk_size=_CHUNK_SIZE, counters=None):
+    """
+    Decode a payload incrementally and yield its lines without line endings.
+
+    Lines are split exactly like ``str.splitlines`` on the fully decoded text,
+    including ``\\r\\n`` pairs that straddle a chunk boundary, but only one
+    chunk plus the current partial line is held in memory at a time.
+    With ``encoding=None`` the codec is sniffed once from the first block.
+    Raises ``UnicodeDecodeError`` when the payload
+    is not valid ``encoding``. When ``counters`` is given, its ``bytes`` and ``lines``
+    entries accumulate the decompressed payload size and the lines yielded.
+    """
+    pending = ''
+    with opener() as stream:
+        block = _read_at_least(stream, max(chunk_size, _SNIFF_SAMPLE))
+        if encoding is None:
+            encoding = _sniff_encoding(block)
+        if check_binary and _looks_binary(_text_sample(block, encoding)):
+            return
+        decoder = codecs.getincrementaldecoder(encoding)()
+        while block:
+            if counters is not None:
+                counters['bytes'] += len(block)
+            text = pending + decoder.decode(block)
+            pending = ''
+            if text:
+                lines = text.splitlines()
+                tail = text[-1]
+                if tail == '\r':
+                    # A following '\n' may arrive with the next chunk.
+                    pending = lines.pop() + '\r'
+                elif tail not in _LINE_BREAKS:
+                    pending = lines.pop()
+                if counters is not None:
+                    counters['lines'] += len(lines)
+                yield from lines
+            block = stream.read(chunk_size)
+        text = pending + decoder.decode(b'', final=True)
+    lines = text.splitlines()
+    if counters is not None:
+        counters['lines'] += len(lines)
+    yield from lines
+
+
+def _trie_pattern(words):
+    """Return a regex alternation for ``words`` factored by shared prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            return f"(?:{'|'.join(branches)})?"
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+
+    return build(trie)
+
+
+def _rank_keywords(groups):
+    """
+    Map keyword -> (rank, level). Earlier groups rank higher; the bare 'err'
+    fallback only applies when no other keyword is present, so it ranks lowest.
+    """
+    ranks = {'err': (0, 'ERROR')}
+    for rank, (words, level) in zip(range(len(groups), 0, -1), groups):
+        for word in words:
+            ranks.setdefault(word, (rank, level))
+    return ranks
+
+
+_KEYWORD_RANKS = _rank_keywords(_SEVERITY_KEYWORDS)
+_TOP_RANK = len(_SEVERITY_KEYWORDS)
+_SEVERITY_RE = re.compile(_trie_pattern(_KEYWORD_RANKS))
 
 
 def _classify_severity(line):
     lower = line.lower()
-    for keywords, level in _SEVERITY_KEYWORDS:
-        if any(word in lower for word in keywords):
+    search = _SEVERITY_RE.search
+    best_rank, best_level = -1, 'INFO'
+    match = search(lower)
+    while match is not None:
+        rank, level = _KEYWORD_RANKS[match.group()]
+        if rank == _TOP_RANK:
             return level
-    if 'err' in lower:
-        return 'ERROR'
-    return 'INFO'
+        if rank > best_rank:
+            best_rank, best_level = rank, level
+        # Keywords can overlap ("started" + "degraded"), so resume one
+        # character after the match start rather than after its end.
+        match = search(lower, match.start() + 1)
+    return best_level
 
 
 def _extract_timestamp(line):
-    for pattern in _TIMESTAMP_PATTERNS:
-        match = pattern.search(line)
+    # Every supported format contains "HH:MM:SS"; the ISO form also needs a
+    # '-' and the US forms a '/'. Cheap separator checks skip patterns that
+    # cannot match while keeping the ISO > MM/DD/YYYY > MM/DD/YY precedence.
+    if ':' not in line:
+        return None
+    iso, us_long, us_short = _TIMESTAMP_PATTERNS
+    if '-' in line:
+        match = iso.search(line)
+        if match:
+            return match.group('ts')
+    if '/' in line:
+        match = us_long.search(line) or us_short.search(line)
         if match:
             return match.group('ts')
     return None
 
 
-def parse_bb_files(paths):
-    records = []
+@functools.lru_cache(maxsize=4096)
+def _day_epoch(date_part):
+    """UTC epoch seconds of midnight on ``date_part``, or None for impossible dates."""
+    if date_part[4] == '-':
+        year, month, day = int(date_part[0:4]), int(date_part[5:7]), int(date_part[8:10])
+    else:
+        month, day, year = (int(part) for part in date_part.split('/'))
+        if len(date_part) == 8:
+            year += 1900 if year >= 69 else 2000
+    try:
+        return (datetime.date(year, month, day).toordinal() - _EPOCH_ORDINAL) * 86400
+    except ValueError:
+        return None
+
+
+def _timestamp_epoch(ts):
+    """
+    Convert a timestamp returned by ``_extract_timestamp`` to UTC epoch seconds.
+
+    Slash dates are read as MM/DD; two-digit years follow the POSIX ``%y``
+    pivot (69-99 -> 19xx, 00-68 -> 20xx). Returns None for impossible dates.
+    Nearly every timestamp in a log is unique, but its date is shared with
+    thousands of neighbours, so only the date part is cached.
+    """
+    if ts[4] == '-':
+        day = _day_epoch(ts[:10])
+    else:
+        date_part, ts = ts.split(None, 1)
+        day = _day_epoch(date_part)
+    if day is None:
+        return None
+    hour, minute, second = int(ts[-8:-6]), int(ts[-5:-3]), int(ts[-2:])
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return day + hour * 3600 + minute * 60 + second
+
+
+def _build_records(source, lines, window=None, counters=None, min_rank=0):
+    """
+    Build an :class:`EventTable` from decoded ``lines``.
+
+    With a ``window`` of inclusive ``(since, until)`` epoch bounds, a line
+    whose timestamp falls outside it is dropped before it is classified or
+    stored, and counted under ``counters['dropped']``. Lines without a
+    (valid) timestamp are always kept. With ``min_rank`` above zero, every
+    classified line is counted under ``counters['levels']`` and lines below
+    that rank of :data:`SEVERITY_LEVELS` are stored only when a fault rule
+    matches them, so findings do not depend on the threshold.
+    """
+    table = EventTable()
+    append = table.append
+    since, until = window or (None, None)
+    levels = counters['levels'] if min_rank else None
+    dropped = 0
+    for idx, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        ts = _extract_timestamp(line)
+        epoch = _timestamp_epoch(ts) if ts else None
+        if window is not None and epoch is not None and not since <= epoch <= until:
+            dropped += 1
+            continue
+        severity = _classify_severity(line)
+        if min_rank:
+            levels[severity] += 1
+            if _LEVEL_RANK[severity] < min_rank and not matches_rule(line):
+                continue
+        append(source, idx, line, severity, ts, epoch)
+    if counters is not None:
+        counters['dropped'] = counters.get('dropped', 0) + dropped
+    return table
+
+
+def _window(since, until):
+    """Return inclusive ``(since, until)`` bounds, or None when both are open."""
+    if since is None and until is None:
+        return None
+    return (-(2 ** 63) if since is None else since, 2 ** 63 - 1 if until is None else until)
+
+
+def _name_date_outside(name, window):
+    """
+    Return True when ``name`` follows ``YYYYMMDD_NNNN.bb`` and that whole UTC
+    day lies outside ``window``, so the artifact need not be opened.
+    """
+    match = _DATED_NAME_RE.match(os.path.basename(name.replace('\\', '/')))
+    if window is None or match is None:
+        return False
+    year, month, day = match.groups()
+    start = _day_epoch(f'{year}-{month}-{day}')
+    if start is None:
+        return False
+    since, until = window
+    return start > until or start + 86399 < since
+
+
+def _is_binary_bb(head):
+    """
+    Return True when ``head`` starts an old-style (0x3A header) binary log.
+
+    The whole first field definition must be well formed (high-bit type
+    byte, zero padding, printable NUL-padded name), so a text log that merely
+    starts with ':' and a non-ASCII character stays on the text path.
+    """
+    if len(head) < _BINARY_HEAD_SIZE or head[0] != _BINARY_HEADER or not head[1] & 0x80:
+        return False
+    if any(head[3:9]):
+        return False
+    name, _, padding = head[9:_BINARY_HEAD_SIZE].partition(b'\0')
+    return bool(name) and not padding.strip(b'\0') and all(0x20 <= b < 0x7F for b in name)
+
+
+def _decode_binary(source, data, min_rank=0, levels=None):
+    """
+    Decode an old-style binary BlackBox payload into an :class:`EventTable`.
+
+    Each field definition becomes one record naming the field, classified
+    like a text line so names such as ``System Board Fault`` reach the fault
+    rules. Telemetry blocks follow as ``INFO`` records, one per run of
+    identical blocks with the repeat count appended. Records are unpacked
+    straight from a ``memoryview`` of ``data``; a trailing partial block is
+    ignored. With ``min_rank``, records below it are tallied in ``levels``
+    and kept only when a fault rule matches, as in :func:`_build_records`. Returns ``(table, records_decoded)``.
+    """
+    table = EventTable()
+    append = table.append
+    view = memoryview(data)
+    end = len(view)
+    pos = 1
+    ordinal = 0
+    field_size = _FIELD_RECORD.size
+    while pos + field_size <= end and view[pos] & 0x80:
+        field_type, flags, raw_name = _FIELD_RECORD.unpack_from(view, pos)
+        pos += field_size
+        name = raw_name.split(b'\0', 1)[0].decode('latin-1').strip()
+        ordinal += 1
+        severity = _classify_severity(name)
+        message = f'Field {name} (type 0x{field_type:02x}, flags 0x{flags:02x})'
+        if min_rank:
+            levels[severity] += 1
+            if _LEVEL_RANK[severity] < min_rank and not matches_rule(message):
+                continue
+        append(source, ordinal, message, severity)
+    decoded = ordinal
+    count = (end - pos) // _TELEMETRY_BLOCK.size
+    blocks = _TELEMETRY_BLOCK.iter_unpack(view[pos:pos + count * _TELEMETRY_BLOCK.size])
+    for (tag, value), run in itertools.groupby(blocks):
+        repeat = len(list(run))
+        decoded += repeat
+        ordinal += 1
+        if min_rank:
+            levels['INFO'] += 1
+            continue
+        message = f'Telemetry 0x{tag:02x}: {value.hex(" ")}'
+        if repeat > 1:
+            message += f' (x{repeat})'
+        append(source, ordinal, message, 'INFO')
+    view.release()
+    return table, decoded
+
+
+def _parse_member(source, opener, check_binary, stats, window=None, min_rank=0):
+    with opener() as stream:
+        head = _read_at_least(stream, _BINARY_HEAD_SIZE)
+        if _is_binary_bb(head):
+            # A mapped file is decoded in place; other streams are read whole.
+            data = stream if isinstance(stream, mmap.mmap) else head + stream.read()
+            stats['bytes_decompressed'] += len(data)
+            records, decoded = _decode_binary(source, data, min_rank, stats['levels'])
+            stats['lines'] += decoded
+            return records
+    counters = {'bytes': 0, 'lines': 0, 'dropped': 0, 'levels': Counter()}
+    try:
+        lines = _iter_lines(opener, None, check_binary, counters=counters)
+        records = _build_records(source, lines, window, counters, min_rank)
+    except UnicodeDecodeError:
+        # The sample looked like the sniffed codec but a later chunk was not;
+        # discard what was built and re-stream as latin-1, which cannot fail.
+        counters = {'bytes': 0, 'lines': 0, 'dropped': 0, 'levels': Counter()}
+        lines = _iter_lines(opener, _FALLBACK_ENCODING, check_binary, counters=counters)
+        records = _build_records(source, lines, window, counters, min_rank)
+    stats['bytes_decompressed'] += counters['bytes']
+    stats['lines'] += counters['lines']
+    stats['lines_out_of_window'] += counters['dropped']
+    stats['levels'].update(counters['levels'])
+    return records
+
+
+def artifact_outside_window(path, since=None, until=None):
+    """Return True when ``path`` is a dated ``YYYYMMDD_NNNN.bb`` log wholly outside the window."""
+    return _name_date_outside(source_name(path), _window(since, until))
+
+
+def _stored_size(path):
+    if isinstance(path, ZipMember):
+        return path.info.compress_size
+    return os.path.getsize(path)
+
+
+def _parse_artifact(path, window=None, min_rank=0):
+    """Parse one artifact; return ``(source, records, stats)``."""
+    started = time.perf_counter()
+    base = source_name(path)
+    records = EventTable()
+    stats = {
+        'bytes_read': _stored_size(path),
+        'bytes_decompressed': 0,
+        'lines': 0,
+        'lines_out_of_window': 0,
+        'levels': Counter(),
+    }
+    for inner, opener, check_binary in _iter_members(path):
+        if inner != base and _name_date_outside(inner, window):
+            continue
+        source = base if inner == base else f'{base}:{inner}'
+        records.extend(_parse_member(source, opener, check_binary, stats, window, min_rank))
+    stats['seconds'] = time.perf_counter() - started
+    return base, records, stats
+
+
+def _fingerprint(path, fingerprints):
+    """Return the ``(crc32, size)`` pair recorded for ``path`` in its zip central directory."""
+    if isinstance(path, ZipMember):
+        return path.info.CRC, path.info.file_size
+    if fingerprints:
+        return fingerprints.get(os.path.abspath(path))
+    return None
+
+
+def parse_bb_files(
+    paths,
+    workers=None,
+    member_cache=None,
+    fingerprints=None,
+    since=None,
+    until=None,
+    min_severity=None,
+):
+    """
+    Parse BlackBox artifacts into line records.
+
+    With ``workers`` greater than one the artifacts are spread across a process
+    pool. Results are merged in input order, so ``records`` and ``sources`` are
+    identical to a serial run. ``records`` is an :class:`EventTable`, which
+    iterates as the usual per-line dicts.
+
+    ``member_cache`` (a :class:`~ahsdp.cache.MemberCache`) reuses records of
+    archive members already seen, keyed by CRC-32 and size. Those come from
+    ``ZipMember`` objects or, for extracted files, the ``fingerprints`` mapping
+    of absolute path to ``(crc32, size)``. Hit/miss counts and the parse time
+    saved are returned under ``member_cache``.
+
+    ``stats`` totals the stored bytes read, decompressed payload bytes decoded
+    and lines read for the artifacts actually parsed (cache hits excluded).
+
+    ``since``/``until`` (inclusive UTC epoch seconds) drop timestamped lines
+    outside the window while parsing, before they are classified or stored;
+    lines without a timestamp are kept. Artifacts named ``YYYYMMDD_NNNN.bb``
+    whose day lies outside the window are skipped unopened and listed under
+    ``skipped`` instead of ``sources``.
+
+    ``min_severity`` (``'WARN'`` or ``'ERROR'``) keeps only lines classified
+    at or above that level, plus lower lines a fault rule matches, so the
+    findings are the same as without a threshold. Every classified line is
+    still tallied, and the totals are returned under ``severity_counts``.
+    """
+    paths = list(paths)
+    window = _window(since, until)
+    min_rank = _LEVEL_RANK[min_severity.upper()] if min_severity else 0
+    results = [None] * len(paths)
+    keys = [None] * len(paths)
+    stats = {'hits': 0, 'misses': 0, 'seconds_saved': 0.0}
+    pending = []
+    skipped = []
+    for idx, path in enumerate(paths):
+        if _name_date_outside(source_name(path), window):
+            skipped.append(idx)
+            continue
+        fingerprint = _fingerprint(path, fingerprints) if member_cache is not None else None
+        if fingerprint is not None:
+            keys[idx] = member_cache.member_key(
+                source_name(path), *fingerprint, parser=PARSER_VERSION, window=window,
+                min_rank=min_rank, rules=RULES_VERSION if min_rank else None,
+            )
+            cached = member_cache.get(keys[idx])
+            if cached is not None:
+                results[idx] = (cached['source'], cached['records'], cached.get('levels'))
+                stats['hits'] += 1
+                stats['seconds_saved'] += cached['seconds']
+                continue
+            stats['misses'] += 1
+        pending.append(idx)
+
+    todo = [paths[idx] for idx in pending]
+    if workers and workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            parse = functools.partial(_parse_artifact, window=window, min_rank=min_rank)
+            parsed = list(pool.map(parse, todo))
+    else:
+        parsed = [_parse_artifact(path, window, min_rank) for path in todo]
+    totals = {'bytes_read': 0, 'bytes_decompressed': 0, 'lines': 0, 'lines_out_of_window': 0}
+    for idx, (base, artifact_records, artifact_stats) in zip(pending, parsed):
+        results[idx] = (base, artifact_records, artifact_stats['levels'])
+        for name in totals:
+            totals[name] += artifact_stats[name]
+        if keys[idx] is not None:
+            member_cache.put(
+                keys[idx],
+                {
+                    'source': base,
+                    'records': artifact_records,
+                    'levels': artifact_stats['levels'],
+                    'seconds': artifact_stats['seconds'],
+                },
+                evict=False,
+            )
+    if member_cache is not None and stats['misses']:
+        member_cache.evict()
+
+    records = EventTable()
     sources = []
-    for path in paths:
-        base = os.path.basename(path)
+    levels = Counter()
+    for entry in results:
+        if entry is None:
+            continue
+        base, artifact_records, artifact_levels = entry
         sources.append(base)
-        for inner, text in _iter_text_chunks(path):
-            source = base if inner == base else f'{base}:{inner}'
-            for idx, raw_line in enumerate(text.splitlines(), start=1):
-                line = raw_line.strip()
-                if not line:
-                    continue
-                rec = {
-                    'source': source,
-                    'line': idx,
-                    'message': line,
-                    'severity': _classify_severity(line),
-                }
-                ts = _extract_timestamp(line)
-                if ts:
-                    rec['timestamp'] = ts
-                records.append(rec)
-    return {'records': records, 'sources': sources}
+        records.extend(artifact_records)
+        levels.update(artifact_levels or {})
+    result = {'records': records, 'sources': sources, 'stats': totals}
+    if min_rank:
+        result['severity_counts'] = dict(levels)
+    if window is not None:
+        result['skipped'] = [source_name(paths[idx]) for idx in skipped]
+    if member_cache is not None:
+        stats['seconds_saved'] = round(stats['seconds_saved'], 3)
+        result['member_cache'] = stats
+    return result
@@ -1,11 +1,14 @@
-﻿import os, json, gzip, re, struct
+﻿import io, gzip, re, struct
+from .safe_extract import open_binary, source_name, source_size
+def _open_text(path):
+    return io.TextIOWrapper(open_binary(path),encoding='utf-8',errors='replace')
 def _maybe_gzip_open(path):
-    with open(path, 'rb') as f:
-        if f.read(2)==b'\x1f\x8b': return gzip.open(path,'rt',encoding='utf-8',errors='replace')
-    return open(path,'rt',encoding='utf-8',errors='replace')
+    with open_binary(path) as f: data=f.read()
+    if data[:2]==b'\x1f\x8b': data=gzip.decompress(data)
+    return io.TextIOWrapper(io.BytesIO(data),encoding='utf-8',errors='replace')
 def parse_bcert(path):
-    text=_maybe_gzip_open(path).read()
-    out={'_source': os.path.basename(path)}
+    with _maybe_gzip_open(path) as f: text=f.read()
+    out={'_source': source_name(path)}
     def g(tag):
         m=re.search(rf'<{tag}>(.*?)</{tag}>', text, re.I|re.S)
         return m.group(1).strip() if m else None
@@ -14,25 +17,25 @@ def parse_bcert(path):
     return out
 def parse_filepkg_txt(path):
     files=[]
-    with open(path,'rt',encoding='utf-8',errors='replace') as f:
+    with _open_text(path) as f:
         for line in f:
             line=line.strip()
             if line: files.append(line)
-    return {'_source': os.path.basename(path), 'files': files}
+    return {'_source': source_name(path), 'files': files}
 def parse_counters_pkg(path):
-    out={'_source': os.path.basename(path), 'counters': {}}
-    with open(path,'rb') as f: buf=f.read()
+    out={'_source': source_name(path), 'counters': {}}
+    with open_binary(path) as f: buf=f.read(12)
     ints=[]
     for i in range(0, min(len(buf),12),4): ints.append(struct.unpack('<I', buf[i:i+4])[0])
     for k,v in zip(['write_errors','rotation','drops'], ints): out['counters'][k]=v
     return out
 def parse_cust_info(path):
-    out={'_source': os.path.basename(path), 'fields': {}}
+    out={'_source': source_name(path), 'fields': {}}
     try:
-        with open(path,'rt',encoding='utf-8') as f:
+        with io.TextIOWrapper(open_binary(path),encoding='utf-8') as f:
             for line in f:
                 if '=' in line:
                     k,v=line.split('=',1); out['fields'][k.strip()]=v.strip()
     except UnicodeDecodeError:
-        out['fields']['_size_bytes']=os.path.getsize(path)
+        out['fields']['_size_bytes']=source_size(path)
     return out
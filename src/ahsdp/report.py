@@ -1,26 +1,97 @@
+import csv
 import datetime
+import gzip
 import json
 import os
+import types
 from collections import Counter
 
-from .redact import mask
+from .event_index import INDEX_FILE, write_index
+from .events import EventTable
+from .redact import Redactor
 
 
-def _redact(value, redactions):
-    return mask(value, redactions) if isinstance(value, str) else value
+EVENT_FIELDS = ('source', 'line', 'severity', 'timestamp', 'ts_epoch', 'message')
+EVENT_EXPORTS = {
+    'json': 'events.json',
+    'jsonl': 'events.jsonl',
+    'jsonl.gz': 'events.jsonl.gz',
+    'csv': 'events.csv',
+    'index': INDEX_FILE,
+}
+# Free-text fields that may carry customer data when exports are redacted.
+EVENT_REDACT_FIELDS = ('source', 'message')
+FINDING_REDACT_FIELDS = ('finding', 'details', 'source')
+HIGH_PRIORITY = frozenset({'ERROR', 'WARN'})
+SAMPLE_SIZE = 10
+FALLBACK_SAMPLE_SIZE = 5
+SOURCE_LIMIT = 10
 
 
-def _exec_summary(events, findings, inventory, metadata):
-    severity_counts = Counter((evt.get('severity') or 'INFO').upper() for evt in events)
+def _level(value):
+    return (value or 'INFO').upper()
+
+
+def summarise_events(
+    events, findings=(), *, sample_size=SAMPLE_SIZE, fallback_size=FALLBACK_SAMPLE_SIZE
+):
+    """
+    Aggregate everything the report needs from ``events`` in a single pass.
+
+    Returns ``severity_counts`` and ``source_counts``, ``sample`` (the first
+    ``sample_size`` ERROR/WARN events, or the first ``fallback_size`` events
+    when there are none) and ``finding_levels``. ``events`` may be any
+    iterable, including a generator; only the bounded samples are kept. An
+    :class:`EventTable` is summarised from its columns without building a
+    dict per row.
+    """
+    if isinstance(events, EventTable):
+        severity_counts = Counter()
+        for level, count in events.severity_counts().items():
+            severity_counts[_level(level)] += count
+        source_counts = Counter(events.source_counts())
+        wanted = {level for level in events.levels if _level(level) in HIGH_PRIORITY}
+        sample = events.rows_with_severity(wanted, sample_size)
+        head = events[:fallback_size] if not sample else []
+    else:
+        severity_counts = Counter()
+        source_counts = Counter()
+        sample = []
+        head = []
+        for evt in events:
+            level = _level(evt.get('severity'))
+            severity_counts[level] += 1
+            source_counts[evt.get('source')] += 1
+            if level in HIGH_PRIORITY:
+                if len(sample) < sample_size:
+                    sample.append(evt)
+            elif not sample and len(head) < fallback_size:
+                head.append(evt)
+    return {
+        'severity_counts': severity_counts,
+        'source_counts': source_counts,
+        'sample': sample or head,
+        'finding_levels': {(f.get('severity') or '').upper() for f in findings},
+    }
+
+
+def _utc_label(epoch):
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _window_skipped(metadata):
+    """Return the ``.bb`` artifacts skipped unopened because of the time window."""
+    return (metadata.get('time_window') or {}).get('skipped_artifacts') or []
+
+
+def _exec_summary(stats, inventory, metadata):
+    severity_counts = stats['severity_counts']
     errors = severity_counts.get('ERROR', 0) + severity_counts.get('CRITICAL', 0)
     warns = severity_counts.get('WARN', 0)
 
-    def has_level(level):
-        return any((f.get('severity') or '').upper() == level for f in findings)
-
-    if has_level('ERROR'):
+    if 'ERROR' in stats['finding_levels']:
         status = '🔴 Issues detected'
-    elif has_level('WARN'):
+    elif 'WARN' in stats['finding_levels']:
         status = '🟠 Warnings detected'
     elif errors:
         status = '🟠 Elevated events detected'
@@ -30,13 +101,24 @@ def _exec_summary(events, findings, inventory, metadata):
         status = '🟢 No issues detected'
 
     inventory_note = 'inventory detected' if inventory else 'inventory missing'
+    skipped = _window_skipped(metadata)
     if metadata.get('bb_parsed'):
         bb_note = '`.bb` parsed'
+    elif metadata.get('bb_enabled') and skipped:
+        bb_note = f'{len(skipped)} `.bb` artifact(s) outside the time window skipped'
     elif metadata.get('bb_enabled'):
         bb_note = '`.bb` artifacts not found'
     else:
         bb_note = '`.bb` parsing disabled'
 
+    window = metadata.get('time_window')
+    if window:
+        since, until = (
+            _utc_label(window[key]) if window.get(key) is not None else label
+            for key, label in (('since', 'start'), ('until', 'end'))
+        )
+        bb_note += f' (lines {since} – {until} UTC)'
+
     return (
         f'**Executive Summary:** {status} — {errors} ERROR, {warns} WARN; '
         f'{inventory_note}; {bb_note}.'
@@ -57,13 +139,18 @@ def write_markdown(
     findings = findings or []
     metadata = metadata or {}
     events = events or []
+    redact = redactions if isinstance(redactions, Redactor) else Redactor(redactions)
+    stats = summarise_events(events, findings)
+    if metadata.get('severity_counts') is not None:
+        # Lines below --min-severity were counted while parsing but not kept.
+        stats['severity_counts'] = Counter(
+            {_level(level): count for level, count in metadata['severity_counts'].items()}
+        )
 
     timestamp = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + 'Z'
 
     lines = ['# AHS Diagnostic Parser Report', f'_Generated: {timestamp}_', '']
-    lines.append(
-        _exec_summary(events=events, findings=findings, inventory=inventory, metadata=metadata)
-    )
+    lines.append(_exec_summary(stats, inventory=inventory, metadata=metadata))
     lines.append('')
 
     lines.extend(['| Finding | Severity | Confidence |', '|---|---|---|'])
@@ -73,7 +160,7 @@ def write_markdown(
             if entry.get('timestamp'):
                 title = f"{title} ({entry['timestamp']})"
             lines.append(
-                f"| {_redact(title, redactions)} | "
+                f"| {redact(title)} | "
                 f"{entry.get('severity', 'INFO')} | {entry.get('confidence', 'Medium')} |"
             )
     else:
@@ -85,23 +172,23 @@ def write_markdown(
     if findings:
         lines.extend(['', '### Finding Details'])
         for entry in findings:
-            detail = _redact(entry.get('details', ''), redactions)
+            detail = redact(entry.get('details', ''))
             source = entry.get('source')
             timestamp_detail = entry.get('timestamp')
             suffix_bits = []
             if source:
-                suffix_bits.append(f'source: {_redact(source, redactions)}')
+                suffix_bits.append(f'source: {redact(source)}')
             if timestamp_detail:
                 suffix_bits.append(f'timestamp: {timestamp_detail}')
             suffix = f" ({'; '.join(suffix_bits)})" if suffix_bits else ''
             lines.append(
-                f"- **{entry.get('severity', 'INFO')}** {_redact(entry.get('finding', ''), redactions)}: "
+                f"- **{entry.get('severity', 'INFO')}** {redact(entry.get('finding', ''))}: "
                 f"{detail}{suffix}"
             )
 
     lines.extend(['', '## System Inventory'])
     for key in ('ProductName', 'SerialNumber', 'ROMVersion', 'ILO'):
-        value = _redact(inventory.get(key), redactions)
+        value = redact(inventory.get(key))
         if value:
             lines.append(f'- **{key}:** {value}')
     if not inventory:
@@ -109,7 +196,7 @@ def write_markdown(
 
     lines.extend(['', '## Discovered Files'])
     for item in summary.get('files', []):
-        lines.append(f'- {_redact(item, redactions)}')
+        lines.append(f'- {redact(item)}')
     if not summary.get('files'):
         lines.append('- _No file inventory available._')
 
@@ -124,28 +211,44 @@ def write_markdown(
     if metadata.get('bb_enabled'):
         lines.extend(['', '## BB Scan Summary'])
         if metadata.get('bb_parsed'):
-            high_priority = [
-                evt
-                for evt in events
-                if (evt.get('severity') or 'INFO').upper() in {'ERROR', 'WARN'}
-            ]
-            sample = high_priority[:10] or events[:5]
+            sample = stats['sample']
             if sample:
                 for evt in sample:
-                    message = _redact(evt.get('message', ''), redactions)
+                    message = redact(evt.get('message', ''))
                     prefix = (evt.get('severity') or 'INFO').upper()
                     source = evt.get('source')
                     ts = evt.get('timestamp')
                     suffix_parts = []
                     if source:
-                        suffix_parts.append(f'source: {_redact(source, redactions)}')
+                        suffix_parts.append(f'source: {redact(source)}')
                     if ts:
                         suffix_parts.append(f'timestamp: {ts}')
                     suffix = f" ({'; '.join(suffix_parts)})" if suffix_parts else ''
                     lines.append(f'- [{prefix}] {message}{suffix}')
+                busiest = stats['source_counts'].most_common(SOURCE_LIMIT)
+                by_source = ', '.join(
+                    f"{redact(src or 'unknown')} ({count})" for src, count in busiest
+                )
+                extra = len(stats['source_counts']) - len(busiest)
+                if extra > 0:
+                    by_source += f', +{extra} more'
+                lines.append(f'- Events by source: {by_source}')
+            elif metadata.get('min_severity'):
+                lines.append(f"- No events at or above {metadata['min_severity']}.")
             else:
                 lines.append('- BB artifacts parsed but contained no readable events.')
-        else:
+            if metadata.get('min_severity'):
+                counts = ', '.join(
+                    f'{count} {level}' for level, count in sorted(stats['severity_counts'].items())
+                )
+                lines.append(
+                    f"- Only events at or above {metadata['min_severity']}, or matched by a "
+                    f"fault rule, were kept (lines classified: {counts or 'none'})."
+                )
+        skipped = _window_skipped(metadata)
+        if skipped:
+            lines.append(f'- {len(skipped)} artifact(s) outside the time window were skipped.')
+        elif not metadata.get('bb_parsed'):
             if metadata.get('artifact_count', 0) == 0:
                 lines.append('- No `.bb` artifacts were discovered in the bundle.')
             else:
@@ -156,7 +259,81 @@ def write_markdown(
         handle.write('\n'.join(lines))
 
 
+def _json_default(value):
+    if isinstance(value, EventTable):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _write_json_array(items, handle):
+    """Write ``items`` exactly as ``json.dumps(list(items), indent=2)`` would, one item at a time."""
+    first = True
+    for item in items:
+        text = json.dumps(item, indent=2, ensure_ascii=False, default=_json_default)
+        handle.write('[\n  ' if first else ',\n  ')
+        handle.write(text.replace('\n', '\n  '))
+        first = False
+    handle.write('[]' if first else '\n]')
+
+
 def dump_json(obj, path):
     os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
     with open(path, 'wt', encoding='utf-8') as handle:
-        handle.write(json.dumps(obj, indent=2, ensure_ascii=False))
+        if isinstance(obj, (list, EventTable, types.GeneratorType)):
+            # Stream sequences so large event lists never exist as one string.
+            _write_json_array(obj, handle)
+        else:
+            handle.write(json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default))
+
+
+def _open_export(path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if path.lower().endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'wt', encoding='utf-8', newline='')
+
+
+def dump_jsonl(records, path):
+    """Write one compact JSON object per line; ``.gz`` paths are gzip-compressed."""
+    count = 0
+    with _open_export(path) as handle:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            handle.write('\n')
+            count += 1
+    return count
+
+
+def dump_csv(records, path, fields=EVENT_FIELDS):
+    """Write records as CSV with a fixed header; missing fields are left empty."""
+    count = 0
+    with _open_export(path) as handle:
+        writer = csv.DictWriter(handle, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    return count
+
+
+def dump_events(events, export_dir, formats=('json',), redactor=None):
+    """
+    Write events in each requested format; returns the written file paths.
+
+    With a :class:`~ahsdp.redact.Redactor`, ``source`` and ``message`` are
+    redacted record by record as they are streamed out.
+    """
+    written = []
+    for fmt in formats:
+        target = os.path.join(export_dir, EVENT_EXPORTS[fmt])
+        records = redactor.records(events, EVENT_REDACT_FIELDS) if redactor else events
+        if fmt == 'json':
+            dump_json(records, target)
+        elif fmt == 'csv':
+            dump_csv(records, target)
+        elif fmt == 'index':
+            write_index(records, target)
+        else:
+            dump_jsonl(records, target)
+        written.append(target)
+    return written
@@ -1,7 +1,15 @@
 import os
+import posixpath
 import shutil
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_SIZE_LIMIT = 1024 * 1024 * 1024
+# Members at least this large are extracted on a thread pool.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+EXTRACT_WORKERS = 4
 
 
 class SafeTempDir:
@@ -21,13 +29,147 @@ class SafeTempDir:
             shutil.rmtree(self.path, ignore_errors=True)
 
 
-def extract_zip_safe(zip_path, dest_dir, size_limit_bytes=1024 * 1024 * 1024):
+class ZipMember:
+    """
+    A validated archive member that parsers can read in place of a file path.
+
+    Instances are produced by :func:`iter_zip_members_safe`; ``open`` returns a
+    binary stream over the member without writing anything to disk. Members can
+    be pickled for worker processes, which reopen the archive by path.
+    """
+
+    def __init__(self, archive, info):
+        self.archive = archive
+        self.archive_path = archive.filename if archive is not None else None
+        self.info = info
+
+    def __getstate__(self):
+        return {'archive_path': self.archive_path, 'info': self.info}
+
+    def __setstate__(self, state):
+        self.archive = None
+        self.archive_path = state['archive_path']
+        self.info = state['info']
+
+    @property
+    def filename(self):
+        return self.info.filename
+
+    @property
+    def name(self):
+        return posixpath.basename(self.info.filename.rstrip('/'))
+
+    @property
+    def size(self):
+        return self.info.file_size
+
+    def open(self):
+        if self.archive is not None:
+            return self.archive.open(self.info, 'r')
+        # The returned stream keeps the underlying file open after the
+        # archive handle is closed.
+        with zipfile.ZipFile(self.archive_path) as zf:
+            return zf.open(self.info, 'r')
+
+    def __repr__(self):
+        return f'ZipMember({self.filename!r})'
+
+
+def open_binary(source):
+    """Open a filesystem path or :class:`ZipMember` for binary reading."""
+    if isinstance(source, ZipMember):
+        return source.open()
+    return open(source, 'rb')
+
+
+def source_name(source):
+    """Return the base name used to label records from ``source``."""
+    if isinstance(source, ZipMember):
+        return source.name
+    return os.path.basename(source)
+
+
+def source_size(source):
+    if isinstance(source, ZipMember):
+        return source.size
+    return os.path.getsize(source)
+
+
+def _is_safe_member_name(name):
+    normalised = posixpath.normpath(name.replace('\\', '/'))
+    if normalised.startswith('/') or normalised == '..' or normalised.startswith('../'):
+        return False
+    # Reject drive-qualified names such as ``C:/Windows`` as well.
+    return ':' not in normalised.split('/', 1)[0]
+
+
+def iter_zip_members_safe(zf, size_limit_bytes=DEFAULT_SIZE_LIMIT, member_filter=None):
+    """
+    Yield :class:`ZipMember` objects for the regular files in ``zf``.
+
+    Applies the same guarantees as :func:`extract_zip_safe`: members whose
+    names would escape the archive root are skipped and iteration stops once
+    the cumulative uncompressed size exceeds ``size_limit_bytes``. As there,
+    members rejected by ``member_filter`` (called with the ``ZipInfo``) are
+    skipped before they count towards the budget.
+    """
+    total = 0
+    for zi in zf.infolist():
+        if zi.is_dir() or not _is_safe_member_name(zi.filename):
+            continue
+        if member_filter is not None and not member_filter(zi):
+            continue
+        total += zi.file_size
+        if total > size_limit_bytes:
+            break
+        yield ZipMember(zf, zi)
+
+
+def member_target(dest_root, filename):
+    """Return the absolute path ``extract_zip_safe`` writes member ``filename`` to."""
+    return os.path.abspath(os.path.normpath(os.path.join(dest_root, filename)))
+
+
+def _copy_member(zf, zi, target_path):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    with zf.open(zi, 'r') as src, open(target_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1024 * 128)
+
+
+def _copy_member_from(zip_path, zi, target_path):
+    # ZipFile handles are not safe to share between threads; each worker
+    # opens its own.
+    with zipfile.ZipFile(zip_path) as zf:
+        _copy_member(zf, zi, target_path)
+
+
+def extract_zip_safe(
+    zip_path,
+    dest_dir,
+    size_limit_bytes=DEFAULT_SIZE_LIMIT,
+    member_filter=None,
+    workers=None,
+    parallel_min_bytes=PARALLEL_MIN_BYTES,
+):
+    """
+    Extract ``zip_path`` into ``dest_dir`` and return the absolute destination.
+
+    Members whose names would escape ``dest_dir`` are skipped. When
+    ``member_filter`` is given, only members it accepts (called with the
+    ``ZipInfo``) are written. Extraction stops before the member that would
+    take the cumulative uncompressed size of the written members past
+    ``size_limit_bytes``. Members of at least ``parallel_min_bytes`` are
+    decompressed concurrently on up to ``workers`` threads; zlib releases the
+    GIL, so large members overlap while small ones are copied inline.
+    """
     dest_root = os.path.abspath(dest_dir)
     with zipfile.ZipFile(zip_path) as zf:
+        planned = {}
         total = 0
         for zi in zf.infolist():
-            candidate = os.path.normpath(os.path.join(dest_root, zi.filename))
-            target_path = os.path.abspath(candidate)
+            if member_filter is not None and not member_filter(zi):
+                continue
+            target_path = member_target(dest_root, zi.filename)
             if os.path.commonpath([dest_root, target_path]) != dest_root:
                 continue
             if zi.is_dir():
@@ -36,7 +178,21 @@ def extract_zip_safe(zip_path, dest_dir, size_limit_bytes=1024 * 1024 * 1024):
             total += zi.file_size
             if total > size_limit_bytes:
                 break
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            with zf.open(zi, 'r') as src, open(target_path, 'wb') as dst:
-                shutil.copyfileobj(src, dst, 1024 * 128)
+            # A repeated name is written once, with its last copy.
+            planned.pop(target_path, None)
+            planned[target_path] = zi
+
+        large = [(zi, path) for path, zi in planned.items() if zi.file_size >= parallel_min_bytes]
+        max_workers = min(workers or os.cpu_count() or 1, EXTRACT_WORKERS, len(large))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_copy_member_from, zip_path, zi, path) for zi, path in large]
+                for path, zi in planned.items():
+                    if zi.file_size < parallel_min_bytes:
+                        _copy_member(zf, zi, path)
+                for future in futures:
+                    future.result()
+        else:
+            for path, zi in planned.items():
+                _copy_member(zf, zi, path)
     return dest_root
@@ -0,0 +1,185 @@
+import datetime
+import json
+import os
+import sqlite3
+from typing import Iterable
+
+from .report import EVENT_REDACT_FIELDS, FINDING_REDACT_FIELDS
+
+
+SQLITE_SCHEMA = 1
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS bundles (
+    id INTEGER PRIMARY KEY,
+    input TEXT NOT NULL,
+    serial TEXT,
+    exported_at TEXT NOT NULL,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS inventory (
+    bundle_id INTEGER NOT NULL REFERENCES bundles(id),
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS diagnostics (
+    bundle_id INTEGER NOT NULL REFERENCES bundles(id),
+    name TEXT NOT NULL,
+    value
+);
+CREATE TABLE IF NOT EXISTS events (
+    bundle_id INTEGER NOT NULL REFERENCES bundles(id),
+    source TEXT,
+    line INTEGER,
+    severity TEXT,
+    timestamp TEXT,
+    ts_epoch INTEGER,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    bundle_id INTEGER NOT NULL REFERENCES bundles(id),
+    finding TEXT,
+    component TEXT,
+    severity TEXT,
+    confidence TEXT,
+    source TEXT,
+    timestamp TEXT,
+    details TEXT
+);
+"""
+# Created at the end of each export: on a new database the first bundle's
+# indexes are built in one sort, much cheaper than maintaining them row by
+# row; afterwards these are no-ops and inserts keep the indexes current.
+_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS events_bundle ON events(bundle_id)',
+    'CREATE INDEX IF NOT EXISTS events_severity ON events(severity)',
+    'CREATE INDEX IF NOT EXISTS events_source ON events(source)',
+    'CREATE INDEX IF NOT EXISTS events_ts_epoch ON events(ts_epoch)',
+    'CREATE INDEX IF NOT EXISTS findings_bundle ON findings(bundle_id)',
+    'CREATE INDEX IF NOT EXISTS inventory_bundle ON inventory(bundle_id)',
+)
+
+
+def _flatten(value, prefix=''):
+    """Yield ``(dotted_name, scalar)`` pairs for a nested diagnostics dict."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f'{prefix}.{key}' if prefix else str(key))
+    elif value is None or isinstance(value, (str, int, float)):
+        yield prefix, value
+    else:
+        yield prefix, json.dumps(value, ensure_ascii=False, default=str)
+
+
+def connect(db_path: str, timeout: float = 300.0) -> sqlite3.Connection:
+    """
+    Open (creating if needed) an export database and ensure its schema.
+
+    ``timeout`` lets concurrent batch workers queue for the write lock
+    instead of failing with ``database is locked``.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, SQLITE_SCHEMA):
+            raise ValueError(f'Unsupported export database schema {version} in {db_path}')
+        if version == 0:
+            conn.executescript(
+                f'BEGIN IMMEDIATE;{_SCHEMA_SQL}PRAGMA user_version = {SQLITE_SCHEMA};COMMIT;'
+            )
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def export_sqlite(
+    db_path: str,
+    *,
+    input_path: str,
+    inventory: dict,
+    diagnostics: dict,
+    events: Iterable[dict],
+    findings: Iterable[dict],
+    metadata: dict,
+    redactor=None,
+) -> int:
+    """
+    Append one parsed bundle to the SQLite database at ``db_path``.
+
+    Every table is written with ``executemany`` inside a single transaction,
+    so a failed export leaves no partial bundle behind and the database stays
+    consistent when many bundles are appended in turn. With a
+    :class:`~ahsdp.redact.Redactor`, inventory values, event and finding text
+    are redacted exactly as in the JSON exports. Returns the new bundle id.
+    """
+    if redactor:
+        inventory = {key: redactor(value) for key, value in inventory.items()}
+        events = redactor.records(events, EVENT_REDACT_FIELDS)
+        findings = redactor.records(findings, FINDING_REDACT_FIELDS)
+    exported_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    conn = connect(db_path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                'INSERT INTO bundles (input, serial, exported_at, metadata) VALUES (?, ?, ?, ?)',
+                (
+                    input_path,
+                    inventory.get('SerialNumber'),
+                    exported_at,
+                    json.dumps(metadata, ensure_ascii=False, default=str),
+                ),
+            )
+            bundle_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO inventory (bundle_id, key, value) VALUES (?, ?, ?)',
+                [
+                    (bundle_id, key, None if value is None else str(value))
+                    for key, value in inventory.items()
+                ],
+            )
+            conn.executemany(
+                'INSERT INTO diagnostics (bundle_id, name, value) VALUES (?, ?, ?)',
+                [(bundle_id, name, value) for name, value in _flatten(diagnostics or {})],
+            )
+            event_rows = (
+                (
+                    bundle_id,
+                    event.get('source'),
+                    event.get('line'),
+                    event.get('severity'),
+                    event.get('timestamp'),
+                    event.get('ts_epoch'),
+                    event.get('message'),
+                )
+                for event in events
+            )
+            # executemany consumes the generator row by row; events stream in.
+            conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)', event_rows)
+            conn.executemany(
+                'INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        bundle_id,
+                        finding.get('finding'),
+                        finding.get('component'),
+                        finding.get('severity'),
+                        finding.get('confidence'),
+                        finding.get('source'),
+                        finding.get('timestamp'),
+                        finding.get('details'),
+                    )
+                    for finding in findings
+                ],
+            )
+            for statement in _INDEXES:
+                conn.execute(statement)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+    return bundle_id
@@ -0,0 +1,37 @@
+import json
+import zipfile
+from pathlib import Path
+
+from src.ahsdp.batch import _job_names, collect_bundles, run_batch
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'demo_data'
+
+
+def test_run_batch_records_failures_without_aborting(tmp_path):
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    with zipfile.ZipFile(inputs / 'good.ahs', 'w') as zf:
+        zf.write(FIXTURES / 'bcert.pkg.xml', 'bcert.pkg.xml')
+        zf.write(FIXTURES / 'sample.bb', 'sample.bb')
+    (inputs / 'corrupt.zip').write_bytes(b'not a zip archive')
+    (inputs / 'notes.txt').write_text('ignored', encoding='utf-8')
+
+    bundles = collect_bundles([str(inputs)])
+    summary = run_batch(bundles, str(tmp_path / 'out'), enable_bb=True, enable_faults=True)
+
+    assert [entry['name'] for entry in summary['bundles']] == ['corrupt', 'good']
+    assert summary['failed'] == 1 and summary['succeeded'] == 1
+    good = summary['bundles'][1]
+    assert good['status'] == 'ok'
+    assert good['findings_by_severity'] == {'ERROR': 1}
+    assert Path(good['report_path']).is_file()
+    written = json.loads((tmp_path / 'out' / 'batch_summary.json').read_text(encoding='utf-8'))
+    assert written['bundles'][0]['status'] == 'error'
+
+
+def test_job_names_never_collide_with_existing_stems():
+    assert _job_names(['in/a.ahs', 'in/a.zip', 'in/a_2.ahs']) == ['a', 'a_3', 'a_2']
+    names = _job_names(['x/a.ahs', 'y/a.ahs', 'z/a.zip', 'a_2.zip', 'a_3.ahs', 'b.ahs'])
+    assert len(set(names)) == len(names)
+    assert names[3:] == ['a_2', 'a_3', 'b']
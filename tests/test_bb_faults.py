@@ -23,3 +23,83 @@ def test_detect_board_faults_flags_board_issue():
     assert findings, 'expected board fault detection'
     assert findings[0]['severity'] == 'ERROR'
     assert 'System board anomaly' in findings[0]['finding']
+
+
+def test_rule_engine_matches_per_pattern_search():
+    import re
+
+    from src.ahsdp import faults
+
+    messages = [
+        'Power  Supply 1 removed',
+        'psu2 fault',
+        'FRU 3 replaced on system Board',
+        'Fan module degraded',
+        'DIMM 4 fail',
+        'pch ok',
+        'routine heartbeat',
+        'ſystem board',  # non-ASCII text must bypass the literal prefilter
+    ]
+    records = [{'message': m, 'severity': 'INFO', 'source': 't.bb'} for m in messages]
+    findings = faults.detect_hardware_faults(records)
+
+    expected_hw = []
+    for rec in records:
+        for rule in faults._HARDWARE_PATTERNS:
+            if re.search(rule['pattern'], rec['message'], re.I):
+                expected_hw.append(rule['finding'])
+                break
+    expected_board = [
+        rec['message']
+        for rec in records
+        if any(re.search(p, rec['message'], re.I) for p in faults.BOARD_PATTERNS)
+    ]
+    board = [f for f in findings if f['finding'] == 'System board anomaly detected']
+    assert [f['finding'] for f in findings[: len(expected_hw)]] == expected_hw
+    assert [f['details'] for f in board] == expected_board
+
+
+def test_binary_bb_fields_and_telemetry_reach_fault_rules(tmp_path):
+    import struct
+    import zipfile
+
+    from tests.fixtures.mock_ahs_generator import create_bb_file
+
+    gz_path = tmp_path / '20250101_0001.bb'
+    gz_path.write_bytes(create_bb_file(1, include_fault=True))
+    raw = bytearray(b'\x3a' + struct.pack('<BB6x64s', 0x88, 0x1d, b'IdleTask'))
+    for value in (1, 1, 1, 2, 1):
+        raw += struct.pack('<B7s', 0x31, bytes([value]) * 7)
+    raw += b'\x31\x00'  # truncated trailing block
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.writestr('20250102_0002.bb', bytes(raw))
+
+    result = parse_bb_files([gz_path, bundle])
+    messages = [r['message'] for r in result['records']]
+
+    assert 'Field EFUSE1_PF_FAULT (type 0x92, flags 0x31)' in messages
+    assert 'Telemetry 0x31: 00 00 00 00 00 00 00 (x10)' in messages
+    assert messages[-4:] == [
+        'Field IdleTask (type 0x88, flags 0x1d)',
+        'Telemetry 0x31: 01 01 01 01 01 01 01 (x3)',
+        'Telemetry 0x31: 02 02 02 02 02 02 02',
+        'Telemetry 0x31: 01 01 01 01 01 01 01',
+    ]
+    assert result['stats']['lines'] == 6 + 10 + 1 + 5
+    details = [f['details'] for f in detect_board_faults(result['records'])]
+    assert details == [
+        'Field EFUSE1_PF_FAULT (type 0x92, flags 0x31)',
+        'Field System Board Fault (type 0x8e, flags 0x31)',
+    ]
+
+
+def test_text_log_starting_with_colon_is_not_decoded_as_binary(tmp_path):
+    text = ':é note\n2025-01-02 00:00:01 System Board Failure\n' + 'filler line\n' * 10
+    path = tmp_path / '20250102_0001.bb'
+    path.write_bytes(text.encode('utf-8'))
+
+    result = parse_bb_files([path])
+    messages = [r['message'] for r in result['records']]
+    assert messages[:2] == [':é note', '2025-01-02 00:00:01 System Board Failure']
+    assert result['stats']['lines'] == 12
@@ -0,0 +1,74 @@
+import os
+import time
+import zipfile
+
+from src.ahsdp.cache import ResultCache
+from src.ahsdp.core import run_parser
+
+from tests.test_run_parser import _build_bundle
+
+
+def test_rerun_of_unchanged_bundle_hits_cache(tmp_path):
+    bundle = _build_bundle(tmp_path)
+    cache_dir = tmp_path / 'cache'
+
+    first = run_parser(
+        str(bundle), str(tmp_path / 'out1'), enable_bb=True, enable_faults=True,
+        cache_dir=str(cache_dir),
+    )
+    second = run_parser(
+        str(bundle), str(tmp_path / 'out2'), str(tmp_path / 'exports'), redactions=['none'],
+        enable_bb=True, enable_faults=True, cache_dir=str(cache_dir),
+    )
+
+    assert first['metadata']['cache']['hit'] is False
+    assert second['metadata']['cache']['hit'] is True
+    assert second['events'] == first['events']
+    assert second['findings'] == first['findings']
+    assert (tmp_path / 'exports' / 'events.json').is_file()
+    assert second['preserved_temp'] is None
+
+    third = run_parser(
+        str(bundle), str(tmp_path / 'out3'), enable_bb=False, cache_dir=str(cache_dir),
+    )
+    assert third['metadata']['cache']['hit'] is False
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=2500)
+    payload = {'blob': b'x' * 1000}
+    for key in ('a', 'b'):
+        cache.put(key, payload)
+    old = time.time() - 60
+    os.utime(tmp_path / 'a.pkl', (old, old))
+    os.utime(tmp_path / 'b.pkl', (old - 60, old - 60))
+    assert cache.get('b') == payload  # refreshes 'b'
+
+    cache.put('c', payload)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == payload and cache.get('c') == payload
+
+
+def test_member_cache_reuses_unchanged_bb_members(tmp_path):
+    first_bundle = _build_bundle(tmp_path)
+    second_bundle = tmp_path / 'next.ahs'
+    with zipfile.ZipFile(first_bundle) as src, zipfile.ZipFile(second_bundle, 'w') as dst:
+        for info in src.infolist():
+            dst.writestr(info, src.read(info))
+        dst.writestr('logs/extra.bb', b'2025-01-11 08:00:00 Power Supply 2 failure detected\n')
+    cache_dir = tmp_path / 'cache'
+
+    first = run_parser(
+        str(first_bundle), str(tmp_path / 'out1'), enable_bb=True, cache_dir=str(cache_dir),
+    )
+    second = run_parser(
+        str(second_bundle), str(tmp_path / 'out2'), enable_bb=True, cache_dir=str(cache_dir),
+    )
+    fresh = run_parser(str(second_bundle), str(tmp_path / 'out3'), enable_bb=True)
+
+    assert first['metadata']['member_cache']['hits'] == 0
+    assert second['metadata']['cache']['hit'] is False
+    assert second['metadata']['member_cache']['hits'] == 1
+    assert second['metadata']['member_cache']['misses'] == 1
+    assert second['events'] == fresh['events']
@@ -0,0 +1,33 @@
+from scripts.generate_corpus import generate_bundle
+from src.ahsdp.core import run_parser
+
+
+def test_generated_bundle_is_deterministic_and_parseable(tmp_path):
+    options = dict(
+        seed=3, artifacts=3, lines=500, ts_format='mixed', encoding='mixed',
+        fault_density=0.05, binary_ratio=0.0,
+    )
+    manifest = generate_bundle(str(tmp_path / 'a.ahs'), **options)
+    generate_bundle(str(tmp_path / 'b.ahs'), **options)
+    assert (tmp_path / 'a.ahs').read_bytes() == (tmp_path / 'b.ahs').read_bytes()
+
+    result = run_parser(
+        str(tmp_path / 'a.ahs'), str(tmp_path / 'out'), enable_bb=True, enable_faults=True,
+        in_archive=True,
+    )
+
+    assert len(result['events']) == sum(a['lines'] for a in manifest['artifacts']) == 1500
+    assert all('ts_epoch' in event for event in result['events'])
+    assert result['findings']
+    assert result['inventory']['SerialNumber'] == manifest['serial']
+
+
+def test_generated_bundle_respects_size_budget(tmp_path):
+    manifest = generate_bundle(
+        str(tmp_path / 'sized.ahs'), seed=1, artifacts=2, size_mb=0.25,
+    )
+    result = run_parser(str(tmp_path / 'sized.ahs'), str(tmp_path / 'out'), enable_bb=True)
+
+    size = sum(len((e['message'] + '\n').encode('utf-8')) for e in result['events'])
+    assert 0.24 * 1024 * 1024 < size <= 0.25 * 1024 * 1024
+    assert len(result['events']) == sum(a['lines'] for a in manifest['artifacts'])
@@ -0,0 +1,95 @@
+import os
+import random
+import time
+import zipfile
+
+import pytest
+
+from src.ahsdp.core import BB_EXTS, NON_BB_SUPPORTED, run_parser
+from src.ahsdp.discovery import DiscoveryCache, discover_archive, discover_tree
+
+
+def _walk_discover(root):
+    hits = {}
+    bb_artifacts = []
+    for base, _, files in os.walk(root):
+        for fn in files:
+            lower = fn.lower()
+            if lower in NON_BB_SUPPORTED:
+                hits[lower] = os.path.join(base, fn)
+            elif lower.endswith(BB_EXTS):
+                bb_artifacts.append(os.path.join(base, fn))
+    return hits, bb_artifacts
+
+
+def _build_tree(root, seed=2):
+    rng = random.Random(seed)
+    names = ['a.BB', 'b.bb.gz', 'c.Bb.Zip', 'd.zbb', 'BCERT.pkg.xml', 'file.pkg.txt',
+             'counters.pkg', 'noise.txt', 'README', 'x.gz', 'archive.zip', '.bb', 'notes.bb.bak']
+    dirs = [root]
+    for idx in range(40):
+        parent = rng.choice(dirs)
+        path = os.path.join(parent, f'dir{idx}')
+        os.mkdir(path)
+        dirs.append(path)
+    for idx in range(300):
+        name = f'{idx}_{rng.choice(names)}' if rng.random() < 0.7 else rng.choice(names)
+        with open(os.path.join(rng.choice(dirs), name), 'wb'):
+            pass
+    os.symlink(dirs[1], os.path.join(root, 'linked_dir'))
+    return dirs
+
+
+def _age(dirs):
+    old = time.time() - 60
+    for path in dirs:
+        os.utime(path, (old, old))
+
+
+def test_scandir_discovery_matches_os_walk(tmp_path):
+    _build_tree(str(tmp_path))
+    assert discover_tree(str(tmp_path)) == _walk_discover(str(tmp_path))
+
+
+def test_discovery_cache_reuses_unchanged_directories(tmp_path):
+    root = str(tmp_path / 'tree')
+    os.mkdir(root)
+    dirs = _build_tree(root)
+    _age(dirs)
+    cache_path = str(tmp_path / 'discovery.json')
+
+    first = DiscoveryCache(cache_path)
+    assert discover_tree(root, cache=first) == _walk_discover(root)
+    first.save()
+
+    with open(os.path.join(dirs[5], 'late.bb'), 'wb'):
+        pass
+    os.utime(dirs[5], (time.time() - 30, time.time() - 30))
+    second = DiscoveryCache(cache_path)
+    assert discover_tree(root, cache=second) == _walk_discover(root)
+    assert second.stats() == {'reused': len(dirs) - 1, 'scanned': 1}
+
+
+def test_archive_without_supported_members_fails_before_extraction(tmp_path):
+    bundle = tmp_path / 'empty.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.writestr('notes/readme.txt', 'nothing to see')
+    temp_root = tmp_path / 'tmp'
+    temp_root.mkdir()
+
+    with pytest.raises(FileNotFoundError):
+        run_parser(str(bundle), str(tmp_path / 'out'), enable_bb=True, temp_dir=str(temp_root))
+    assert list(temp_root.iterdir()) == []
+
+
+def test_archive_budget_ignores_unsupported_members(tmp_path):
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('dumps/core.bin', b'\0' * 4096)
+        zf.writestr('bcert.pkg.xml', '<BCert><SerialNumber>CZJ1</SerialNumber></BCert>')
+        zf.writestr('logs/20250110_0001.bb', '2025-01-10 00:00:00 System Board Failure\n')
+
+    with zipfile.ZipFile(bundle) as zf:
+        hits, bb_artifacts = discover_archive(zf, size_limit_bytes=1024)
+    assert sorted(hits) == ['bcert.pkg.xml']
+    assert [member.name for member in bb_artifacts] == ['20250110_0001.bb']
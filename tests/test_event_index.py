@@ -0,0 +1,134 @@
+import json
+import random
+import re
+
+import pytest
+
+from src.ahsdp.cli import main
+from src.ahsdp.core import run_parser
+from src.ahsdp.event_index import EventIndex, parse_time, write_index
+
+
+WORDS = ('DIMM', 'fan', 'PSU', 'PSU2', 'failure', 'degraded', 'Board', 'status', 'ok', 'x', '42')
+
+
+def _records(count, seed=21):
+    rng = random.Random(seed)
+    records = []
+    for line in range(1, count + 1):
+        record = {
+            'source': rng.choice(('a.bb', 'b.bb', 'bundle.ahs:c.log')),
+            'line': line,
+            'message': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))),
+            'severity': rng.choice(('INFO', 'WARN', 'ERROR')),
+        }
+        if rng.random() < 0.8:
+            record['ts_epoch'] = 1736467200 + rng.randrange(6 * 3600)
+        records.append(record)
+    return records
+
+
+def test_index_search_matches_brute_force_filtering(tmp_path):
+    records = _records(3000)
+    path = str(tmp_path / 'events.idx')
+    assert write_index(iter(records), path) == len(records)
+
+    rng = random.Random(5)
+    with EventIndex(path) as index:
+        assert len(index) == len(records)
+        assert index.terms('severity') == {
+            level: sum(1 for r in records if r['severity'] == level) for level in ('INFO', 'WARN', 'ERROR')
+        }
+        for _ in range(300):
+            severity = rng.choice((None, 'error', ['WARN', 'ERROR']))
+            source = rng.choice((None, 'a.bb', 'bundle.ahs:c.log', 'missing.bb'))
+            since = rng.choice((None, 1736467200 + rng.randrange(-3600, 7 * 3600)))
+            until = rng.choice((None, 1736467200 + rng.randrange(-3600, 7 * 3600), 1736470799))
+            contains = rng.choice((None, 'dimm', 'Fan failure', 'PSU-Board', 'x 42', 'fan 42', 'PSU2'))
+            levels = {severity.upper()} if isinstance(severity, str) else set(severity or ())
+
+            expected = [
+                r for r in records
+                if (not levels or r['severity'] in levels)
+                and (source is None or r['source'] == source)
+                and (since is None or ('ts_epoch' in r and r['ts_epoch'] >= since))
+                and (until is None or ('ts_epoch' in r and r['ts_epoch'] <= until))
+                and set(re.findall('[a-z0-9]+', (contains or '').lower()))
+                <= set(re.findall('[a-z0-9]+', r['message'].lower()))
+            ]
+            filters = dict(severity=severity, source=source, since=since, until=until, contains=contains)
+            assert index.search(**filters) == expected, filters
+            assert index.count(**filters) == len(expected)
+            assert index.search(limit=3, **filters) == expected[:3]
+
+
+def test_parse_time_accepts_iso_and_epoch():
+    assert parse_time('2025-01-10T02:00:00') == 1736474400
+    assert parse_time('2025-01-10 02:00:00Z') == 1736474400
+    assert parse_time('2025-01-10T04:00:00+02:00') == 1736474400
+    assert parse_time('1736474400') == 1736474400
+    assert parse_time(None) is None
+    with pytest.raises(ValueError):
+        parse_time('yesterday')
+
+
+def test_query_subcommand_reads_index_written_at_export(tmp_path, capsys):
+    bb_path = tmp_path / 'demo.bb'
+    bb_path.write_text(
+        '2025-01-10 01:59:59 DIMM 3 uncorrectable error\n'
+        '2025-01-10 02:15:00 DIMM 4 uncorrectable error\n'
+        '2025-01-10 02:30:00 Fan 2 degraded\n'
+        '2025-01-10 02:45:00 DIMM 5 status ok\n',
+        encoding='utf-8',
+    )
+    export_dir = tmp_path / 'export'
+    result = run_parser(
+        str(tmp_path), str(tmp_path / 'out'), str(export_dir), enable_bb=True, export_format='jsonl,index'
+    )
+    assert result['metadata']['event_exports'] == ['events.jsonl', 'events.idx']
+
+    main([
+        'query', str(export_dir), '--severity', 'ERROR', '--contains', 'dimm',
+        '--since', '2025-01-10T02:00:00', '--until', '2025-01-10T03:00:00', '--json',
+    ])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)['message'] for line in lines] == ['2025-01-10 02:15:00 DIMM 4 uncorrectable error']
+
+    main(['query', str(export_dir / 'events.idx'), '--source', 'demo.bb', '--count'])
+    assert capsys.readouterr().out.strip() == '4'
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(['query', str(tmp_path / 'missing')])
+    assert excinfo.value.code == 3
+
+
+def test_parse_time_accepts_durations_before_now():
+    assert parse_time('72h', now=1736474400) == 1736474400 - 72 * 3600
+    assert parse_time('3d', now=1736474400) == parse_time('72H', now=1736474400)
+    assert parse_time('90 m', now=1736474400) == 1736474400 - 5400
+
+
+def test_contains_matches_whole_words_outside_the_timestamp(tmp_path):
+    records = [
+        {'source': 'a.bb', 'line': 1, 'message': 'Fan 2 fault code 0x1F', 'severity': 'WARN'},
+        {'source': 'a.bb', 'line': 2, 'message': 'DIMM3 uncorrectable error', 'severity': 'ERROR'},
+        {'source': 'a.bb', 'line': 3, 'message': 'PSU2 failed', 'severity': 'ERROR'},
+        {
+            'source': 'a.bb', 'line': 4, 'message': '2025-01-01T01:08:36 PSU 7 removed from bay',
+            'severity': 'WARN', 'timestamp': '2025-01-01T01:08:36', 'ts_epoch': 1735693716,
+        },
+        {'source': 'a.bb', 'line': 5, 'message': 'PSU 3 removed, 42 retries', 'severity': 'WARN'},
+    ]
+    path = str(tmp_path / 'events.idx')
+    write_index(iter(records), path)
+    with EventIndex(path) as index:
+        assert [r['line'] for r in index.search(contains='0x1f')] == [1]
+        assert [r['line'] for r in index.search(contains='psu2')] == [3]
+        assert index.count(contains='PSU1') == 0
+        assert index.count(contains='DIMM5') == 0
+        assert [r['line'] for r in index.search(contains='PSU 3')] == [5]
+        assert [r['line'] for r in index.search(contains='PSU 7')] == [4]
+        # Digits inside the timestamp are not message words.
+        assert index.count(contains='36') == 0
+        assert index.count(contains='4') == 0
+        assert [r['line'] for r in index.search(contains='42')] == [5]
@@ -0,0 +1,38 @@
+import pickle
+
+from src.ahsdp.events import EventTable
+
+
+RECORDS = [
+    {'source': 'a.bb', 'line': 1, 'message': '2025-01-10 12:34:56 fatal héllo', 'severity': 'ERROR',
+     'timestamp': '2025-01-10 12:34:56', 'ts_epoch': 1736512496},
+    {'source': 'a.bb', 'line': 3, 'message': 'plain line', 'severity': 'INFO'},
+    {'source': 'b.bb:inner.log', 'line': 2, 'message': 'warn 01/10/25  12:34:56', 'severity': 'WARN',
+     'timestamp': '01/10/25  12:34:56', 'ts_epoch': 1736512496},
+]
+
+
+def test_event_table_round_trips_records():
+    table = EventTable()
+    for record in RECORDS:
+        table.append_record(record)
+
+    assert len(table) == 3
+    assert list(table) == RECORDS
+    assert table[-1] == RECORDS[-1]
+    assert table[:2] == RECORDS[:2]
+    assert table.severity_counts() == {'ERROR': 1, 'INFO': 1, 'WARN': 1}
+    assert pickle.loads(pickle.dumps(table)) == RECORDS
+
+
+def test_event_table_extend_remaps_interned_codes():
+    first = EventTable()
+    first.append_record(RECORDS[2])
+    second = EventTable()
+    for record in RECORDS[:2]:
+        second.append_record(record)
+
+    first.extend(second)
+
+    assert list(first) == [RECORDS[2]] + RECORDS[:2]
+    assert first.sources == ['b.bb:inner.log', 'a.bb']
@@ -0,0 +1,132 @@
+import json
+import zipfile
+
+import pytest
+
+from src.ahsdp.batch import run_batch
+from src.ahsdp.cli import main
+from src.ahsdp.core import run_parser
+from src.ahsdp.fleet import fleet_summary, list_servers, recurring_faults, update_fleet
+
+
+def _bundle(path, serial, rom, lines):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr(
+            'bcert.pkg.xml',
+            f'<BCert><ProductName>DL380</ProductName><SerialNumber>{serial}</SerialNumber>'
+            f'<ROMVersion>{rom}</ROMVersion><ILOVersion>2.78</ILOVersion></BCert>',
+        )
+        zf.writestr('20250110_0001.bb', ''.join(f'{line}\n' for line in lines))
+    return str(path)
+
+
+def _psu(count):
+    return [{'finding': 'Power supply failure detected', 'component': 'Power Supply'}] * count
+
+
+def test_fleet_store_tracks_latest_inventory_faults_and_firmware(tmp_path):
+    db_path = str(tmp_path / 'fleet.db')
+
+    def inventory(serial, rom):
+        return {'ProductName': 'DL380', 'SerialNumber': serial, 'ROMVersion': rom, 'ILO': '2.78'}
+
+    assert update_fleet(
+        db_path, inventory=inventory('CZJ0000001', 'U30 v2.60'), findings=_psu(1),
+        input_path='a-new.ahs', digest='new', observed_at=200,
+    ) == {'serial': 'CZJ0000001', 'updated': True, 'duplicate': False}
+    # An older bundle loaded later still counts, but never rolls the inventory back.
+    assert update_fleet(
+        db_path, inventory=inventory('CZJ0000001', 'U30 v2.50'),
+        findings=_psu(1) + [{'finding': 'Cooling fan issue detected', 'component': 'Cooling'}],
+        input_path='a-old.ahs', digest='old', observed_at=100,
+    )['updated'] is False
+    update_fleet(
+        db_path, inventory=inventory('CZJ0000002', 'U30 v2.50'),
+        findings=[{'finding': 'Cooling fan issue detected', 'component': 'Cooling'}, {'finding': 'x'}],
+        digest='other', observed_at=150,
+    )
+    # A recorded digest is never counted twice; bundles without a serial are skipped.
+    assert update_fleet(
+        db_path, inventory=inventory('CZJ0000001', 'U30 v2.60'), findings=_psu(1), digest='new'
+    )['duplicate'] is True
+    assert update_fleet(db_path, inventory={}, findings=_psu(1))['serial'] is None
+
+    summary = fleet_summary(db_path)
+    assert summary['servers'] == 2 and summary['bundles'] == 3
+    assert summary['firmware'] == {'rom': {'U30 v2.50': 1, 'U30 v2.60': 1}, 'ilo': {'2.78': 2}}
+    assert summary['components'] == {
+        'Power Supply': {'findings': 2, 'servers': 1},
+        'Cooling': {'findings': 2, 'servers': 2},
+        'Unclassified': {'findings': 1, 'servers': 1},
+    }
+    servers = {row['serial']: row for row in list_servers(db_path)}
+    assert servers['CZJ0000001']['rom_version'] == 'U30 v2.60'
+    assert servers['CZJ0000001']['input'] == 'a-new.ahs'
+    assert servers['CZJ0000001']['bundles'] == 2
+
+    # A newer bundle moves the server to another firmware version.
+    update_fleet(
+        db_path, inventory=inventory('CZJ0000002', 'U30 v2.70'), findings=[], digest='upgrade',
+        observed_at=300,
+    )
+    assert fleet_summary(db_path)['firmware']['rom'] == {'U30 v2.60': 1, 'U30 v2.70': 1}
+
+    recurring = recurring_faults(db_path, 'power supply')
+    assert [(row['serial'], row['findings'], row['bundles']) for row in recurring] == [
+        ('CZJ0000001', 2, 2)
+    ]
+    assert recurring_faults(db_path, 'Cooling') == []
+
+
+def test_batch_updates_fleet_and_fleet_subcommand_reports_it(tmp_path, capsys):
+    bundles = [
+        _bundle(tmp_path / f'{idx}.ahs', f'CZJ000000{idx % 2}', f'U30 v2.{idx}0', [
+            f'2025-01-1{idx} 00:00:00 System Board Failure',
+        ])
+        for idx in range(4)
+    ]
+    db_path = str(tmp_path / 'fleet' / 'fleet.db')
+    summary = run_batch(
+        bundles, str(tmp_path / 'out'), workers=2, enable_bb=True, enable_faults=True, fleet_db=db_path
+    )
+    assert summary['succeeded'] == 4
+
+    main(['fleet', db_path, '--json'])
+    rollup = json.loads(capsys.readouterr().out)
+    assert rollup['servers'] == 2 and rollup['bundles'] == 4
+    assert rollup['firmware']['rom'] == {'U30 v2.20': 1, 'U30 v2.30': 1}
+    assert rollup['components'] == {'System Board': {'findings': 4, 'servers': 2}}
+
+    # Re-running a bundle is recognised by its content hash.
+    result = run_parser(bundles[3], str(tmp_path / 'again'), enable_bb=True, fleet_db=db_path)
+    assert result['metadata']['fleet'] == {
+        'path': db_path, 'serial': 'CZJ0000001', 'updated': False, 'duplicate': True
+    }
+
+    main(['fleet', db_path, '--recurring', '--component', 'system board', '--min-bundles', '2'])
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == ['CZJ0000000', 'CZJ0000001']
+    main(['fleet', db_path, '--servers'])
+    assert 'U30 v2.30' in capsys.readouterr().out.splitlines()[1]
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(['fleet', str(tmp_path / 'missing.db')])
+    assert excinfo.value.code == 3
+
+
+def test_run_parser_records_hardware_faults_in_fleet(tmp_path):
+    bundle = _bundle(tmp_path / 'psu.ahs', 'CZJ0000009', 'U30 v2.60', [
+        '2025-01-10 00:00:00 Power Supply 1 failure',
+        '2025-01-10 00:00:05 DIMM 3 uncorrectable error',
+    ])
+    db_path = str(tmp_path / 'fleet.db')
+
+    result = run_parser(bundle, str(tmp_path / 'out'), enable_bb=True, enable_faults=True, fleet_db=db_path)
+    assert {f['component'] for f in result['findings']} == {'Power Supply', 'Memory'}
+    assert fleet_summary(db_path)['components'] == {
+        'Memory': {'findings': 1, 'servers': 1},
+        'Power Supply': {'findings': 1, 'servers': 1},
+    }
+    assert [row['serial'] for row in recurring_faults(db_path, 'Power Supply', min_bundles=1)] == [
+        'CZJ0000009'
+    ]
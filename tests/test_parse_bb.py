@@ -0,0 +1,253 @@
+import gzip
+import io
+import random
+import zipfile
+from pathlib import Path
+
+from src.ahsdp.faults import matches_rule
+from src.ahsdp.parse_bb import (
+    _SEVERITY_KEYWORDS,
+    _classify_severity,
+    _iter_lines,
+    _looks_binary,
+    _open_mapped,
+    _timestamp_epoch,
+    parse_bb_files,
+)
+from src.ahsdp.safe_extract import iter_zip_members_safe
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'demo_data'
+
+
+def test_iter_lines_matches_splitlines_across_chunk_boundaries():
+    text = 'alpha\r\nbeta\rgamma\n\x0bdelta \r\n\r\nepsilon' * 50
+    data = text.encode('utf-8')
+    for chunk_size in (1, 2, 7, 1024):
+        lines = list(_iter_lines(lambda: io.BytesIO(data), 'utf-8', False, chunk_size=chunk_size))
+        assert lines == text.splitlines()
+
+
+def test_mapped_file_lines_match_splitlines(tmp_path):
+    text = 'alpha\r\nbeta\rgamma\n\x0bdelta é\x85 \r\n\r\nepsilon\u2028zeta' * 50
+    for encoding in ('utf-8', 'utf-8-sig', 'latin-1'):
+        sample = text.replace('\u2028', '') if encoding == 'latin-1' else text
+        bb_path = tmp_path / f'{encoding}.bb'
+        bb_path.write_bytes(sample.encode(encoding))
+        for chunk_size in (1, 2, 7, 1024):
+            opener = lambda: _open_mapped(bb_path)  # noqa: E731
+            lines = list(_iter_lines(opener, encoding, False, chunk_size=chunk_size))
+            assert lines == sample.splitlines(), (encoding, chunk_size)
+
+
+def test_timestamp_epoch_matches_datetime_reference():
+    import calendar
+    import datetime
+
+    def reference(ts):
+        date_part, clock = ts.replace('T', ' ', 1).split(None, 1)
+        if '-' in date_part:
+            year, month, day = (int(part) for part in date_part.split('-'))
+        else:
+            month, day, year = (int(part) for part in date_part.split('/'))
+            if len(date_part) == 8:
+                year += 1900 if year >= 69 else 2000
+        try:
+            stamp = datetime.datetime(year, month, day, *(int(p) for p in clock.split(':')))
+        except ValueError:
+            return None
+        return calendar.timegm(stamp.timetuple())
+
+    rng = random.Random(20)
+    for _ in range(20000):
+        year = rng.choice(('0000', '1999', '2024', '2025'))
+        month, day, hour, minute, second = (f'{rng.randrange(n):02d}' for n in (14, 33, 26, 62, 62))
+        clock = f'{hour}:{minute}:{second}'
+        for ts in (
+            f'{year}-{month}-{day}{rng.choice(" T")}{clock}',
+            f'{month}/{day}/{year} {clock}',
+            f'{month}/{day}/{year[2:]}  {clock}',
+        ):
+            assert _timestamp_epoch(ts) == reference(ts), ts
+
+
+def test_encoding_is_sniffed_once_per_payload(tmp_path):
+    text = '2025-01-10 12:34:56 Fan 1 speed changed, status ok\nCaution: naïve threshold\n' * 300
+    payloads = {
+        'utf8.bb': text.encode('utf-8'),
+        'bom8.bb': text.encode('utf-8-sig'),
+        'utf16le.bb': text.encode('utf-16le'),
+        'bom16.bb': text.encode('utf-16'),
+        'latin1.bb': text.encode('latin-1'),
+    }
+    paths = []
+    for name, data in payloads.items():
+        (tmp_path / name).write_bytes(data)
+        paths.append(tmp_path / name)
+    # Valid UTF-8 sample followed by a latin-1 byte well past the sniffed block.
+    late = tmp_path / 'late.bb'
+    late.write_bytes(text.encode('utf-8') * 20 + 'café\n'.encode('latin-1'))
+    paths.append(late)
+
+    result = parse_bb_files(paths)
+
+    for name in payloads:
+        messages = [r['message'] for r in result['records'] if r['source'] == name]
+        assert messages == text.splitlines(), name
+    late_messages = [r['message'] for r in result['records'] if r['source'] == 'late.bb']
+    assert late_messages[-1] == 'café'
+    assert len(late_messages) == 600 * 20 + 1
+
+
+def test_looks_binary_matches_per_byte_reference():
+    rng = random.Random(18)
+    for _ in range(2000):
+        data = bytes(rng.choice((rng.randrange(32), rng.randrange(256))) for _ in range(rng.randint(0, 1500)))
+        sample = data[:1024]
+        control = sum(1 for b in sample if b < 9 or 13 < b < 32)
+        assert _looks_binary(data) == (bool(sample) and control / len(sample) > 0.2)
+
+
+def test_parse_bb_files_streams_gzip_and_zip_payloads(tmp_path):
+    plain = (FIXTURES / 'sample.bb').read_bytes()
+    expected = parse_bb_files([FIXTURES / 'sample.bb'])['records']
+
+    gz_path = tmp_path / 'sample.bb.gz'
+    gz_path.write_bytes(gzip.compress(plain))
+    zip_path = tmp_path / 'sample.bb.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr('inner.log', plain)
+
+    result = parse_bb_files([gz_path, zip_path])
+
+    assert result['sources'] == ['sample.bb.gz', 'sample.bb.zip']
+    gz_records = [r for r in result['records'] if r['source'] == 'sample.bb.gz']
+    zip_records = [r for r in result['records'] if r['source'] == 'sample.bb.zip:inner.log']
+    for records in (gz_records, zip_records):
+        assert [{k: v for k, v in r.items() if k != 'source'} for r in records] == [
+            {k: v for k, v in r.items() if k != 'source'} for r in expected
+        ]
+
+
+def test_nested_zip_member_is_read_in_place(tmp_path):
+    inner = tmp_path / 'logs.bb.zip'
+    with zipfile.ZipFile(inner, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for idx in range(3):
+            zf.writestr(f'part{idx}.log', f'2025-01-10 00:00:0{idx} PSU {idx} failure\nok {idx}\n' * 50)
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(inner, 'logs/logs.bb.zip')
+
+    expected = parse_bb_files([inner])['records']
+    with zipfile.ZipFile(bundle) as zf:
+        result = parse_bb_files(list(iter_zip_members_safe(zf)))
+    assert list(result['records']) == list(expected)
+    assert len(result['records']) == 300
+
+
+def test_parallel_parse_matches_serial_order(tmp_path):
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        for idx in range(4):
+            zf.writestr(f'2025011{idx}_{idx:04d}.bb', f'2025-01-1{idx} 00:00:0{idx} warn member {idx}\nok\n')
+    with zipfile.ZipFile(bundle) as zf:
+        members = list(iter_zip_members_safe(zf))
+        serial = parse_bb_files(members)
+        parallel = parse_bb_files(members, workers=2)
+
+    assert parallel == serial
+    assert parallel['sources'] == [f'2025011{idx}_{idx:04d}.bb' for idx in range(4)]
+
+
+def _legacy_classify_severity(line):
+    lower = line.lower()
+    for keywords, level in _SEVERITY_KEYWORDS:
+        if any(word in lower for word in keywords):
+            return level
+    if 'err' in lower:
+        return 'ERROR'
+    return 'INFO'
+
+
+def test_classify_severity_matches_substring_reference_on_generated_corpus():
+    rng = random.Random(20250110)
+    keywords = [word for words, _ in _SEVERITY_KEYWORDS for word in words]
+    fragments = keywords + ['err', 'terror', 'OK', 'Fail', 'x', ' ', '-', 'İ', 'K', 'ſ', 'é']
+    for _ in range(50000):
+        pieces = [rng.choice(fragments) for _ in range(rng.randint(0, 6))]
+        line = ''.join(p[: rng.randint(1, len(p))] if rng.random() < 0.3 else p for p in pieces)
+        assert _classify_severity(line) == _legacy_classify_severity(line), line
+
+
+def test_records_carry_normalised_epoch_for_all_timestamp_formats(tmp_path):
+    bb_path = tmp_path / 'formats.bb'
+    bb_path.write_text(
+        '2025-01-10 12:34:56 iso form\n'
+        '01/10/2025 12:34:56 four digit year\n'
+        '01/10/25  12:34:56 two digit year\n'
+        '12/31/99 23:59:59 last century\n'
+        '13/45/2025 00:00:00 impossible date\n'
+        'no timestamp here\n',
+        encoding='utf-8',
+    )
+    records = parse_bb_files([bb_path])['records']
+
+    assert [r.get('ts_epoch') for r in records] == [
+        1736512496, 1736512496, 1736512496, 946684799, None, None
+    ]
+    assert records[4]['timestamp'] == '13/45/2025 00:00:00'
+
+
+def test_time_window_drops_lines_and_skips_dated_artifacts(tmp_path):
+    lines = [
+        '2025-01-09 23:59:59 before window failure',
+        'no timestamp kept',
+        '01/10/2025 00:00:00 first in window',
+        '2025-01-10 12:00:00 Caution inside',
+        '2025-01-11 00:00:01 after window',
+        '13/45/2025 00:00:00 impossible date kept',
+    ]
+    current = tmp_path / '20250110_0001.bb'
+    current.write_text('\n'.join(lines), encoding='utf-8')
+    stale = tmp_path / '20250101_0001.bb'
+    stale.write_text('2025-01-01 00:00:00 fatal old entry\n', encoding='utf-8')
+    undated = tmp_path / 'undated.bb'
+    undated.write_text('2025-01-08 00:00:00 old\nplain\n', encoding='utf-8')
+    since, until = 1736467200, 1736553599  # 2025-01-10 00:00:00 .. 23:59:59 UTC
+
+    result = parse_bb_files([stale, current, undated], since=since, until=until)
+    everything = parse_bb_files([current, undated])['records']
+
+    assert result['sources'] == ['20250110_0001.bb', 'undated.bb']
+    assert result['skipped'] == ['20250101_0001.bb']
+    assert list(result['records']) == [
+        r for r in everything if r.get('ts_epoch') is None or since <= r['ts_epoch'] <= until
+    ]
+    assert [r['message'] for r in result['records'] if r['source'] == current.name] == lines[1:4] + lines[5:]
+    assert result['stats']['lines_out_of_window'] == 3
+    assert result['stats']['bytes_read'] == current.stat().st_size + undated.stat().st_size
+    # Open-ended windows only bound one side.
+    assert len(parse_bb_files([current], until=since)['records']) == 4
+
+
+def test_min_severity_keeps_higher_levels_and_counts_every_line(tmp_path):
+    bb_path = tmp_path / 'levels.bb'
+    bb_path.write_text(
+        '2025-01-10 00:00:01 Fan 1 status ok\n'
+        '2025-01-10 00:00:02 Caution: inlet warm\n'
+        'plain line\n'
+        '2025-01-10 00:00:03 PSU 2 failure\n'
+        '2025-01-10 00:00:04 Fan 2 degraded\n'
+        '2025-01-10 00:00:05 EFUSE1_PF_FAULT asserted\n',
+        encoding='utf-8',
+    )
+    everything = list(parse_bb_files([bb_path])['records'])
+
+    for level, kept in (('WARN', {'WARN', 'ERROR'}), ('error', {'ERROR'})):
+        result = parse_bb_files([bb_path], min_severity=level)
+        # Lower lines a fault rule matches are kept so findings do not change.
+        assert list(result['records']) == [
+            r for r in everything if r['severity'] in kept or matches_rule(r['message'])
+        ]
+        assert result['severity_counts'] == {'INFO': 3, 'WARN': 2, 'ERROR': 1}
+    assert 'severity_counts' not in parse_bb_files([bb_path])
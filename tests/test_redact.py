@@ -0,0 +1,48 @@
+import json
+import random
+import zipfile
+
+from src.ahsdp.core import run_parser
+from src.ahsdp.redact import Redactor, mask
+
+
+def test_redactor_matches_sequential_mask():
+    rng = random.Random(5)
+    alphabet = 'ab@.-+ 0123456789ABCDEF()token:=Bearer x'
+    samples = [
+        'contact admin@example.com or +1 (800) 555-1234',
+        'Bearer 0123456789abcdef0123456789ABCDEF',
+        'token=ABCDEF0123456789ABCDEF01 from ops@corp.local',
+    ] + [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(5000)]
+    for kinds in (['email', 'phone', 'token'], ['phone'], ['email', 'token'], 'email,phone', []):
+        redactor = Redactor(kinds, cache_size=64)
+        for text in samples + samples[:100]:
+            assert redactor(text) == mask(text, kinds)
+    assert Redactor(['email'])(None) is None
+
+
+def test_redact_exports_masks_events_and_findings(tmp_path):
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.writestr('file.pkg.txt', 'HPE Active Health System Log\n')
+        zf.writestr(
+            'sample.bb',
+            '2025-01-10 12:00:00 System Board Failure reported by admin@example.com\n'
+            '2025-01-10 12:00:05 Informational Boot completed\n',
+        )
+    export_dir = tmp_path / 'exports'
+
+    result = run_parser(
+        str(bundle), str(tmp_path / 'out'), str(export_dir), redactions=['email'],
+        enable_bb=True, enable_faults=True, export_format='json,csv', redact_exports=True,
+    )
+
+    assert result['metadata']['exports_redacted'] is True
+    events = json.loads((export_dir / 'events.json').read_text(encoding='utf-8'))
+    assert events[0]['message'].endswith('reported by [REDACTED_EMAIL]')
+    assert events[0]['timestamp'] == '2025-01-10 12:00:00'
+    assert 'admin@example.com' not in (export_dir / 'events.csv').read_text(encoding='utf-8')
+    findings = json.loads((export_dir / 'findings.json').read_text(encoding='utf-8'))
+    assert findings and all('admin@example.com' not in f['details'] for f in findings)
+    # In-memory results are left untouched.
+    assert 'admin@example.com' in result['events'][0]['message']
@@ -0,0 +1,38 @@
+from src.ahsdp.events import EventTable
+from src.ahsdp.report import summarise_events
+
+
+def _records():
+    levels = ['INFO'] * 7 + ['WARN', 'INFO', 'ERROR'] * 6
+    return [
+        {'source': f'log{idx % 3}.bb', 'line': idx + 1, 'message': f'event {idx}', 'severity': level}
+        for idx, level in enumerate(levels)
+    ]
+
+
+def test_summary_is_identical_for_tables_lists_and_generators():
+    records = _records()
+    table = EventTable()
+    table.extend(records)
+    findings = [{'severity': 'warn'}, {'severity': None}]
+
+    from_list = summarise_events(records, findings)
+    from_generator = summarise_events((rec for rec in records), iter(findings))
+    from_table = summarise_events(table, findings)
+
+    high_priority = [r for r in records if r['severity'] in ('ERROR', 'WARN')]
+    assert from_list['sample'] == high_priority[:10]
+    assert from_list['severity_counts'] == {'INFO': 13, 'WARN': 6, 'ERROR': 6}
+    assert from_list['source_counts'] == {'log0.bb': 9, 'log1.bb': 8, 'log2.bb': 8}
+    assert from_list['finding_levels'] == {'WARN', ''}
+    assert from_generator == from_list == from_table
+
+
+def test_summary_falls_back_to_leading_events_without_high_priority():
+    records = [r for r in _records() if r['severity'] == 'INFO']
+    table = EventTable()
+    table.extend(records)
+
+    assert summarise_events(iter(records))['sample'] == records[:5]
+    assert summarise_events(table)['sample'] == records[:5]
+    assert summarise_events([])['sample'] == []
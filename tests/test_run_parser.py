@@ -0,0 +1,178 @@
+import csv
+import gzip
+import json
+import pstats
+import zipfile
+from pathlib import Path
+
+from src.ahsdp.cli import main
+from src.ahsdp.core import run_parser
+from src.ahsdp.metrics import peak_rss_mb
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'demo_data'
+
+
+def _build_bundle(tmp_path: Path) -> Path:
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name in ('bcert.pkg.xml', 'file.pkg.txt', 'CUST_INFO.DAT', 'sample.bb'):
+            zf.write(FIXTURES / name, f'logs/{name}')
+        zf.writestr('../escape.bb', b'2025-01-10 12:00:00 fatal escape attempt\n')
+    return bundle
+
+
+def test_in_archive_mode_matches_extraction_without_temp_dir(tmp_path):
+    bundle = _build_bundle(tmp_path)
+    temp_root = tmp_path / 'tmp'
+    temp_root.mkdir()
+
+    extracted = run_parser(
+        str(bundle), str(tmp_path / 'out_a'), enable_bb=True, enable_faults=True,
+        temp_dir=str(temp_root),
+    )
+    in_place = run_parser(
+        str(bundle), str(tmp_path / 'out_b'), enable_bb=True, enable_faults=True,
+        temp_dir=str(temp_root), in_archive=True,
+    )
+
+    assert in_place['metadata']['in_archive'] is True
+    assert list(temp_root.iterdir()) == []
+    for key in ('events', 'inventory', 'diagnostics', 'findings'):
+        assert in_place[key] == extracted[key]
+    assert in_place['metadata']['bb_sources'] == ['sample.bb']
+
+
+def test_streaming_event_exports(tmp_path):
+    bundle = _build_bundle(tmp_path)
+    export_dir = tmp_path / 'exports'
+
+    result = run_parser(
+        str(bundle), str(tmp_path / 'out'), str(export_dir), enable_bb=True,
+        in_archive=True, export_format='json,jsonl.gz,csv',
+    )
+
+    events = list(result['events'])
+    assert result['metadata']['event_exports'] == ['events.json', 'events.jsonl.gz', 'events.csv']
+    assert (export_dir / 'events.json').read_text(encoding='utf-8') == json.dumps(
+        events, indent=2, ensure_ascii=False
+    )
+    with gzip.open(export_dir / 'events.jsonl.gz', 'rt', encoding='utf-8') as handle:
+        assert [json.loads(line) for line in handle] == events
+    with open(export_dir / 'events.csv', newline='', encoding='utf-8') as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row['message'] for row in rows] == [evt['message'] for evt in events]
+
+
+def test_metrics_record_stage_timings_and_bb_counters(tmp_path):
+    bundle = _build_bundle(tmp_path)
+    export_dir = tmp_path / 'exports'
+
+    result = run_parser(
+        str(bundle), str(tmp_path / 'out'), str(export_dir), enable_bb=True, enable_faults=True,
+    )
+
+    metrics = result['metadata']['metrics']
+    assert set(metrics['stages']) == {
+        'extract', 'discover', 'parse_non_bb', 'parse_bb', 'faults', 'export', 'report'
+    }
+    assert all(stage['wall_seconds'] >= 0 for stage in metrics['stages'].values())
+    sample = (FIXTURES / 'sample.bb').read_bytes()
+    assert metrics['bytes_read'] == metrics['bytes_decompressed'] == len(sample)
+    assert metrics['lines'] == len(sample.decode('utf-8').splitlines())
+    assert metrics['lines_per_sec'] > 0
+    saved = json.loads((export_dir / 'metadata.json').read_text(encoding='utf-8'))
+    assert saved['metrics']['stages'].keys() == metrics['stages'].keys()
+    assert metrics['peak_rss_mb'] > 0
+    assert saved['metrics']['peak_rss_mb'] == metrics['peak_rss_mb']
+
+
+def test_profile_flag_writes_a_pstats_dump(tmp_path, capsys):
+    bundle = _build_bundle(tmp_path)
+    profile = tmp_path / 'run.prof'
+
+    main(['--in', str(bundle), '--out', str(tmp_path / 'out'), '--profile', str(profile)])
+
+    assert f'Wrote profile: {profile}' in capsys.readouterr().out
+    stats = pstats.Stats(str(profile))
+    assert any(name == 'run_parser' for _, _, name in stats.stats)
+    assert peak_rss_mb() > 0
+
+
+def test_time_window_is_pushed_into_parsing_and_cache_key(tmp_path):
+    bundle = tmp_path / 'window.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.write(FIXTURES / 'bcert.pkg.xml', 'bcert.pkg.xml')
+        zf.writestr('20250108_0001.bb', '2025-01-08 10:00:00 System Board Failure\n')
+        zf.writestr('20250110_0002.bb', '2025-01-10 01:00:00 Fan ok\n2025-01-10 03:00:00 System Board Failure\n')
+    options = dict(enable_bb=True, enable_faults=True, cache_dir=str(tmp_path / 'cache'))
+
+    full = run_parser(str(bundle), str(tmp_path / 'full'), **options)
+    window = run_parser(
+        str(bundle), str(tmp_path / 'window'), since='2025-01-10T02:00:00Z', until='2025-01-10T23:00:00', **options
+    )
+
+    assert [e['line'] for e in full['events']] == [1, 1, 2]
+    assert window['metadata']['cache']['hit'] is False
+    assert window['metadata']['time_window'] == {
+        'since': 1736474400, 'until': 1736550000, 'skipped_artifacts': ['20250108_0001.bb']
+    }
+    assert window['metadata']['bb_sources'] == ['20250110_0002.bb']
+    assert [e['message'] for e in window['events']] == ['2025-01-10 03:00:00 System Board Failure']
+    assert len(window['findings']) == 1
+    assert window['metadata']['metrics']['lines_out_of_window'] == 1
+    report = Path(window['report_path']).read_text(encoding='utf-8')
+    assert '(lines 2025-01-10 02:00:00 – 2025-01-10 23:00:00 UTC)' in report
+    assert '- 1 artifact(s) outside the time window were skipped.' in report
+
+    # A window that skips every artifact is reported as such, not as missing or disabled.
+    empty = run_parser(str(bundle), str(tmp_path / 'empty'), since='2025-02-01', **options)
+    assert empty['metadata']['bb_parsed'] is False
+    report = Path(empty['report_path']).read_text(encoding='utf-8')
+    assert '2 `.bb` artifact(s) outside the time window skipped' in report
+    assert '- 2 artifact(s) outside the time window were skipped.' in report
+    assert 'not found' not in report and 'disabled' not in report
+
+
+def test_min_severity_shrinks_events_but_keeps_summary_counts(tmp_path):
+    bundle = _build_bundle(tmp_path)
+    full = run_parser(str(bundle), str(tmp_path / 'full'), enable_bb=True)
+    levels = {}
+    for event in full['events']:
+        levels[event['severity']] = levels.get(event['severity'], 0) + 1
+
+    result = run_parser(
+        str(bundle), str(tmp_path / 'warn'), str(tmp_path / 'export'), enable_bb=True,
+        min_severity='warn',
+    )
+
+    assert result['metadata']['min_severity'] == 'WARN'
+    assert result['metadata']['severity_counts'] == levels
+    assert list(result['events']) == [e for e in full['events'] if e['severity'] != 'INFO']
+    exported = json.loads((tmp_path / 'export' / 'events.json').read_text(encoding='utf-8'))
+    assert len(exported) == len(full['events']) - levels.get('INFO', 0)
+    summary_line = next(
+        line for line in Path(result['report_path']).read_text(encoding='utf-8').splitlines()
+        if line.startswith('**Executive Summary:**')
+    )
+    assert f"{levels.get('ERROR', 0)} ERROR, {levels.get('WARN', 0)} WARN" in summary_line
+
+
+def test_min_severity_does_not_change_findings(tmp_path):
+    bundle = tmp_path / 'bundle.ahs'
+    with zipfile.ZipFile(bundle, 'w') as zf:
+        zf.writestr('20250110_0001.bb', (
+            '2025-01-10 00:00:01 EFUSE1_PF_FAULT asserted\n'
+            '2025-01-10 00:00:02 System Board status ok\n'
+            '2025-01-10 00:00:03 Fan 1 status ok\n'
+            '2025-01-10 00:00:04 System Board Failure\n'
+        ))
+
+    full = run_parser(str(bundle), str(tmp_path / 'full'), enable_bb=True, enable_faults=True)
+    for level in ('WARN', 'ERROR'):
+        result = run_parser(
+            str(bundle), str(tmp_path / level), enable_bb=True, enable_faults=True, min_severity=level,
+        )
+        assert result['findings'] == full['findings']
+        assert len(result['findings']) == 3
+        assert [e['line'] for e in result['events']] == [1, 2, 4]
@@ -0,0 +1,57 @@
+import os
+import warnings
+import zipfile
+
+from src.ahsdp.safe_extract import extract_zip_safe
+
+
+def _archive(tmp_path):
+    path = tmp_path / 'bundle.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('logs/a.bb', b'a' * 3000)
+        zf.writestr('logs/b.bb', os.urandom(5000))
+        zf.writestr('big/unused.bin', b'x' * 20000)
+        zf.writestr('bcert.pkg.xml', b'<BCert/>')
+        zf.writestr('../escape.bb', b'nope')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # duplicate name
+            zf.writestr('logs/a.bb', b'second copy')
+    return path
+
+
+def _tree(root):
+    found = {}
+    for base, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(base, name)
+            with open(path, 'rb') as handle:
+                found[os.path.relpath(path, root)] = handle.read()
+    return found
+
+
+def test_member_filter_limits_writes_and_budget(tmp_path):
+    wanted = lambda zi: zi.filename.endswith(('.bb', '.xml'))  # noqa: E731
+    dest = extract_zip_safe(
+        _archive(tmp_path), tmp_path / 'out', size_limit_bytes=10000, member_filter=wanted
+    )
+
+    tree = _tree(dest)
+    # The 20 kB unused member neither lands on disk nor counts against the budget.
+    assert sorted(tree) == ['bcert.pkg.xml', os.path.join('logs', 'a.bb'), os.path.join('logs', 'b.bb')]
+    assert tree[os.path.join('logs', 'a.bb')] == b'second copy'
+    assert not (tmp_path / 'escape.bb').exists()
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    archive = _archive(tmp_path)
+    serial = extract_zip_safe(archive, tmp_path / 'serial', workers=1)
+    parallel = extract_zip_safe(archive, tmp_path / 'parallel', workers=4, parallel_min_bytes=1)
+
+    assert _tree(parallel) == _tree(serial)
+    assert len(_tree(serial)) == 4
+
+
+def test_size_budget_stops_extraction(tmp_path):
+    dest = extract_zip_safe(_archive(tmp_path), tmp_path / 'out', size_limit_bytes=9000)
+
+    assert sorted(_tree(dest)) == [os.path.join('logs', 'a.bb'), os.path.join('logs', 'b.bb')]
@@ -0,0 +1,84 @@
+import sqlite3
+import zipfile
+from pathlib import Path
+
+from src.ahsdp.batch import run_batch
+from src.ahsdp.core import run_parser
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'demo_data'
+
+
+def _bundle(path, serial, lines):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr(
+            'bcert.pkg.xml',
+            f'<BCert><ProductName>DL380</ProductName><SerialNumber>{serial}</SerialNumber></BCert>',
+        )
+        zf.writestr('counters.pkg', b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00')
+        zf.writestr('20250110_0001.bb', ''.join(f'{line}\n' for line in lines))
+    return str(path)
+
+
+def test_sqlite_export_appends_bundles_with_indexes(tmp_path):
+    db_path = tmp_path / 'fleet' / 'ahs.db'
+    first = _bundle(tmp_path / 'a.ahs', 'CZJ0000001', [
+        '2025-01-10 01:00:00 System Board Failure reported by admin@example.com',
+        '2025-01-10 01:00:05 Fan 2 speed changed, status ok',
+    ])
+    second = _bundle(tmp_path / 'b.ahs', 'CZJ0000002', ['2025-01-10 02:00:00 Caution: inlet warm'])
+
+    result = run_parser(
+        first, str(tmp_path / 'out_a'), redactions=['email'], enable_bb=True, enable_faults=True,
+        redact_exports=True, export_sqlite=str(db_path),
+    )
+    assert result['metadata']['sqlite_export'] == {'path': str(db_path), 'bundle_id': 1}
+    run_parser(second, str(tmp_path / 'out_b'), enable_bb=True, export_sqlite=str(db_path))
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute('SELECT id, serial FROM bundles ORDER BY id').fetchall() == [
+            (1, 'CZJ0000001'), (2, 'CZJ0000002')
+        ]
+        assert conn.execute(
+            'SELECT bundle_id, line, severity, ts_epoch, message FROM events ORDER BY bundle_id, line'
+        ).fetchall() == [
+            (1, 1, 'ERROR', 1736470800, '2025-01-10 01:00:00 System Board Failure reported by [REDACTED_EMAIL]'),
+            (1, 2, 'INFO', 1736470805, '2025-01-10 01:00:05 Fan 2 speed changed, status ok'),
+            (2, 1, 'WARN', 1736474400, '2025-01-10 02:00:00 Caution: inlet warm'),
+        ]
+        assert conn.execute("SELECT value FROM inventory WHERE key = 'ProductName'").fetchall() == [
+            ('DL380',), ('DL380',)
+        ]
+        assert conn.execute(
+            "SELECT value FROM diagnostics WHERE bundle_id = 1 AND name = 'counters.rotation'"
+        ).fetchone() == (2,)
+        # The controller counters add a write-error finding next to the board fault.
+        assert conn.execute('SELECT bundle_id, component FROM findings').fetchall() == [
+            (1, 'Storage'), (1, 'System Board')
+        ]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'events_severity', 'events_source', 'events_ts_epoch'} <= indexes
+        plan = ' '.join(
+            str(row) for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM events WHERE ts_epoch BETWEEN 0 AND 1"
+            )
+        )
+        assert 'events_ts_epoch' in plan
+
+
+def test_batch_appends_every_bundle_to_one_database(tmp_path):
+    bundles = [
+        _bundle(tmp_path / f'{idx}.ahs', f'CZJ000000{idx}', [f'2025-01-10 0{idx}:00:00 entry {idx}'])
+        for idx in range(3)
+    ]
+    db_path = tmp_path / 'batch.db'
+    summary = run_batch(
+        bundles, str(tmp_path / 'out'), workers=2, enable_bb=True, export_sqlite=str(db_path)
+    )
+
+    assert summary['succeeded'] == 3
+    with sqlite3.connect(db_path) as conn:
+        assert sorted(row[0] for row in conn.execute('SELECT serial FROM bundles')) == [
+            'CZJ0000000', 'CZJ0000001', 'CZJ0000002'
+        ]
+        assert conn.execute('SELECT COUNT(*) FROM events').fetchone() == (3,)